@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from .api import ProtectApiClient, calculate_retry_delay, parse_retry_after
+from .batch import BatchUpdateResult, DeviceUpdateBatch
 from .devices import DeviceChange, ProtectDeviceChange
 from .events import (
     EventChange,
@@ -21,6 +22,7 @@ from .exceptions import (
     NvrError,
     PublicOnlyModeError,
 )
+from .manager import ProtectClientHealth, ProtectClientManager
 from .utils import (
     get_nested_attr,
     get_nested_attr_as_bool,
@@ -33,7 +35,9 @@ from .utils import (
 __all__ = [
     "ArmedModeError",
     "BadRequest",
+    "BatchUpdateResult",
     "DeviceChange",
+    "DeviceUpdateBatch",
     "EventChange",
     "EventIdentity",
     "GlobalAlarmManagerError",
@@ -41,6 +45,8 @@ __all__ = [
     "NotAuthorized",
     "NvrError",
     "ProtectApiClient",
+    "ProtectClientHealth",
+    "ProtectClientManager",
     "ProtectDeviceChange",
     "ProtectEvent",
     "ProtectEventChannel",
@@ -11,7 +11,7 @@ body — path binding, payload assembly, dispatch through the existing
 The module imports nothing from :mod:`uiprotect.data`: model classes arrive as
 decorator arguments (``item=``/``items=``), so it stays import-clean and
 circular-import-safe. It depends only on the stdlib plus the public exception
-type.
+type and the rate limiter's priority lanes.
 """
 
 from __future__ import annotations
@@ -22,6 +22,7 @@ import re
 from collections.abc import Awaitable, Callable
 from typing import Any, Concatenate, ParamSpec, TypeVar, cast
 
+from ._rate_limit import RequestPriority
 from .exceptions import BadRequest
 
 _P = ParamSpec("_P")
@@ -113,6 +114,7 @@ def _endpoint(
     item: type[Any] | None,
     items: type[Any] | None,
     has_body: bool,
+    priority: RequestPriority = RequestPriority.NORMAL,
 ) -> Callable[[_Method[_P, _R]], _Method[_P, _R]]:
     placeholders = frozenset(_PLACEHOLDER_RE.findall(path))
 
@@ -147,7 +149,9 @@ def _endpoint(
                 data = await self.api_request_obj(url=url, public_api=True)
                 return item.from_unifi_dict(**data, api=self)
 
-            await self.api_request_raw(url=url, method=verb, public_api=True)
+            await self.api_request_raw(
+                url=url, method=verb, public_api=True, priority=priority
+            )
             return None
 
         wrapper.__public_endpoint__ = (verb, path)  # type: ignore[attr-defined]
@@ -177,6 +181,15 @@ def public_patch(
 
 def public_post(
     path: str,
+    *,
+    priority: RequestPriority = RequestPriority.INTERACTIVE,
 ) -> Callable[[_Method[_P, _R]], _Method[_P, _R]]:
-    """Declare a fire-and-forget POST endpoint (path-only, no return value)."""
-    return _endpoint("post", path, item=None, items=None, has_body=False)
+    """
+    Declare a fire-and-forget POST endpoint (path-only, no return value).
+
+    These are user-facing commands, so they default to the interactive
+    rate-limiter lane and are not queued behind a bulk resync.
+    """
+    return _endpoint(
+        "post", path, item=None, items=None, has_body=False, priority=priority
+    )
@@ -1,56 +1,161 @@
-"""Lightweight event-loop-safe pacer for the Public Integration API."""
+"""Lightweight event-loop-safe sliding-window limiter for the Public Integration API."""
 
 from __future__ import annotations
 
 import math
-from asyncio import Lock, get_running_loop, sleep
+import re
+from asyncio import Event, get_running_loop, sleep
+from collections import deque
+from enum import IntEnum
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import TYPE_CHECKING
 
-# Requests/second used until a ``RateLimit-Policy`` header seeds the real rate.
-# The observed budget is 10/1s; default conservatively to leave WS headroom.
-DEFAULT_RATE: float = 8.0
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+# Requests per DEFAULT_WINDOW used until a ``RateLimit-Policy`` header seeds
+# the real budget. The observed budget is 10/1s; 8 leaves WS headroom.
+DEFAULT_LIMIT: int = 8
+
+# Seconds DEFAULT_LIMIT applies to.
+DEFAULT_WINDOW: float = 1.0
 
 # Fraction of the server-advertised budget we actually consume, leaving room
 # for the shared-budget public WebSocket.
 SAFETY_MARGIN: float = 0.8
 
+_PARAM_SPLIT_RE = re.compile(r"[,;]")
+
+# A request may only reuse the slot of one sent a full window earlier plus
+# this much, so the two never land in the same window on the server.
+_WINDOW_SLACK: float = 0.01
+
+
+class RequestPriority(IntEnum):
+    """Lane a public request waits in; lower values are served first."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+
 
 class PublicApiRateLimiter:
-    """Fixed-interval async gate for one client's public path."""
-
-    def __init__(self, rate: float = DEFAULT_RATE) -> None:
-        self._lock = Lock()
-        self._interval = 1.0 / rate
-        self._next_allowed = 0.0
-        self._seeded = False
-
-    async def acquire(self) -> None:
-        """Block until the next request is permitted under the current rate."""
-        async with self._lock:
-            now = get_running_loop().time()
-            if now < self._next_allowed:
-                await sleep(self._next_allowed - now)
-                self._next_allowed += self._interval
-            else:
-                self._next_allowed = now + self._interval
-
-    def seed_from_policy(self, policy: str | None) -> None:
-        """Seed the rate once from a draft-8 ``RateLimit-Policy`` header value."""
-        if self._seeded:
+    """
+    Sliding-window async gate for one client's public path.
+
+    At most ``limit`` requests go out in any ``window`` seconds: up to
+    ``limit`` immediately, then each further one as soon as the oldest of
+    the last ``limit`` leaves the window. Both are re-derived from every
+    response's ``RateLimit-Policy`` header (``q * SAFETY_MARGIN`` per ``w``),
+    and ``RateLimit`` / ``Retry-After`` use up the window or pause the
+    limiter when the server reports we are ahead of it. Waiters are served
+    by :class:`RequestPriority`, FIFO within a lane.
+    """
+
+    def __init__(
+        self, limit: int = DEFAULT_LIMIT, window: float = DEFAULT_WINDOW
+    ) -> None:
+        self._limit = max(1, limit)
+        self._window = window
+        # Loop times of the requests still inside the window, oldest first.
+        self._sent: deque[float] = deque()
+        # Loop time before which nothing is sent, as asked by the server.
+        self._paused_until = -math.inf
+        self._policy: str | None = None
+        self._waiters: list[tuple[int, int, Event]] = []
+        self._sequence = count()
+
+    async def acquire(self, priority: int = RequestPriority.NORMAL) -> None:
+        """Block until a request in ``priority`` may be sent."""
+        now = get_running_loop().time()
+        if not self._waiters and self._delay(now) <= 0:
+            self._sent.append(now)
             return
-        rate = _parse_policy_rate(policy)
-        if rate is None:
+
+        entry = (priority, next(self._sequence), Event())
+        heappush(self._waiters, entry)
+        try:
+            while True:
+                if self._waiters[0] is not entry:
+                    # Parked behind another waiter; woken when it leaves.
+                    entry[2].clear()
+                    await entry[2].wait()
+                    continue
+                now = get_running_loop().time()
+                if (delay := self._delay(now)) <= 0:
+                    self._sent.append(now)
+                    return
+                await sleep(delay)
+        finally:
+            self._remove_waiter(entry)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Adapt the limiter to the rate-limit headers of a public response."""
+        policy = headers.get("RateLimit-Policy")
+        state = headers.get("RateLimit")
+        retry_after = headers.get("Retry-After")
+        if policy is None and state is None and retry_after is None:
             return
-        new_interval = 1.0 / (rate * SAFETY_MARGIN)
-        # Seeding a slower rate must not let one request slip out at the old,
-        # faster spacing — push the next slot out by the widening delta.
-        if self._next_allowed and new_interval > self._interval:
-            self._next_allowed += new_interval - self._interval
-        self._interval = new_interval
-        self._seeded = True
+        now = get_running_loop().time()
+        if policy is not None:
+            self._apply_policy(policy)
+        if state is not None:
+            remaining, reset = _parse_rate_limit_state(state)
+            if remaining is not None:
+                self._use_up(now, remaining)
+                if remaining < 1 and reset is not None:
+                    self._pause_until(now + reset)
+        if retry_after is not None and (delay := _to_float(retry_after)) is not None:
+            self._pause_until(now + max(0.0, delay))
 
+    def _apply_policy(self, policy: str) -> None:
+        if policy == self._policy:
+            return
+        parsed = _parse_policy(policy)
+        if parsed is None:
+            return
+        quota, window = parsed
+        self._policy = policy
+        self._limit = max(1, math.floor(quota * SAFETY_MARGIN))
+        self._window = window
+
+    def _delay(self, now: float) -> float:
+        """Seconds until the next request may be sent, ``<= 0`` if now."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        sent = self._sent
+        expiry = self._window + _WINDOW_SLACK
+        while sent and sent[0] + expiry <= now:
+            sent.popleft()
+        if len(sent) < self._limit:
+            return 0.0
+        # A smaller limit may leave more than one request to wait out.
+        return sent[len(sent) - self._limit] + expiry - now
+
+    def _use_up(self, now: float, remaining: float) -> None:
+        """Counts requests we did not see so at most `remaining` are left."""
+        self._delay(now)
+        if (unseen := self._limit - len(self._sent) - math.floor(remaining)) > 0:
+            self._sent.extend([now] * unseen)
+
+    def _pause_until(self, until: float) -> None:
+        """Send nothing until ``until``, when the server starts a new window."""
+        self._paused_until = max(self._paused_until, until)
+        self._sent.clear()
+
+    def _remove_waiter(self, entry: tuple[int, int, Event]) -> None:
+        waiters = self._waiters
+        if waiters[0] is entry:
+            heappop(waiters)
+        else:
+            waiters.remove(entry)
+            heapify(waiters)
+        if waiters:
+            waiters[0][2].set()
 
-def _parse_policy_rate(policy: str | None) -> float | None:
-    """Return requests/second from ``q`` / ``w`` of a RateLimit-Policy header."""
+
+def _parse_policy(policy: str | None) -> tuple[float, float] | None:
+    """Return ``(quota, window)`` from ``q`` / ``w`` of a RateLimit-Policy header."""
     if not policy:
         return None
     quota: float | None = None
@@ -64,7 +169,29 @@ def _parse_policy_rate(policy: str | None) -> float | None:
             window = _to_float(value)
     if quota is None or window is None or quota <= 0 or window <= 0:
         return None
-    return quota / window
+    return quota, window
+
+
+def _parse_rate_limit_state(state: str) -> tuple[float | None, float | None]:
+    """
+    Return ``(remaining, reset)`` from a ``RateLimit`` header.
+
+    Accepts both the draft-8 ``"policy";r=2;t=1`` form and the earlier
+    ``limit=10, remaining=2, reset=1`` form; the first value of each wins.
+    """
+    remaining: float | None = None
+    reset: float | None = None
+    for part in _PARAM_SPLIT_RE.split(state):
+        key, _, value = part.strip().partition("=")
+        if remaining is None and key in {"r", "remaining"}:
+            remaining = _to_float(value)
+        elif reset is None and key in {"t", "reset"}:
+            reset = _to_float(value)
+    if remaining is not None and remaining < 0:
+        remaining = None
+    if reset is not None and reset < 0:
+        reset = None
+    return remaining, reset
 
 
 def _to_float(value: str) -> float | None:
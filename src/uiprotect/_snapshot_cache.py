@@ -0,0 +1,105 @@
+"""In-memory LRU cache of recent camera snapshots."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+# Bytes of snapshots kept by default. Caching is opt-in, since a few dozen
+# full-size JPEGs would otherwise be held for callers never passing `max_age`.
+DEFAULT_SNAPSHOT_CACHE_MAX_BYTES = 0
+
+# Changed camera fields that mean the picture changed, dropping the camera's
+# cached snapshots.
+SNAPSHOT_INVALIDATE_KEYS: frozenset[str] = frozenset(
+    {
+        "is_motion_detected",
+        "is_smart_detected",
+        "last_motion",
+        "last_ring",
+        "last_smart_audio_detect",
+        "last_smart_detect",
+        "last_smart_detects",
+    }
+)
+
+
+class SnapshotCache:
+    """
+    Snapshots keyed by camera and variant (size, quality, lens).
+
+    Entries are evicted least recently used first once their total size
+    exceeds `max_bytes`; a `max_bytes` of ``0`` disables the cache. A
+    snapshot fetched while its camera was invalidated is not stored, so a
+    frame from before a motion event never outlives it.
+    """
+
+    __slots__ = (
+        "_entries",
+        "_invalidations",
+        "_max_bytes",
+        "_nbytes",
+        "evictions",
+        "hits",
+        "misses",
+    )
+
+    def __init__(self, max_bytes: int = DEFAULT_SNAPSHOT_CACHE_MAX_BYTES) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[bytes, float]] = (
+            OrderedDict()
+        )
+        self._invalidations: dict[str, int] = {}
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the cached snapshots."""
+        return self._nbytes
+
+    def generation(self, camera_id: str) -> int:
+        """Invalidation counter of `camera_id`, to pass back to `put`."""
+        return self._invalidations.get(camera_id, 0)
+
+    def get(self, camera_id: str, variant: Hashable, max_age: float) -> bytes | None:
+        """Returns the cached snapshot if it is at most `max_age` seconds old."""
+        key = (camera_id, variant)
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[1] > max_age:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(
+        self, camera_id: str, variant: Hashable, data: bytes, generation: int
+    ) -> None:
+        """Stores `data` unless the camera was invalidated since `generation`."""
+        if len(data) > self._max_bytes or generation != self.generation(camera_id):
+            return
+        key = (camera_id, variant)
+        if (old := self._entries.pop(key, None)) is not None:
+            self._nbytes -= len(old[0])
+        self._entries[key] = (data, time.monotonic())
+        self._nbytes += len(data)
+        while self._nbytes > self._max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._nbytes -= len(evicted)
+            self.evictions += 1
+
+    def invalidate(self, camera_id: str) -> None:
+        """Drops every cached snapshot of `camera_id`."""
+        self._invalidations[camera_id] = self.generation(camera_id) + 1
+        for key in [key for key in self._entries if key[0] == camera_id]:
+            self._nbytes -= len(self._entries.pop(key)[0])
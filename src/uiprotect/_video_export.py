@@ -0,0 +1,230 @@
+"""Segmented video exports joined back into one MP4."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import shutil
+from datetime import timedelta
+from fractions import Fraction
+from typing import TYPE_CHECKING, Any
+
+import aiofiles
+import av
+import orjson
+from aiofiles import os as aos
+
+from .exceptions import StreamError
+from .utils import to_js_time
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from pathlib import Path
+
+    from av.container import OutputContainer
+    from av.stream import Stream
+
+# Length of the pieces a segmented export downloads.
+DEFAULT_EXPORT_SEGMENT = timedelta(minutes=10)
+# Segments downloaded at once.
+EXPORT_CONCURRENCY = 4
+# Extra attempts for a segment whose download fails.
+EXPORT_SEGMENT_RETRIES = 2
+
+_FRAGMENTED_OPTIONS = {"movflags": "frag_keyframe+empty_moov+default_base_moof"}
+_STATE_VERSION = 1
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def split_range(
+    start: datetime, end: datetime, segment: timedelta
+) -> list[tuple[datetime, datetime]]:
+    """Splits ``[start, end]`` into consecutive ranges of at most `segment`."""
+    if segment <= timedelta(0):
+        raise ValueError("segment must be positive")
+    ranges: list[tuple[datetime, datetime]] = []
+    while start < end:
+        ranges.append((start, min(start + segment, end)))
+        start += segment
+    return ranges
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of the file at `path`; blocks."""
+    with path.open("rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+class ExportState:
+    """
+    Segments of an export that were downloaded completely.
+
+    Kept in a JSON sidecar next to the output file, along with the
+    segments themselves in a hidden directory, so an interrupted export
+    only downloads the missing time ranges when it is run again. Each
+    segment is recorded with its time range, size and SHA-256, and is only
+    reused if the file on disk still matches. State written for another
+    camera or channel is ignored.
+    """
+
+    def __init__(self, output_file: Path, camera_id: str, channel_index: int) -> None:
+        self.path = output_file.with_name(f"{output_file.name}.export.json")
+        self.parts_dir = output_file.with_name(f".{output_file.name}.parts")
+        self._export = {"camera": camera_id, "channel": channel_index}
+        self._segments: dict[tuple[int, int], dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        """Reads the state of an earlier run of the same export."""
+        try:
+            async with aiofiles.open(self.path, "rb") as f:
+                data = orjson.loads(await f.read())
+        except FileNotFoundError:
+            return
+        except (OSError, orjson.JSONDecodeError) as err:
+            _LOGGER.debug("Ignoring unreadable export state %s: %s", self.path, err)
+            return
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != _STATE_VERSION
+            or data.get("export") != self._export
+        ):
+            return
+        for segment in data.get("segments", []):
+            self._segments[segment["start"], segment["end"]] = segment
+
+    async def is_complete(self, start: datetime, end: datetime, part: Path) -> int:
+        """Size of the segment if `part` holds it completely, otherwise ``0``."""
+        segment = self._segments.get((to_js_time(start), to_js_time(end)))
+        if segment is None or segment.get("file") != part.name:
+            return 0
+        try:
+            size = (await aos.stat(part)).st_size
+        except FileNotFoundError:
+            return 0
+        if size != segment["bytes"] or segment["sha256"] != (
+            await asyncio.get_running_loop().run_in_executor(None, file_sha256, part)
+        ):
+            return 0
+        return size
+
+    async def complete(
+        self, start: datetime, end: datetime, part: Path, size: int, sha256: str
+    ) -> None:
+        """Records `part` as the complete segment from `start` to `end`."""
+        key = (to_js_time(start), to_js_time(end))
+        self._segments[key] = {
+            "start": key[0],
+            "end": key[1],
+            "file": part.name,
+            "bytes": size,
+            "sha256": sha256,
+        }
+        async with self._lock:
+            tmp = self.path.with_name(f"{self.path.name}.tmp")
+            async with aiofiles.open(tmp, "wb") as f:
+                await f.write(
+                    orjson.dumps(
+                        {
+                            "version": _STATE_VERSION,
+                            "export": self._export,
+                            "segments": list(self._segments.values()),
+                        },
+                        option=orjson.OPT_INDENT_2,
+                    )
+                )
+            await aos.replace(tmp, self.path)
+
+    async def remove(self) -> None:
+        """Removes the sidecar and the downloaded segments."""
+        self._segments.clear()
+        with contextlib.suppress(FileNotFoundError):
+            await aos.remove(self.path)
+        await asyncio.get_running_loop().run_in_executor(
+            None, shutil.rmtree, self.parts_dir, True
+        )
+
+
+class Mp4Concatenator:
+    """
+    Losslessly appends MP4 files into one, without re-encoding.
+
+    The streams of the first file are copied to the output and every
+    following file is remuxed after it, with the timestamps of each stream
+    continuing where the previous file ended. Streams are matched by type
+    and order; any other streams are dropped. With `fragmented`, a
+    fragmented MP4 is written, which is playable while it is still being
+    appended to.
+
+    Every method blocks and must be called from an executor.
+    """
+
+    def __init__(self, output_file: Path, fragmented: bool = False) -> None:
+        self._output_file = output_file
+        self._fragmented = fragmented
+        self._output: OutputContainer | None = None
+        self._streams: dict[tuple[str, int], Stream] = {}
+        # per output stream: end of its last appended packet, in seconds
+        self._ends: dict[tuple[str, int], Fraction] = {}
+
+    def append(self, input_file: Path) -> None:
+        """Appends the audio and video of `input_file`."""
+        try:
+            with av.open(str(input_file)) as source:
+                self._append(source)
+        except av.FFmpegError as err:
+            raise StreamError(f"Could not remux {input_file}: {err}") from err
+
+    def close(self) -> None:
+        """Finishes the output file."""
+        if self._output is None:
+            return
+        try:
+            self._output.close()
+        except av.FFmpegError as err:
+            raise StreamError(f"Could not write {self._output_file}: {err}") from err
+        finally:
+            self._output = None
+
+    def _append(self, source: av.container.InputContainer) -> None:
+        inputs: dict[int, tuple[str, int]] = {}
+        for kind in ("video", "audio"):
+            for index, stream in enumerate(getattr(source.streams, kind)):
+                inputs[stream.index] = (kind, index)
+
+        if self._output is None:
+            self._output = av.open(
+                str(self._output_file),
+                "w",
+                format="mp4",
+                options=_FRAGMENTED_OPTIONS if self._fragmented else {},
+            )
+            for stream in source.streams:
+                if (key := inputs.get(stream.index)) is not None:
+                    self._streams[key] = self._output.add_stream_from_template(stream)
+                    self._ends[key] = Fraction(0)
+
+        # shift every stream by the same amount so audio stays in sync and
+        # this file starts where the longest stream of the last one ended
+        start = Fraction(source.start_time or 0, av.time_base)
+        offset = max(self._ends.values(), default=Fraction(0)) - start
+        ends = dict(self._ends)
+        streams = [s for s in source.streams if inputs.get(s.index) in self._streams]
+        for packet in source.demux(streams):
+            if packet.dts is None or packet.time_base is None:
+                continue
+            key = inputs[packet.stream.index]
+            time_base = packet.time_base
+            shift = round(offset / time_base)
+            packet.dts += shift
+            if packet.pts is not None:
+                packet.pts += shift
+            ends[key] = max(
+                ends[key], Fraction(packet.dts + (packet.duration or 0)) * time_base
+            )
+            packet.stream = self._streams[key]
+            self._output.mux(packet)  # type: ignore[union-attr]
+        self._ends = ends
@@ -0,0 +1,114 @@
+"""Coalescing of bursts of private websocket updates for the same device."""
+
+from __future__ import annotations
+
+from asyncio import get_running_loop
+from typing import TYPE_CHECKING, Any
+
+from .data.websocket import WSAction
+
+if TYPE_CHECKING:
+    from asyncio import TimerHandle
+    from collections.abc import Callable
+
+    from .data.types import ModelType
+    from .data.websocket import WSSubscriptionMessage
+
+# Changed fields that are emitted right away instead of waiting for the
+# coalescing window, so motion/ring/sensor triggers are never delayed.
+DEFAULT_BYPASS_KEYS: frozenset[str] = frozenset(
+    {
+        "alarm_triggered_at",
+        "is_light_on",
+        "is_motion_detected",
+        "is_opened",
+        "is_pir_motion_detected",
+        "is_smart_detected",
+        "last_motion",
+        "last_ring",
+        "last_smart_detect",
+        "leak_detected_at",
+        "motion_detected_at",
+        "tampering_detected_at",
+    }
+)
+
+
+class WSUpdateCoalescer:
+    """
+    Merges updates for the same device arriving within a window.
+
+    The first ``UPDATE`` for a ``(model, id)`` is held for up to `window`
+    seconds. Later updates for the same device are merged into it: its
+    `changed_data` gains their changes (nested dicts merged key by key) and its `new_update_id` moves to
+    the latest one, while `old_obj` stays the object from before the first
+    update. Updates changing one of `bypass_keys` are emitted immediately
+    (merged with anything pending for that device), and ``ADD`` / ``REMOVE``
+    messages first flush the pending update of their device so order is
+    kept per device.
+    """
+
+    __slots__ = ("_bypass_keys", "_emit", "_pending", "_timer", "_window")
+
+    def __init__(
+        self,
+        emit: Callable[[WSSubscriptionMessage], None],
+        window: float,
+        bypass_keys: frozenset[str] = DEFAULT_BYPASS_KEYS,
+    ) -> None:
+        self._emit = emit
+        self._window = window
+        self._bypass_keys = bypass_keys
+        self._pending: dict[tuple[ModelType | None, str], WSSubscriptionMessage] = {}
+        self._timer: TimerHandle | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def push(self, msg: WSSubscriptionMessage) -> None:
+        """Emits `msg` now or holds it to be merged with later updates."""
+        if (obj := msg.new_obj or msg.old_obj) is None:
+            self._emit(msg)
+            return
+
+        key = (obj.model, obj.id)
+        pending = self._pending.get(key)
+        if msg.action is not WSAction.UPDATE:
+            if pending is not None:
+                del self._pending[key]
+                self._emit(pending)
+            self._emit(msg)
+            return
+
+        if pending is not None:
+            pending.new_update_id = msg.new_update_id
+            pending.changed_data = _merge_changes(
+                pending.changed_data, msg.changed_data
+            )
+        if not self._bypass_keys.isdisjoint(msg.changed_data):
+            if pending is not None:
+                del self._pending[key]
+            self._emit(pending or msg)
+            return
+        if pending is None:
+            self._pending[key] = msg
+            if self._timer is None:
+                self._timer = get_running_loop().call_later(self._window, self.flush)
+
+    def flush(self) -> None:
+        """Emits all pending updates."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        for msg in pending.values():
+            self._emit(msg)
+
+
+def _merge_changes(changed: dict[str, Any], newer: dict[str, Any]) -> dict[str, Any]:
+    """Returns `changed` updated with `newer`, merging nested partial dicts."""
+    merged = changed | newer
+    for key, value in newer.items():
+        if isinstance(value, dict) and isinstance(old := changed.get(key), dict):
+            merged[key] = _merge_changes(old, value)
+    return merged
@@ -0,0 +1,100 @@
+"""Index of private websocket subscriptions by model, device and changed field."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .data.websocket import WSAction
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .data.types import ModelType
+    from .data.websocket import WSSubscriptionMessage
+
+    WSCallback = Callable[[WSSubscriptionMessage], None]
+    # (model, device id or ``None`` for every device of the model)
+    RouteKey = tuple[ModelType, str | None]
+
+
+class WSSubscriptionRouter:
+    """
+    Routes websocket messages to the subscriptions that match them.
+
+    Subscriptions are indexed by ``(model, device id)`` and then by changed
+    field name, so finding the callbacks for a message only touches the
+    subscriptions of that device (and its model) and the fields in the
+    message instead of every subscription.
+
+    Field filters only apply to ``UPDATE`` messages; ``ADD`` and ``REMOVE``
+    are delivered to every subscription of the device.
+    """
+
+    __slots__ = ("_count", "_routes")
+
+    def __init__(self) -> None:
+        # route key -> field name (``None`` for any field) -> callbacks
+        self._routes: dict[RouteKey, dict[str | None, list[WSCallback]]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(
+        self,
+        callback: WSCallback,
+        model_type: ModelType,
+        device_id: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> None:
+        by_field = self._routes.setdefault((model_type, device_id), {})
+        for field in _field_keys(fields):
+            by_field.setdefault(field, []).append(callback)
+        self._count += 1
+
+    def remove(
+        self,
+        callback: WSCallback,
+        model_type: ModelType,
+        device_id: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> None:
+        key = (model_type, device_id)
+        by_field = self._routes[key]
+        for field in _field_keys(fields):
+            callbacks = by_field[field]
+            callbacks.remove(callback)
+            if not callbacks:
+                del by_field[field]
+        if not by_field:
+            del self._routes[key]
+        self._count -= 1
+
+    def match(self, msg: WSSubscriptionMessage) -> list[WSCallback]:
+        """Returns the callbacks for `msg`, each callback at most once."""
+        routes = self._routes
+        if (
+            not routes
+            or (obj := msg.new_obj or msg.old_obj) is None
+            or (model := obj.model) is None
+        ):
+            return []
+
+        matched: dict[WSCallback, None] = {}
+        for key in ((model, obj.id), (model, None)):
+            if (by_field := routes.get(key)) is None:
+                continue
+            if msg.action is not WSAction.UPDATE:
+                for field_callbacks in by_field.values():
+                    matched.update(dict.fromkeys(field_callbacks))
+                continue
+            for field in (None, *msg.changed_data):
+                if (callbacks := by_field.get(field)) is not None:
+                    matched.update(dict.fromkeys(callbacks))
+        return list(matched)
+
+
+def _field_keys(fields: Iterable[str] | None) -> Iterable[str | None]:
+    if fields is None:
+        return (None,)
+    return set(fields)
@@ -5,12 +5,15 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import hashlib
+import itertools
 import logging
+import os
 import random
 import re
-import sys
 import time
 import warnings
+from collections import deque
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from functools import partial
 from http import HTTPStatus, cookies
@@ -35,7 +38,23 @@ from uiprotect.data.user import Keyring, Keyrings, UlpUser, UlpUsers
 
 from ._compat import cached_property
 from ._public_api import public_get, public_patch, public_post
-from ._rate_limit import PublicApiRateLimiter
+from ._rate_limit import PublicApiRateLimiter, RequestPriority
+from ._snapshot_cache import (
+    DEFAULT_SNAPSHOT_CACHE_MAX_BYTES,
+    SNAPSHOT_INVALIDATE_KEYS,
+    SnapshotCache,
+)
+from ._video_export import (
+    DEFAULT_EXPORT_SEGMENT,
+    EXPORT_CONCURRENCY,
+    EXPORT_SEGMENT_RETRIES,
+    ExportState,
+    Mp4Concatenator,
+    split_range,
+)
+from ._ws_coalesce import DEFAULT_BYPASS_KEYS, WSUpdateCoalescer
+from ._ws_router import WSSubscriptionRouter
+from .batch import BATCH_UPDATE_CONCURRENCY, DeviceUpdateBatch, _current_batch
 from .data import (
     NVR,
     ArmProfile,
@@ -115,7 +134,7 @@ from .exceptions import (
     NvrError,
     PublicOnlyModeError,
 )
-from .stream import TalkbackSession
+from .stream import MediaStream, TalkbackSession
 
 if TYPE_CHECKING:
     from .devices.dispatcher import DeviceDispatcher
@@ -123,6 +142,7 @@ if TYPE_CHECKING:
 from .utils import (
     decode_token_cookie,
     format_host_for_url,
+    from_js_time,
     get_response_reason,
     ip_from_host,
     normalize_mac,
@@ -134,7 +154,14 @@ from .utils import (
 from .websocket import Websocket, WebsocketState
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import (
+        AsyncGenerator,
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Hashable,
+        Iterable,
+    )
 
     from uiprotect.data.devices import LightDeviceSettings, LightModeSettings
     from uiprotect.data.public_devices import (
@@ -224,6 +251,14 @@ TYPES_BUG_MESSAGE = """There is currently a bug in UniFi Protect that makes `sta
 
 If your Protect instance has a lot of events, this request will take much longer then expected. It is recommended adding additional filters to speed the request up."""
 
+# Manual event pagination: page size and max pages fetched concurrently
+EVENT_PAGE_SIZE = 100
+EVENT_PAGE_CONCURRENCY = 4
+# span of the newest-first walks `iter_events_raw` streams ascending events in
+EVENT_ASC_WINDOW = timedelta(hours=1)
+# how far back `poll_events` looks on a cold start (or a stale persisted cursor)
+POLL_EVENTS_MAX_LOOKBACK = timedelta(hours=1)
+
 
 _LOGGER = logging.getLogger(__name__)
 _COOKIE_RE = re.compile(r"^set-cookie: ", re.IGNORECASE)
@@ -280,6 +315,44 @@ def _log_or_raise(
         raise exc
 
 
+# Request kwargs that do not stop identical GETs from sharing one request.
+_SINGLE_FLIGHT_KWARGS = frozenset({"params", "priority"})
+
+
+def _single_flight_key(
+    path: str,
+    require_auth: bool,
+    raise_exception: bool,
+    public_api: bool,
+    kwargs: dict[str, Any],
+) -> Hashable | None:
+    """
+    Key identical GETs share their request under, or ``None`` when the
+    request must not be shared (unhashable params or other kwargs such as
+    headers or timeouts).
+    """
+    if not _SINGLE_FLIGHT_KWARGS.issuperset(kwargs):
+        return None
+    params = kwargs.get("params")
+    if isinstance(params, Mapping):
+        params = tuple(sorted(params.items(), key=lambda item: str(item[0])))
+    elif isinstance(params, list):
+        params = tuple(params)
+    key = (
+        path,
+        params,
+        kwargs.get("priority"),
+        require_auth,
+        raise_exception,
+        public_api,
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
 NFC_FINGERPRINT_SUPPORT_VERSION = Version("5.1.57")
 
 # Minimum interval (seconds) between two automatic public-bootstrap resyncs
@@ -372,6 +445,11 @@ def get_user_hash(host: str, username: str) -> str:
     return session.hexdigest()
 
 
+def _open_private(path: str, flags: int) -> int:
+    """`open` opener creating files only readable by their owner."""
+    return os.open(path, flags, 0o600)
+
+
 class BaseApiClient:
     _host: str
     _port: int
@@ -398,6 +476,7 @@ class BaseApiClient:
     _events_websocket: Websocket | None = None
     _devices_websocket: Websocket | None = None
     _public_resync_task: asyncio.Task[None] | None = None
+    _poll_events_fallback_task: asyncio.Task[None] | None = None
 
     private_api_path: str = "/proxy/protect/api/"
     public_api_path: str = "/proxy/protect/integration"
@@ -425,6 +504,7 @@ class BaseApiClient:
         store_sessions: bool = True,
         ws_receive_timeout: int | None = None,
         max_retries: int = RETRY_DEFAULT_ATTEMPTS,
+        connector: aiohttp.BaseConnector | None = None,
     ) -> None:
         # Public-only when no private credentials are supplied but an API key
         # is. The private session is never opened in this mode.
@@ -462,6 +542,12 @@ class BaseApiClient:
         # several consoles in one process never share a budget.
         self._public_rate_limiter = PublicApiRateLimiter()
         self._max_retries = max_retries
+        # Shared connection pool (``ProtectClientManager``); sessions created
+        # by this client use it without owning it.
+        self._connector = connector
+        # In-flight idempotent GETs shared by concurrent identical callers,
+        # see :meth:`api_request_raw`.
+        self._inflight_gets: dict[Hashable, asyncio.Task[bytes | None]] = {}
 
         self.config_dir = config_dir or (Path(user_config_dir()) / "ufp")
         self.cache_dir = cache_dir or (Path(user_cache_dir()) / "ufp_cache")
@@ -541,7 +627,11 @@ class BaseApiClient:
             if self._session is not None and self._session.closed:
                 _LOGGER.debug("Session was closed, creating a new one")
             # need unsafe to access httponly cookies
-            self._session = aiohttp.ClientSession(cookie_jar=CookieJar(unsafe=True))
+            self._session = aiohttp.ClientSession(
+                cookie_jar=CookieJar(unsafe=True),
+                connector=self._connector,
+                connector_owner=self._connector is None,
+            )
 
         return self._session
 
@@ -550,7 +640,10 @@ class BaseApiClient:
         if self._public_api_session is None or self._public_api_session.closed:
             if self._public_api_session is not None and self._public_api_session.closed:
                 _LOGGER.debug("Public API session was closed, creating a new one")
-            self._public_api_session = aiohttp.ClientSession()
+            self._public_api_session = aiohttp.ClientSession(
+                connector=self._connector,
+                connector_owner=self._connector is None,
+            )
 
         return self._public_api_session
 
@@ -634,6 +727,7 @@ class BaseApiClient:
         """Closing and deletes all client sessions."""
         await self._cancel_update_task()
         await self._cancel_public_resync_task()
+        await self._cancel_poll_events_fallback_task()
         await self._cancel_rtsps_refresh_tasks()
         if self._session is not None:
             await self._session.close()
@@ -667,6 +761,13 @@ class BaseApiClient:
                 await self._public_resync_task
             self._public_resync_task = None
 
+    async def _cancel_poll_events_fallback_task(self) -> None:
+        if self._poll_events_fallback_task is not None:
+            self._poll_events_fallback_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._poll_events_fallback_task
+            self._poll_events_fallback_task = None
+
     async def _cancel_rtsps_refresh_tasks(self) -> None:
         """Cancel and await every pending background RTSPS refresh task."""
         if not self._rtsps_refresh_tasks:
@@ -694,18 +795,18 @@ class BaseApiClient:
         request_url: URL,
         headers: dict[str, str],
         public_api: bool,
+        *,
+        priority: RequestPriority = RequestPriority.NORMAL,
         **kwargs: Any,
     ) -> aiohttp.ClientResponse:
         """Gate the public path through the rate limiter, then send the request."""
         if public_api:
-            await self._public_rate_limiter.acquire()
+            await self._public_rate_limiter.acquire(priority)
         response = await self._do_request(
             session, method, request_url, headers, **kwargs
         )
         if public_api:
-            self._public_rate_limiter.seed_from_policy(
-                response.headers.get("RateLimit-Policy")
-            )
+            self._public_rate_limiter.update_from_headers(response.headers)
         return response
 
     async def _do_request(
@@ -753,13 +854,16 @@ class BaseApiClient:
         require_auth: bool = False,
         auto_close: bool = True,
         public_api: bool = False,
+        *,
+        priority: RequestPriority = RequestPriority.NORMAL,
         **kwargs: Any,
     ) -> aiohttp.ClientResponse:
         """
         Make a request to UniFi Protect with automatic retry on transient errors.
 
         Automatically retries requests that receive 408, 429, 500, 502, 503,
-        or 504 status codes using exponential backoff.
+        or 504 status codes using exponential backoff. ``priority`` selects the
+        public rate-limiter lane; interactive commands skip queued bulk reads.
         """
         if require_auth and not public_api:
             await self.ensure_authenticated()
@@ -783,7 +887,13 @@ class BaseApiClient:
 
         # First attempt (always happens, even with max_retries=0)
         response = await self._paced_request(
-            session, method, request_url, headers, public_api, **kwargs
+            session,
+            method,
+            request_url,
+            headers,
+            public_api,
+            priority=priority,
+            **kwargs,
         )
 
         # Retry loop for transient errors
@@ -809,7 +919,13 @@ class BaseApiClient:
             )
             await asyncio.sleep(delay)
             response = await self._paced_request(
-                session, method, request_url, headers, public_api, **kwargs
+                session,
+                method,
+                request_url,
+                headers,
+                public_api,
+                priority=priority,
+                **kwargs,
             )
 
         # Re-auth-and-retry guard for early server-side session invalidation.
@@ -830,7 +946,13 @@ class BaseApiClient:
             if kwargs.get("headers") is None:
                 headers = self.headers or {}
             response = await self._paced_request(
-                session, method, request_url, headers, public_api, **kwargs
+                session,
+                method,
+                request_url,
+                headers,
+                public_api,
+                priority=priority,
+                **kwargs,
             )
 
         if auto_close:
@@ -860,17 +982,68 @@ class BaseApiClient:
         public_api: bool = False,
         **kwargs: Any,
     ) -> bytes | None:
-        """Make an API request; transport failures surface as ``NvrError``."""
+        """
+        Make an API request; transport failures surface as ``NvrError``.
+
+        Concurrent identical GETs (same path, params, priority and error
+        handling) share one request to the NVR and all receive its bytes.
+        Any other request makes later GETs start a fresh request instead of
+        joining one that may have been sent before it.
+        """
         path = self.private_api_path
         if api_path is not None:
             path = api_path
         elif public_api:
             path = self.public_api_path
 
-        response = await self.request(
+        request = partial(
+            self._api_request_raw,
             method,
             f"{path}{url}",
             require_auth=require_auth,
+            raise_exception=raise_exception,
+            public_api=public_api,
+            **kwargs,
+        )
+        if method.lower() != "get":
+            self._inflight_gets.clear()
+        elif (
+            key := _single_flight_key(
+                f"{path}{url}", require_auth, raise_exception, public_api, kwargs
+            )
+        ) is not None:
+            if (task := self._inflight_gets.get(key)) is None:
+                task = asyncio.create_task(request())
+                self._inflight_gets[key] = task
+                task.add_done_callback(partial(self._single_flight_done, key))
+            # a cancelled caller must not cancel the request for the others
+            return await asyncio.shield(task)
+
+        return await request()
+
+    def _single_flight_done(
+        self, key: Hashable, task: asyncio.Task[bytes | None]
+    ) -> None:
+        if self._inflight_gets.get(key) is task:
+            del self._inflight_gets[key]
+        if not task.cancelled():
+            # retrieved here so it is not reported when every caller was cancelled
+            task.exception()
+
+    async def _api_request_raw(
+        self,
+        method: str,
+        url: str,
+        *,
+        require_auth: bool,
+        raise_exception: bool,
+        public_api: bool,
+        **kwargs: Any,
+    ) -> bytes | None:
+        response = await self.request(
+            method,
+            url,
+            require_auth=require_auth,
             auto_close=False,
             public_api=public_api,
             **kwargs,
@@ -1364,11 +1537,18 @@ class ProtectApiClient(BaseApiClient):
         api_key: API key for UFP
         verify_ssl: Verify HTTPS certificate (default: `True`)
         session: Optional aiohttp session to use (default: generate one)
+        connector: Optional aiohttp connector shared with other clients for the sessions this client creates; it is not closed with the client (default: each session has its own)
         override_connection_host: Use `host` as your `connection_host` for RTSP stream instead of using the one provided by UniFi Protect.
         minimum_score: minimum score for events (default: `0`)
         subscribed_models: Model types you want to filter events for WS. You will need to manually check the bootstrap for updates for events that not subscibred.
         ignore_stats: Ignore storage, system, etc. stats/metrics from NVR and cameras (default: false)
         debug: Use full type validation (default: false)
+        poll_events_fallback_interval: Seconds between `poll_events` calls while the private Websocket is down (default: `None`, no fallback polling)
+        cache_bootstrap: Start from the bootstrap snapshot in `config_dir` and resume the Websocket from its `lastUpdateId` instead of downloading a new bootstrap (default: false)
+        ws_coalesce_window: Seconds to hold private Websocket updates so updates for the same device are emitted as one message (default: `None`, no coalescing)
+        ws_coalesce_bypass_keys: Changed fields that are emitted without waiting for the coalescing window (default: motion, ring and sensor trigger fields)
+        update_debounce_window: Seconds to wait for more device updates from the `.set_` methods before sending them as one PATCH (default: `0`, only updates queued in the same event loop iteration are merged)
+        snapshot_cache_max_bytes: Bytes of live snapshots kept for the `max_age` argument of the snapshot methods, e.g. 16 MiB for a few dozen full-size snapshots (default: `0`, caching disabled)
 
     """
 
@@ -1381,6 +1561,9 @@ class ProtectApiClient(BaseApiClient):
     _devices_ws_subscribed_models: set[ModelType] | None
     _ignore_stats: bool
     _ws_subscriptions: list[Callable[[WSSubscriptionMessage], None]]
+    _ws_router: WSSubscriptionRouter
+    _ws_coalescer: WSUpdateCoalescer | None
+    _snapshot_cache: SnapshotCache
     _events_ws_subscriptions: list[Callable[[WSSubscriptionMessage], None]]
     _devices_ws_subscriptions: list[Callable[[WSSubscriptionMessage], None]]
     _ws_state_subscriptions: list[Callable[[WebsocketState], None]]
@@ -1404,6 +1587,13 @@ class ProtectApiClient(BaseApiClient):
     # follow-up refresh.
     _public_resync_pending: bool = False
     _last_update_dt: datetime | None = None
+    # ``poll_events`` dedup index: event id -> ``end`` JS time, ``None`` while
+    # the event is still open. Closed events are pruned once the polled range
+    # has moved past their ``end`` since the range query can no longer
+    # return them.
+    _poll_events_index: dict[str, int | None]
+    _poll_events_fallback_interval: float | None
+    _cache_bootstrap: bool
     _connection_host: IPv4Address | IPv6Address | str | None = None
     # Lazy dispatcher; ``subscribe_events`` materialises it.
     _event_dispatcher: EventDispatcher | None = None
@@ -1460,6 +1650,13 @@ class ProtectApiClient(BaseApiClient):
         debug: bool = False,
         ws_receive_timeout: int | None = None,
         max_retries: int = RETRY_DEFAULT_ATTEMPTS,
+        connector: aiohttp.BaseConnector | None = None,
+        poll_events_fallback_interval: float | None = None,
+        cache_bootstrap: bool = False,
+        ws_coalesce_window: float | None = None,
+        ws_coalesce_bypass_keys: Iterable[str] | None = None,
+        update_debounce_window: float = 0,
+        snapshot_cache_max_bytes: int = DEFAULT_SNAPSHOT_CACHE_MAX_BYTES,
     ) -> None:
         super().__init__(
             host=host,
@@ -1476,6 +1673,7 @@ class ProtectApiClient(BaseApiClient):
             config_dir=config_dir,
             store_sessions=store_sessions,
             max_retries=max_retries,
+            connector=connector,
         )
 
         self._minimum_score = minimum_score
@@ -1486,6 +1684,16 @@ class ProtectApiClient(BaseApiClient):
         self._devices_ws_subscribed_models = devices_ws_subscribed_models
         self._ignore_stats = ignore_stats
         self._ws_subscriptions = []
+        self._ws_router = WSSubscriptionRouter()
+        self._ws_coalescer = None
+        if ws_coalesce_window is not None:
+            self._ws_coalescer = WSUpdateCoalescer(
+                self.emit_message,
+                ws_coalesce_window,
+                DEFAULT_BYPASS_KEYS
+                if ws_coalesce_bypass_keys is None
+                else frozenset(ws_coalesce_bypass_keys),
+            )
         self._events_ws_subscriptions = []
         self._devices_ws_subscriptions = []
         self._ws_state_subscriptions = []
@@ -1494,7 +1702,12 @@ class ProtectApiClient(BaseApiClient):
         self._event_dispatcher = None
         self._device_dispatcher = None
         self.ignore_unadopted = ignore_unadopted
+        self.update_debounce_window = update_debounce_window
+        self._snapshot_cache = SnapshotCache(snapshot_cache_max_bytes)
         self._update_lock = asyncio.Lock()
+        self._poll_events_index = {}
+        self._poll_events_fallback_interval = poll_events_fallback_interval
+        self._cache_bootstrap = cache_bootstrap
 
         if override_connection_host:
             self._connection_host = self._host
@@ -1625,6 +1838,11 @@ class ProtectApiClient(BaseApiClient):
         assert self._connection_host is not None
         return self._connection_host
 
+    @property
+    def bootstrap_cache_file(self) -> Path:
+        session_hash = get_user_hash(str(self._url), self._username or "")
+        return self.config_dir / f"bootstrap_{session_hash}.json"
+
     async def update(self) -> Bootstrap:
         """
         Updates the state of devices, initializes `.bootstrap`
@@ -1633,6 +1851,11 @@ class ProtectApiClient(BaseApiClient):
         subscriptions to it. update must be called at least
         once before subscribing to the websocket.
 
+        With `cache_bootstrap`, the first call is served from the snapshot
+        written by the last full update. The websocket then resumes from the
+        snapshot's `lastUpdateId`; if UniFi Protect rejects it, the bootstrap
+        is downloaded again.
+
         You can use the various other `get_` methods if you need one off data from UFP
         """
         if self._public_only:
@@ -1641,24 +1864,13 @@ class ProtectApiClient(BaseApiClient):
                 "use update_public() instead"
             )
         async with self._update_lock:
-            bootstrap = await self.get_bootstrap()
-            if bootstrap.nvr.version >= NFC_FINGERPRINT_SUPPORT_VERSION:
-                try:
-                    keyrings = await self.api_request_list("keyrings")
-                except NotAuthorized as err:
-                    _LOGGER.debug("No access to keyrings %s, skipping", err)
-                    keyrings = []
-                try:
-                    ulp_users = await self.api_request_list("ulp-users")
-                except NotAuthorized as err:
-                    _LOGGER.debug("No access to ulp-users %s, skipping", err)
-                    ulp_users = []
-                bootstrap.keyrings = Keyrings.from_list(
-                    cast("list[Keyring]", list_from_unifi_list(self, keyrings))
-                )
-                bootstrap.ulp_users = UlpUsers.from_list(
-                    cast("list[UlpUser]", list_from_unifi_list(self, ulp_users))
-                )
+            bootstrap: Bootstrap | None = None
+            if self._bootstrap is None and self._cache_bootstrap:
+                bootstrap = await self._read_bootstrap_cache()
+            if bootstrap is None:
+                bootstrap = await self._fetch_bootstrap()
+                if self._cache_bootstrap:
+                    await self._write_bootstrap_cache(bootstrap)
             self.__dict__.pop("bootstrap", None)
             self._bootstrap = bootstrap
 
@@ -1668,17 +1880,214 @@ class ProtectApiClient(BaseApiClient):
 
             return bootstrap
 
+    async def _fetch_bootstrap(self) -> Bootstrap:
+        """
+        Download the bootstrap together with its keyrings and ULP users.
+
+        The keyrings and ULP users are requested concurrently. If the NVR
+        version is already known from the current bootstrap, they are
+        requested alongside the bootstrap itself instead of after it.
+        """
+        keyrings_task: asyncio.Task[tuple[list[Any], list[Any]]] | None = None
+        if (
+            self._bootstrap is not None
+            and self._bootstrap.nvr.version >= NFC_FINGERPRINT_SUPPORT_VERSION
+        ):
+            keyrings_task = asyncio.create_task(self._get_keyrings_raw())
+        try:
+            bootstrap = await self.get_bootstrap()
+            if bootstrap.nvr.version >= NFC_FINGERPRINT_SUPPORT_VERSION:
+                if keyrings_task is None:
+                    keyrings_task = asyncio.create_task(self._get_keyrings_raw())
+                keyrings, ulp_users = await keyrings_task
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._set_bootstrap_keyrings, bootstrap, keyrings, ulp_users
+                )
+        finally:
+            if keyrings_task is not None and not keyrings_task.done():
+                keyrings_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await keyrings_task
+        return bootstrap
+
+    async def _get_keyrings_raw(self) -> tuple[list[Any], list[Any]]:
+        """Gets the raw keyrings and ULP users, empty if not accessible."""
+
+        async def _get_list(url: str) -> list[Any]:
+            try:
+                return await self.api_request_list(url)
+            except NotAuthorized as err:
+                _LOGGER.debug("No access to %s %s, skipping", url, err)
+                return []
+
+        keyrings, ulp_users = await asyncio.gather(
+            _get_list("keyrings"), _get_list("ulp-users")
+        )
+        return keyrings, ulp_users
+
+    def _set_bootstrap_keyrings(
+        self,
+        bootstrap: Bootstrap,
+        keyrings: list[dict[str, Any]],
+        ulp_users: list[dict[str, Any]],
+    ) -> None:
+        bootstrap.keyrings = Keyrings.from_list(
+            cast("list[Keyring]", list_from_unifi_list(self, keyrings))
+        )
+        bootstrap.ulp_users = UlpUsers.from_list(
+            cast("list[UlpUser]", list_from_unifi_list(self, ulp_users))
+        )
+
+    async def _read_bootstrap_cache(self) -> Bootstrap | None:
+        """Load the bootstrap snapshot written by `_write_bootstrap_cache`."""
+        try:
+            async with aiofiles.open(self.bootstrap_cache_file, "rb") as f:
+                data = orjson.loads(await f.read())
+            bootstrap = await self._async_bootstrap_from_unifi_dict(data["bootstrap"])
+            self._set_bootstrap_keyrings(bootstrap, data["keyrings"], data["ulpUsers"])
+        except FileNotFoundError:
+            _LOGGER.debug("No bootstrap cache file, downloading bootstrap")
+            return None
+        except Exception:
+            _LOGGER.warning("Invalid bootstrap cache file, ignoring.")
+            return None
+
+        _LOGGER.debug("Loaded bootstrap %s from cache", bootstrap.last_update_id)
+        return bootstrap
+
+    async def _write_bootstrap_cache(self, bootstrap: Bootstrap) -> None:
+        """
+        Write a snapshot of `bootstrap` for the next cold start.
+
+        The snapshot holds keyrings and ULP users, so it is only readable by
+        the owner and replaced atomically to never leave a partial file.
+        """
+        data = await asyncio.get_running_loop().run_in_executor(
+            None, self._dump_bootstrap_cache, bootstrap
+        )
+        await aos.makedirs(self.config_dir, exist_ok=True)
+        path = self.bootstrap_cache_file
+        tmp = path.with_name(f"{path.name}.tmp")
+        # the mode only applies to new files
+        with contextlib.suppress(FileNotFoundError):
+            await aos.remove(tmp)
+        async with aiofiles.open(tmp, "wb", opener=_open_private) as f:
+            await f.write(data)
+        await aos.replace(tmp, path)
+
+    @staticmethod
+    def _dump_bootstrap_cache(bootstrap: Bootstrap) -> bytes:
+        data = bootstrap.unifi_dict()
+        # not part of the bootstrap payload, fetched separately
+        del data["keyrings"], data["ulpUsers"]
+        return orjson.dumps(
+            {
+                "bootstrap": data,
+                "keyrings": [k.unifi_dict() for k in bootstrap.keyrings.as_list()],
+                "ulpUsers": [u.unifi_dict() for u in bootstrap.ulp_users.as_list()],
+            }
+        )
+
+    @property
+    def poll_events_state_file(self) -> Path:
+        session_hash = get_user_hash(str(self._url), self._username or "")
+        return self.cache_dir / f"poll_events_{session_hash}.json"
+
     async def poll_events(self) -> None:
-        """Poll for events."""
+        """
+        Poll for events.
+
+        Events are fetched incrementally from the last poll. Events that
+        were already processed and have ended are skipped; events that are
+        still open are re-processed (and re-fetched by id if they drop out of
+        the range query) until they end.
+
+        If `store_sessions` is enabled, the cursor and the open events are
+        persisted to `poll_events_state_file` so polling resumes where it
+        left off after a restart.
+        """
         now_dt = utc_now()
-        max_event_dt = now_dt - timedelta(hours=1)
-        events = await self.get_events(
-            start=self._last_update_dt or max_event_dt,
-            end=now_dt,
-        )
-        for event in events:
-            self.bootstrap.process_event(event)
+        if self._last_update_dt is None and self.store_sessions:
+            await self._read_poll_events_state()
+
+        max_event_dt = now_dt - POLL_EVENTS_MAX_LOOKBACK
+        start = max(self._last_update_dt or max_event_dt, max_event_dt)
+        index = self._poll_events_index
+        seen: set[str] = set()
+        for event in await self.get_events(start=start, end=now_dt):
+            seen.add(event.id)
+            if index.get(event.id) is not None:
+                continue
+            self._poll_process_event(event)
+
+        for event_id in [
+            event_id
+            for event_id, end in index.items()
+            if end is None and event_id not in seen
+        ]:
+            try:
+                event = await self.get_event(event_id)
+            except NvrError as err:
+                _LOGGER.debug("Dropping open event %s: %s", event_id, err)
+                del index[event_id]
+                continue
+            self._poll_process_event(event)
+
+        # keep closed events for one more poll so an event straddling the
+        # cursor is not processed twice
+        min_end = to_js_time(start)
+        self._poll_events_index = {
+            event_id: end
+            for event_id, end in index.items()
+            if end is None or end >= min_end
+        }
         self._last_update_dt = now_dt
+        if self.store_sessions:
+            await self._write_poll_events_state()
+
+    def _poll_process_event(self, event: Event) -> None:
+        self.bootstrap.process_event(event)
+        self._poll_events_index[event.id] = to_js_time(event.end)
+
+    async def _read_poll_events_state(self) -> None:
+        """Restore the `poll_events` cursor and open events from disk."""
+        try:
+            async with aiofiles.open(self.poll_events_state_file, "rb") as f:
+                state = orjson.loads(await f.read())
+            cursor = from_js_time(state["cursor"])
+            index: dict[str, int | None] = dict(state.get("events", {}))
+        except FileNotFoundError:
+            return
+        except Exception:
+            _LOGGER.warning("Invalid poll events state file, ignoring.")
+            return
+
+        self._last_update_dt = cursor
+        self._poll_events_index = index
+
+    async def _write_poll_events_state(self) -> None:
+        """Persist the `poll_events` cursor and dedup index to disk."""
+        if self._last_update_dt is None:
+            # no cursor to resume from yet
+            return
+        state = {
+            "cursor": to_js_time(self._last_update_dt),
+            "events": self._poll_events_index,
+        }
+        await aos.makedirs(self.cache_dir, exist_ok=True)
+        async with aiofiles.open(self.poll_events_state_file, "wb") as f:
+            await f.write(orjson.dumps(state))
+
+    async def _poll_events_fallback(self, interval: float) -> None:
+        """Poll for events until the private Websocket is back."""
+        _LOGGER.debug("Websocket down, polling events every %ss", interval)
+        while True:
+            if self._bootstrap is not None:
+                try:
+                    await self.poll_events()
+                except Exception:
+                    _LOGGER.exception("Failed to poll events")
+            await asyncio.sleep(interval)
 
     def emit_message(self, msg: WSSubscriptionMessage) -> None:
         """Emit message to all subscriptions."""
@@ -1707,6 +2116,12 @@ class ProtectApiClient(BaseApiClient):
             except Exception:
                 _LOGGER.exception("Exception while running subscription handler")
 
+        for sub in self._ws_router.match(msg):
+            try:
+                sub(msg)
+            except Exception:
+                _LOGGER.exception("Exception while running subscription handler")
+
     def emit_events_message(self, msg: WSSubscriptionMessage) -> None:
         """Emit message to all events subscriptions."""
         if _LOGGER.isEnabledFor(logging.DEBUG):
@@ -1778,7 +2193,20 @@ class ProtectApiClient(BaseApiClient):
         if processed_message is None:
             return
 
-        self.emit_message(processed_message)
+        self._invalidate_snapshots(processed_message)
+        if self._ws_coalescer is not None:
+            self._ws_coalescer.push(processed_message)
+        else:
+            self.emit_message(processed_message)
+
+    def _invalidate_snapshots(self, msg: WSSubscriptionMessage) -> None:
+        """Drops cached snapshots of a camera that detected motion."""
+        obj = msg.new_obj
+        if isinstance(obj, Camera):
+            if not SNAPSHOT_INVALIDATE_KEYS.isdisjoint(msg.changed_data):
+                self._snapshot_cache.invalidate(obj.id)
+        elif isinstance(obj, Event) and obj.camera_id is not None:
+            self._snapshot_cache.invalidate(obj.camera_id)
 
     def _process_events_ws_message(self, msg: aiohttp.WSMessage) -> None:
         """
@@ -1826,6 +2254,8 @@ class ProtectApiClient(BaseApiClient):
                 return
 
             update_id = item.get("id", "")
+            if model_type is ModelType.EVENT and (device_id := item.get("device")):
+                self._snapshot_cache.invalidate(device_id)
 
             new_obj: ProtectModelWithId | None = None
             old_obj: ProtectModelWithId | None = None
@@ -1931,102 +2361,133 @@ class ProtectApiClient(BaseApiClient):
         except Exception:
             _LOGGER.exception("Error processing public API devices websocket message")
 
-    async def _get_event_paginate(  # noqa: PLR0912
+    async def _iter_event_pages(
         self,
         params: dict[str, Any],
         *,
         start: datetime,
         end: datetime | None,
-    ) -> list[dict[str, Any]]:
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        """
+        Yield de-duplicated pages of events in ``[start, end]``, newest first.
+
+        Pages are requested through a sliding window of concurrent offset
+        fetches that widens from 1 to ``EVENT_PAGE_CONCURRENCY``, so small
+        ranges cost a single request while large backfills keep several pages
+        in flight. Results are still yielded in page order.
+        """
         start_int = to_js_time(start)
         end_int = to_js_time(end) if end else None
-        offset = 0
-        current_start = sys.maxsize
-        events: list[dict[str, Any]] = []
-        request_count = 0
-        logged = False
-
-        params["limit"] = 100
-        # greedy algorithm
-        # always force desc to receive faster results in the vast majority of cases
-        params["orderDirection"] = "DESC"
+        seen: set[str] = set()
+        pending: deque[asyncio.Task[list[Any]]] = deque()
+        next_offset = 0
+        window = 1
+
+        def _fetch(offset: int) -> asyncio.Task[list[Any]]:
+            # always force desc to receive faster results in the vast majority
+            # of cases; every page gets its own params for concurrent fetches
+            page_params = {
+                **params,
+                "limit": EVENT_PAGE_SIZE,
+                "offset": offset,
+                "orderDirection": "DESC",
+            }
+            _LOGGER.debug("page desc %s", offset)
+            return asyncio.create_task(
+                self.api_request_list("events", params=page_params)
+            )
 
         _LOGGER.debug("paginate desc %s %s", start_int, end_int)
-        while current_start > start_int:
-            params["offset"] = offset
-
-            _LOGGER.debug("page desc %s %s", offset, current_start)
-            new_events = await self.api_request_list("events", params=params)
-            request_count += 1
-            if not new_events:
-                break
-
-            if end_int is not None:
-                _LOGGER.debug("page end %s (%s)", new_events[0]["end"], end_int)
-                for event in new_events:
-                    if event["start"] <= end_int:
-                        events.append(event)
-                    else:
-                        break
-            else:
-                events += new_events
+        try:
+            for page_number in itertools.count(1):
+                while len(pending) < window:
+                    pending.append(_fetch(next_offset))
+                    next_offset += EVENT_PAGE_SIZE
+                window = min(window * 2, EVENT_PAGE_CONCURRENCY)
+
+                page = await pending.popleft()
+                if page_number == 6:
+                    _LOGGER.warning(TYPES_BUG_MESSAGE)
+                if not page:
+                    return
+
+                # new events shift offsets while paging, so pages can overlap
+                events = [
+                    event
+                    for event in page
+                    if event["id"] not in seen
+                    and event["start"] >= start_int
+                    and (end_int is None or event["start"] <= end_int)
+                ]
+                if events:
+                    seen.update(event["id"] for event in events)
+                    yield events
+
+                if len(page) < EVENT_PAGE_SIZE or page[-1]["start"] < start_int:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
-            offset += 100
+    async def _iter_event_windows(
+        self,
+        params: dict[str, Any],
+        *,
+        start: datetime,
+        end: datetime | None,
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        """
+        Yield events in ``[start, end]`` oldest first, one time window a page.
+
+        Each ``EVENT_ASC_WINDOW`` of the range is walked newest first like
+        `_iter_event_pages` and reversed, so only one window is held in memory.
+        """
+        if end is None:
+            end = utc_now()
+        window_start = start
+        while window_start <= end:
+            window_end = min(window_start + EVENT_ASC_WINDOW, end)
+            window_params = {
+                **params,
+                "start": to_js_time(window_start),
+                "end": to_js_time(window_end),
+            }
+            events = await self._get_event_paginate(
+                window_params, start=window_start, end=window_end
+            )
             if events:
-                current_start = events[-1]["start"]
-            if not logged and request_count > 5:
-                logged = True
-                _LOGGER.warning(TYPES_BUG_MESSAGE)
-
-        to_remove = 0
-        for event in reversed(events):
-            if event["start"] < start_int:
-                to_remove += 1
-            else:
-                break
-        if to_remove:
-            events = events[:-to_remove]
-
-        return events
+                events.reverse()
+                yield events
+            window_start = window_end + timedelta(milliseconds=1)
 
-    async def get_events_raw(  # noqa: PLR0912
+    async def _get_event_paginate(
         self,
+        params: dict[str, Any],
         *,
-        start: datetime | None = None,
-        end: datetime | None = None,
-        limit: int | None = None,
-        offset: int | None = None,
-        types: list[EventType] | None = None,
-        smart_detect_types: list[SmartDetectObjectType] | None = None,
-        sorting: Literal["asc", "desc"] = "asc",
-        descriptions: bool = True,
-        all_cameras: bool | None = None,
-        category: EventCategories | None = None,
-        # used for testing
-        _allow_manual_paginate: bool = True,
+        start: datetime,
+        end: datetime | None,
     ) -> list[dict[str, Any]]:
-        """
-        Get list of events from Protect
-
-        Args:
-        ----
-            start: start time for events
-            end: end time for events
-            limit: max number of events to return
-            offset: offset to start fetching events from
-            types: list of EventTypes to get events for
-            smart_detect_types: Filters the Smart detection types for the events
-            sorting: sort events by ascending or descending, defaults to ascending (chronologic order)
-            description: included additional event metadata
-            category: event category, will provide additional category/subcategory fields
-
-
-        If `limit`, `start` and `end` are not provided, it will default to all events in the last 24 hours.
-
-        If `start` is provided, then `end` or `limit` must be provided. If `end` is provided, then `start` or
-        `limit` must be provided. Otherwise, you will get a 400 error from UniFi Protect
+        events: list[dict[str, Any]] = []
+        async for page in self._iter_event_pages(params, start=start, end=end):
+            events += page
+        return events
 
-        """
+    def _get_events_params(
+        self,
+        *,
+        start: datetime | None,
+        end: datetime | None,
+        limit: int | None,
+        offset: int | None,
+        types: list[EventType] | None,
+        smart_detect_types: list[SmartDetectObjectType] | None,
+        sorting: Literal["asc", "desc"],
+        descriptions: bool,
+        all_cameras: bool | None,
+        category: EventCategories | None,
+    ) -> tuple[dict[str, Any], datetime | None, datetime | None]:
+        """Build ``/events`` query params; returns them with the resolved range."""
         # if no parameters are passed in, default to all events from last 24 hours
         if limit is None and start is None and end is None:
             end = utc_now() + timedelta(seconds=10)
@@ -2059,34 +2520,11 @@ class ProtectApiClient(BaseApiClient):
         if category is not None:
             params["categories"] = category
 
-        # manual workaround for a UniFi Protect bug
-        # if types if missing from query params
-        if _allow_manual_paginate and "types" not in params and start is not None:
-            if sorting == "asc":
-                events = await self._get_event_paginate(
-                    params,
-                    start=start,
-                    end=end,
-                )
-                events = list(reversed(events))
-            else:
-                events = await self._get_event_paginate(
-                    params,
-                    start=start,
-                    end=end,
-                )
-
-            if limit:
-                offset = offset or 0
-                events = events[offset : limit + offset]
-            elif offset:
-                events = events[offset:]
-            return events
-
-        return await self.api_request_list("events", params=params)
+        return params, start, end
 
-    async def get_events(
+    async def get_events_raw(
         self,
+        *,
         start: datetime | None = None,
         end: datetime | None = None,
         limit: int | None = None,
@@ -2095,16 +2533,13 @@ class ProtectApiClient(BaseApiClient):
         smart_detect_types: list[SmartDetectObjectType] | None = None,
         sorting: Literal["asc", "desc"] = "asc",
         descriptions: bool = True,
+        all_cameras: bool | None = None,
         category: EventCategories | None = None,
         # used for testing
         _allow_manual_paginate: bool = True,
-    ) -> list[Event]:
+    ) -> list[dict[str, Any]]:
         """
-        Same as `get_events_raw`, except
-
-        * returns actual `Event` objects instead of raw Python dictionaries
-        * filers out non-device events
-        * filters out events with too low of a score
+        Get list of events from Protect
 
         Args:
         ----
@@ -2125,7 +2560,7 @@ class ProtectApiClient(BaseApiClient):
         `limit` must be provided. Otherwise, you will get a 400 error from UniFi Protect
 
         """
-        response = await self.get_events_raw(
+        params, start, end = self._get_events_params(
             start=start,
             end=end,
             limit=limit,
@@ -2134,41 +2569,234 @@ class ProtectApiClient(BaseApiClient):
             smart_detect_types=smart_detect_types,
             sorting=sorting,
             descriptions=descriptions,
+            all_cameras=all_cameras,
             category=category,
-            _allow_manual_paginate=_allow_manual_paginate,
         )
-        events = []
-
-        for event_dict in response:
-            # ignore unknown events
-            if (
-                "type" not in event_dict
-                or event_dict["type"] not in EventType.values_set()
-            ):
-                _LOGGER.debug("Unknown event type: %s", event_dict)
-                continue
-
-            event = create_from_unifi_dict(event_dict, api=self)
 
-            # should never happen
-            if not isinstance(event, Event):
-                continue
+        # manual workaround for a UniFi Protect bug
+        # if types if missing from query params
+        if _allow_manual_paginate and "types" not in params and start is not None:
+            events = await self._get_event_paginate(
+                params,
+                start=start,
+                end=end,
+            )
+            if sorting == "asc":
+                events.reverse()
 
-            if (
-                event.type.value in EventType.device_events_set()
-                and event.score >= self._minimum_score
-            ):
-                events.append(event)
+            if limit:
+                offset = offset or 0
+                events = events[offset : limit + offset]
+            elif offset:
+                events = events[offset:]
+            return events
 
-        return events
+        return await self.api_request_list("events", params=params)
 
-    def subscribe_websocket(
+    async def iter_events_raw(
         self,
-        ws_callback: Callable[[WSSubscriptionMessage], None],
-    ) -> Callable[[], None]:
-        """
-        Subscribe to websocket events.
-
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        types: list[EventType] | None = None,
+        smart_detect_types: list[SmartDetectObjectType] | None = None,
+        sorting: Literal["asc", "desc"] = "asc",
+        descriptions: bool = True,
+        all_cameras: bool | None = None,
+        category: EventCategories | None = None,
+        # used for testing
+        _allow_manual_paginate: bool = True,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        Stream events from Protect page by page.
+
+        Takes the same arguments as `get_events_raw` and yields the same
+        events, but only holds the current page (``EVENT_PAGE_SIZE`` events)
+        in memory; the next page is requested as the consumer catches up.
+
+        Without `types`, the UniFi Protect `start` / `end` bug means events
+        are walked newest first; ascending order then holds one
+        ``EVENT_ASC_WINDOW`` of events at a time instead.
+        """
+        params, start, end = self._get_events_params(
+            start=start,
+            end=end,
+            limit=limit,
+            offset=offset,
+            types=types,
+            smart_detect_types=smart_detect_types,
+            sorting=sorting,
+            descriptions=descriptions,
+            all_cameras=all_cameras,
+            category=category,
+        )
+        skip = offset or 0
+        remaining = limit or None
+
+        if _allow_manual_paginate and "types" not in params and start is not None:
+            iter_pages = (
+                self._iter_event_windows if sorting == "asc" else self._iter_event_pages
+            )
+            async with contextlib.aclosing(
+                iter_pages(params, start=start, end=end)
+            ) as pages:
+                async for page in pages:
+                    if skip >= len(page):
+                        skip -= len(page)
+                        continue
+                    page = page[skip:]  # noqa: PLW2901
+                    skip = 0
+                    if remaining is not None:
+                        page = page[:remaining]  # noqa: PLW2901
+                        remaining -= len(page)
+                    for event in page:
+                        yield event
+                    if remaining == 0:
+                        return
+            return
+
+        while True:
+            page_size = EVENT_PAGE_SIZE
+            if remaining is not None:
+                page_size = min(page_size, remaining)
+            page = await self.api_request_list(
+                "events", params={**params, "limit": page_size, "offset": skip}
+            )
+            for event in page:
+                yield event
+            if len(page) < page_size:
+                return
+            skip += len(page)
+            if remaining is not None:
+                remaining -= len(page)
+                if remaining <= 0:
+                    return
+
+    def _event_from_raw(self, event_dict: dict[str, Any]) -> Event | None:
+        """Convert a raw event, dropping non-device and low-score events."""
+        # ignore unknown events
+        if "type" not in event_dict or event_dict["type"] not in EventType.values_set():
+            _LOGGER.debug("Unknown event type: %s", event_dict)
+            return None
+
+        event = create_from_unifi_dict(event_dict, api=self)
+
+        # should never happen
+        if not isinstance(event, Event):
+            return None
+
+        if (
+            event.type.value in EventType.device_events_set()
+            and event.score >= self._minimum_score
+        ):
+            return event
+        return None
+
+    async def get_events(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        types: list[EventType] | None = None,
+        smart_detect_types: list[SmartDetectObjectType] | None = None,
+        sorting: Literal["asc", "desc"] = "asc",
+        descriptions: bool = True,
+        category: EventCategories | None = None,
+        # used for testing
+        _allow_manual_paginate: bool = True,
+    ) -> list[Event]:
+        """
+        Same as `get_events_raw`, except
+
+        * returns actual `Event` objects instead of raw Python dictionaries
+        * filers out non-device events
+        * filters out events with too low of a score
+
+        Args:
+        ----
+            start: start time for events
+            end: end time for events
+            limit: max number of events to return
+            offset: offset to start fetching events from
+            types: list of EventTypes to get events for
+            smart_detect_types: Filters the Smart detection types for the events
+            sorting: sort events by ascending or descending, defaults to ascending (chronologic order)
+            description: included additional event metadata
+            category: event category, will provide additional category/subcategory fields
+
+
+        If `limit`, `start` and `end` are not provided, it will default to all events in the last 24 hours.
+
+        If `start` is provided, then `end` or `limit` must be provided. If `end` is provided, then `start` or
+        `limit` must be provided. Otherwise, you will get a 400 error from UniFi Protect
+
+        """
+        response = await self.get_events_raw(
+            start=start,
+            end=end,
+            limit=limit,
+            offset=offset,
+            types=types,
+            smart_detect_types=smart_detect_types,
+            sorting=sorting,
+            descriptions=descriptions,
+            category=category,
+            _allow_manual_paginate=_allow_manual_paginate,
+        )
+        return [
+            event
+            for event_dict in response
+            if (event := self._event_from_raw(event_dict)) is not None
+        ]
+
+    async def iter_events(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        types: list[EventType] | None = None,
+        smart_detect_types: list[SmartDetectObjectType] | None = None,
+        sorting: Literal["asc", "desc"] = "asc",
+        descriptions: bool = True,
+        category: EventCategories | None = None,
+        # used for testing
+        _allow_manual_paginate: bool = True,
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Same as `get_events`, but streamed like `iter_events_raw`.
+
+        Each raw event is converted to an `Event` only when the consumer asks
+        for it, so memory stays bounded by the page size.
+        """
+        async with contextlib.aclosing(
+            self.iter_events_raw(
+                start=start,
+                end=end,
+                limit=limit,
+                offset=offset,
+                types=types,
+                smart_detect_types=smart_detect_types,
+                sorting=sorting,
+                descriptions=descriptions,
+                category=category,
+                _allow_manual_paginate=_allow_manual_paginate,
+            )
+        ) as raw_events:
+            async for event_dict in raw_events:
+                if (event := self._event_from_raw(event_dict)) is not None:
+                    yield event
+
+    def subscribe_websocket(
+        self,
+        ws_callback: Callable[[WSSubscriptionMessage], None],
+    ) -> Callable[[], None]:
+        """
+        Subscribe to websocket events.
+
         Returns a callback that will unsubscribe.
         """
         _LOGGER.debug("Adding subscription: %s", ws_callback)
@@ -2176,6 +2804,40 @@ class ProtectApiClient(BaseApiClient):
         self._get_websocket().start()
         return partial(self._unsubscribe_websocket, ws_callback)
 
+    def subscribe_websocket_device(
+        self,
+        ws_callback: Callable[[WSSubscriptionMessage], None],
+        model_type: ModelType,
+        device_id: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> Callable[[], None]:
+        """
+        Subscribe to websocket events for a single device or model.
+
+        Only messages for `model_type` are delivered, and only for `device_id`
+        if it is given. If `fields` is given, updates are only delivered when
+        one of those fields changed; adds and removes are always delivered.
+
+        Subscriptions are indexed, so this scales better than filtering in a
+        `subscribe_websocket` callback when there are many subscribers.
+
+        Returns a callback that will unsubscribe.
+        """
+        _LOGGER.debug(
+            "Adding subscription: %s (%s:%s)", ws_callback, model_type, device_id
+        )
+        if fields is not None:
+            fields = frozenset(fields)
+        self._ws_router.add(ws_callback, model_type, device_id, fields)
+        self._get_websocket().start()
+        return partial(
+            self._unsubscribe_websocket_device,
+            ws_callback,
+            model_type,
+            device_id,
+            fields,
+        )
+
     def subscribe_events_websocket(
         self,
         ws_callback: Callable[[WSSubscriptionMessage], None],
@@ -2493,7 +3155,20 @@ class ProtectApiClient(BaseApiClient):
         """Unsubscribe to websocket events."""
         _LOGGER.debug("Removing subscription: %s", ws_callback)
         self._ws_subscriptions.remove(ws_callback)
-        if not self._ws_subscriptions:
+        if not self._ws_subscriptions and not self._ws_router:
+            self._get_websocket().stop()
+
+    def _unsubscribe_websocket_device(
+        self,
+        ws_callback: Callable[[WSSubscriptionMessage], None],
+        model_type: ModelType,
+        device_id: str | None,
+        fields: Iterable[str] | None,
+    ) -> None:
+        """Unsubscribe to websocket events for a device or model."""
+        _LOGGER.debug("Removing subscription: %s", ws_callback)
+        self._ws_router.remove(ws_callback, model_type, device_id, fields)
+        if not self._ws_subscriptions and not self._ws_router:
             self._get_websocket().stop()
 
     def _unsubscribe_events_websocket(
@@ -2573,9 +3248,36 @@ class ProtectApiClient(BaseApiClient):
         """Unsubscribe to devices websocket state changes."""
         self._devices_ws_state_subscriptions.remove(ws_callback)
 
+    async def close_session(self) -> None:
+        """Closing and deletes all client sessions."""
+        # emit updates still held back before the client goes away
+        if self._ws_coalescer is not None:
+            self._ws_coalescer.flush()
+        await super().close_session()
+
     def _on_websocket_state_change(self, state: WebsocketState) -> None:
         """Websocket state changed."""
         super()._on_websocket_state_change(state)
+        # held updates go out before subscribers learn of a disconnect
+        if state is not WebsocketState.CONNECTED and self._ws_coalescer is not None:
+            self._ws_coalescer.flush()
+        if (interval := self._poll_events_fallback_interval) is not None:
+            task = self._poll_events_fallback_task
+            websocket = self._private_websocket
+            # a deliberate `stop()` also reports DISCONNECTED; only poll while
+            # the websocket is still trying to reconnect
+            if (
+                state is WebsocketState.CONNECTED
+                or websocket is None
+                or not websocket.is_running
+            ):
+                if task is not None:
+                    task.cancel()
+                    self._poll_events_fallback_task = None
+            elif task is None or task.done():
+                self._poll_events_fallback_task = asyncio.create_task(
+                    self._poll_events_fallback(interval)
+                )
         for sub in self._ws_state_subscriptions:
             try:
                 sub(state)
@@ -2830,8 +3532,14 @@ class ProtectApiClient(BaseApiClient):
                 "use update_public() instead"
             )
         data = await self.api_request_obj("bootstrap")
+        return await self._async_bootstrap_from_unifi_dict(data)
+
+    async def _async_bootstrap_from_unifi_dict(self, data: dict[str, Any]) -> Bootstrap:
+        """Builds the `Bootstrap` models in the executor to keep the loop free."""
         await _async_warm_nvr_timezone(data["nvr"])
-        return Bootstrap.from_unifi_dict(**data, api=self)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, partial(Bootstrap.from_unifi_dict, **data, api=self)
+        )
 
     async def get_devices_raw(self, model_type: ModelType) -> list[dict[str, Any]]:
         """Gets a raw device list given a model_type"""
@@ -3063,17 +3771,51 @@ class ProtectApiClient(BaseApiClient):
             await self.get_device(ModelType.LIVEVIEW, device_id, Liveview),
         )
 
+    def snapshot_cache_stats(self) -> dict[str, int]:
+        """Counters of the live snapshot cache used by the `max_age` argument."""
+        cache = self._snapshot_cache
+        return {
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "evictions": cache.evictions,
+            "entries": len(cache),
+            "bytes": cache.nbytes,
+        }
+
+    async def _get_cached_snapshot(
+        self,
+        camera_id: str,
+        variant: Hashable,
+        max_age: float | None,
+        fetch: Callable[[], Awaitable[bytes | None]],
+    ) -> bytes | None:
+        cache = self._snapshot_cache
+        if (
+            max_age is not None
+            and (data := cache.get(camera_id, variant, max_age)) is not None
+        ):
+            return data
+        generation = cache.generation(camera_id)
+        if (data := await fetch()) is not None:
+            cache.put(camera_id, variant, data, generation)
+        return data
+
     async def get_camera_snapshot(
         self,
         camera_id: str,
         width: int | None = None,
         height: int | None = None,
         dt: datetime | None = None,
+        max_age: float | None = None,
     ) -> bytes | None:
         """
         Gets snapshot for a camera.
 
         Datetime of screenshot is approximate. It may be +/- a few seconds.
+
+        With `max_age`, a live snapshot of the same size fetched at most
+        `max_age` seconds ago is returned instead of requesting a new one,
+        unless the camera detected motion since.
         """
         params: dict[str, Any] = {}
         if dt is not None:
@@ -3090,17 +3832,24 @@ class ProtectApiClient(BaseApiClient):
         if height is not None:
             params["h"] = height
 
-        return await self.api_request_raw(
+        fetch = partial(
+            self.api_request_raw,
             f"cameras/{camera_id}/{path}",
             params=params,
             raise_exception=False,
         )
+        if dt is not None:
+            return await fetch()
+        return await self._get_cached_snapshot(
+            camera_id, ("snapshot", width, height), max_age, fetch
+        )
 
     async def get_public_api_camera_snapshot(
         self,
         camera_id: str,
         high_quality: bool = False,
         package: bool = False,
+        max_age: float | None = None,
     ) -> bytes | None:
         """
         Gets snapshot for a camera using public api.
@@ -3111,16 +3860,25 @@ class ProtectApiClient(BaseApiClient):
             package: If ``True``, fetch from the package camera (only supported
                 on cameras with ``hasPackageCamera: true``). Requires Protect
                 on the NVR.
+            max_age: Return a snapshot fetched at most this many seconds ago
+                instead of requesting a new one, unless the camera detected
+                motion since.
 
         """
         params: dict[str, Any] = {"highQuality": pybool_to_json_bool(high_quality)}
         if package:
             params["channel"] = "package"
-        return await self.api_request_raw(
-            public_api=True,
-            raise_exception=False,
-            url=f"/v1/cameras/{camera_id}/snapshot",
-            params=params,
+        return await self._get_cached_snapshot(
+            camera_id,
+            ("public", high_quality, package),
+            max_age,
+            partial(
+                self.api_request_raw,
+                public_api=True,
+                raise_exception=False,
+                url=f"/v1/cameras/{camera_id}/snapshot",
+                params=params,
+            ),
         )
 
     async def create_camera_rtsps_streams(
@@ -3250,11 +4008,14 @@ class ProtectApiClient(BaseApiClient):
         width: int | None = None,
         height: int | None = None,
         dt: datetime | None = None,
+        max_age: float | None = None,
     ) -> bytes | None:
         """
         Gets snapshot from the package camera.
 
         Datetime of screenshot is approximate. It may be +/- a few seconds.
+
+        `max_age` works as for `get_camera_snapshot`.
         """
         params: dict[str, Any] = {}
         if dt is not None:
@@ -3272,30 +4033,78 @@ class ProtectApiClient(BaseApiClient):
         if height is not None:
             params["h"] = height
 
-        return await self.api_request_raw(
+        fetch = partial(
+            self.api_request_raw,
             f"cameras/{camera_id}/{path}",
             params=params,
             raise_exception=False,
         )
+        if dt is not None:
+            return await fetch()
+        return await self._get_cached_snapshot(
+            camera_id, ("package", width, height), max_age, fetch
+        )
 
-    async def _stream_response(
+    @contextlib.asynccontextmanager
+    async def _open_media_stream(
         self,
-        response: aiohttp.ClientResponse,
+        path: str,
         chunk_size: int,
+        *,
+        retry_timeout: float = 0,
+        **kwargs: Any,
+    ) -> AsyncIterator[MediaStream]:
+        """
+        Opens a streamed GET of `path` on the private API.
+
+        Unsuccessful responses are retried every 0.5s until `retry_timeout`
+        seconds have passed, then raised. The response is closed on exit.
+        """
+        timeout = time.monotonic() + retry_timeout
+        while True:
+            response = await self.request(
+                "get",
+                f"{self.private_api_path}{path}",
+                require_auth=True,
+                auto_close=False,
+                **kwargs,
+            )
+            if 200 <= response.status < 300:
+                break
+            try:
+                if time.monotonic() >= timeout:
+                    await self._raise_for_status(response)
+            finally:
+                response.close()
+            await asyncio.sleep(0.5)
+
+        try:
+            yield MediaStream(response, chunk_size)
+        finally:
+            response.close()
+
+    async def _stream_response(
+        self,
+        stream: MediaStream,
         iterator_callback: IteratorCallback | None = None,
         progress_callback: ProgressCallback | None = None,
     ) -> None:
-        total = response.content_length or 0
-        current = 0
+        total = stream.content_length or 0
         if iterator_callback is not None:
             await iterator_callback(total, None)
-        async for chunk in response.content.iter_chunked(chunk_size):
-            step = len(chunk)
-            current += step
+        async for chunk in stream:
             if iterator_callback is not None:
                 await iterator_callback(total, chunk)
             if progress_callback is not None:
-                await progress_callback(step, current, total)
+                await progress_callback(len(chunk), stream.bytes_read, total)
+
+    def _validate_channel_index(self, camera_id: str, channel_index: int) -> None:
+        if self._bootstrap is not None:
+            camera = self._bootstrap.cameras[camera_id]
+            try:
+                camera.channels[channel_index]
+            except IndexError as e:
+                raise BadRequest from e
 
     async def get_camera_video(
         self,
@@ -3323,28 +4132,12 @@ class ProtectApiClient(BaseApiClient):
         value. Protect app gives the options for 60x (fps=4), 120x (fps=8), 300x
         (fps=20), and 600x (fps=40).
         """
-        if validate_channel_id and self._bootstrap is not None:
-            camera = self._bootstrap.cameras[camera_id]
-            try:
-                camera.channels[channel_index]
-            except IndexError as e:
-                raise BadRequest from e
-
-        params = {
-            "camera": camera_id,
-            "start": to_js_time(start),
-            "end": to_js_time(end),
-        }
-
-        if fps is not None:
-            params["fps"] = fps
-            params["type"] = "timelapse"
-
-        if channel_index == 3:
-            params.update({"lens": 2})
-        else:
-            params.update({"channel": channel_index})
+        if validate_channel_id:
+            self._validate_channel_index(camera_id, channel_index)
 
+        params = self._camera_video_params(
+            camera_id, start, end, channel_index=channel_index, fps=fps
+        )
         path = "video/export"
         if (
             iterator_callback is None
@@ -3360,17 +4153,15 @@ class ProtectApiClient(BaseApiClient):
         _LOGGER.debug(
             "Requesting camera video: %s%s %s", self.private_api_path, path, params
         )
-        r = await self.request(
-            "get",
-            f"{self.private_api_path}{path}",
-            auto_close=False,
-            timeout=0,
-            params=params,
-        )
-        if r.status != 200:
-            await self._raise_for_status(r, True)
+        async with self._open_media_stream(
+            path, chunk_size, timeout=0, params=params
+        ) as stream:
+            if output_file is None:
+                await self._stream_response(
+                    stream, iterator_callback, progress_callback
+                )
+                return None
 
-        if output_file is not None:
             async with aiofiles.open(output_file, "wb") as output:
 
                 async def callback(total: int, chunk: bytes | None) -> None:
@@ -3379,17 +4170,273 @@ class ProtectApiClient(BaseApiClient):
                     if chunk is not None:
                         await output.write(chunk)
 
-                await self._stream_response(r, chunk_size, callback, progress_callback)
-        else:
-            await self._stream_response(
-                r,
-                chunk_size,
-                iterator_callback,
-                progress_callback,
-            )
-        r.close()
+                await self._stream_response(stream, callback, progress_callback)
         return None
 
+    def _camera_video_params(
+        self,
+        camera_id: str,
+        start: datetime,
+        end: datetime,
+        *,
+        channel_index: int,
+        fps: int | None,
+    ) -> dict[str, Any]:
+        params: dict[str, Any] = {
+            "camera": camera_id,
+            "start": to_js_time(start),
+            "end": to_js_time(end),
+        }
+
+        if fps is not None:
+            params["fps"] = fps
+            params["type"] = "timelapse"
+
+        if channel_index == 3:
+            params.update({"lens": 2})
+        else:
+            params.update({"channel": channel_index})
+        return params
+
+    @contextlib.asynccontextmanager
+    async def stream_camera_video(
+        self,
+        camera_id: str,
+        start: datetime,
+        end: datetime,
+        channel_index: int = 0,
+        *,
+        validate_channel_id: bool = True,
+        fps: int | None = None,
+        chunk_size: int = 65536,
+    ) -> AsyncIterator[MediaStream]:
+        """
+        Streams MP4 video from a given camera at a specific time.
+
+        Same export as `get_camera_video`, but the video is read from the
+        connection as the returned `MediaStream` is iterated instead of
+        being downloaded first, so it can be relayed without holding it in
+        memory.
+
+        ```python
+        async with protect.stream_camera_video(camera_id, start, end) as stream:
+            async for chunk in stream:
+                await response.write(chunk)
+        ```
+        """
+        if validate_channel_id:
+            self._validate_channel_index(camera_id, channel_index)
+
+        params = self._camera_video_params(
+            camera_id, start, end, channel_index=channel_index, fps=fps
+        )
+        async with self._open_media_stream(
+            "video/export", chunk_size, timeout=0, params=params
+        ) as stream:
+            yield stream
+
+    @contextlib.asynccontextmanager
+    async def stream_event_video(
+        self,
+        event_id: str,
+        channel_index: int = 0,
+        *,
+        chunk_size: int = 65536,
+    ) -> AsyncIterator[MediaStream]:
+        """
+        Streams the MP4 video of a given event.
+
+        The event is taken from the bootstrap if it is there, otherwise it
+        is fetched. Raises `BadRequest` for events without a camera and for
+        events that have not ended yet.
+        """
+        event = (
+            self._bootstrap.events.get(event_id)
+            if self._bootstrap is not None
+            else None
+        )
+        if event is None:
+            event = await self.get_event(event_id)
+        if event.camera_id is None:
+            raise BadRequest(f"Event {event_id} does not have a camera")
+        if event.end is None:
+            raise BadRequest(f"Event {event_id} has not ended")
+
+        async with self.stream_camera_video(
+            event.camera_id,
+            event.start,
+            event.end,
+            channel_index,
+            chunk_size=chunk_size,
+        ) as stream:
+            yield stream
+
+    async def export_camera_video(
+        self,
+        camera_id: str,
+        start: datetime,
+        end: datetime,
+        output_file: Path,
+        *,
+        channel_index: int = 0,
+        validate_channel_id: bool = True,
+        segment_length: timedelta = DEFAULT_EXPORT_SEGMENT,
+        max_concurrency: int = EXPORT_CONCURRENCY,
+        retries: int = EXPORT_SEGMENT_RETRIES,
+        fragmented: bool = False,
+        resume: bool = True,
+        progress_callback: ProgressCallback | None = None,
+        chunk_size: int = 65536,
+    ) -> None:
+        """
+        Exports MP4 video from a given camera in segments downloaded in parallel.
+
+        The range is split into `segment_length` pieces that are exported at
+        most `max_concurrency` at a time, each retried up to `retries` times,
+        and joined into `output_file` without re-encoding. Segments are
+        appended as soon as all earlier ones are done; with `fragmented`, a
+        fragmented MP4 is written so the file is playable while it grows.
+
+        Downloaded segments are kept next to `output_file` until the export
+        completes, with their ranges, sizes and checksums in a
+        ``<output_file>.export.json`` sidecar. If the export fails,
+        `output_file` is removed but the segments are kept, and running the
+        same export again with `resume` only downloads the missing ones.
+
+        Like `get_camera_video`, segment boundaries are approximate, so
+        a few frames may repeat or be missing where segments meet. The
+        `progress_callback` gets the bytes downloaded over all segments and
+        a total of ``0``, as the total size is not known up front.
+        """
+        if end <= start:
+            raise BadRequest(f"Export end {end} is not after its start {start}")
+        if validate_channel_id:
+            self._validate_channel_index(camera_id, channel_index)
+
+        ranges = split_range(start, end, segment_length)
+        state = ExportState(output_file, camera_id, channel_index)
+        if resume:
+            await state.load()
+        await aos.makedirs(state.parts_dir, exist_ok=True)
+        parts = [state.parts_dir / f"{index:05d}.mp4" for index in range(len(ranges))]
+        downloaded = [0] * len(ranges)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _download(index: int) -> None:
+            async def _progress(step: int, current: int, total: int) -> None:
+                downloaded[index] = current
+                if progress_callback is not None:
+                    await progress_callback(step, sum(downloaded), 0)
+
+            segment_start, segment_end = ranges[index]
+            if size := await state.is_complete(
+                segment_start, segment_end, parts[index]
+            ):
+                _LOGGER.debug("Reusing exported segment %s", parts[index])
+                await _progress(size, size, size)
+                return
+            async with semaphore:
+                await self._download_export_segment(
+                    camera_id,
+                    ranges[index],
+                    parts[index],
+                    channel_index=channel_index,
+                    state=state,
+                    retries=retries,
+                    progress_callback=_progress,
+                    chunk_size=chunk_size,
+                )
+
+        loop = asyncio.get_running_loop()
+        concatenator = Mp4Concatenator(output_file, fragmented)
+        tasks = [asyncio.create_task(_download(index)) for index in range(len(ranges))]
+        appending: asyncio.Future[None] | None = None
+        try:
+            for task, part in zip(tasks, parts, strict=True):
+                await task
+                appending = loop.run_in_executor(None, concatenator.append, part)
+                await appending
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if appending is not None:
+                # the executor keeps appending after a cancel; wait for it
+                # before closing the output
+                await asyncio.gather(appending, return_exceptions=True)
+            # the output is removed anyway; never mask the original error
+            with contextlib.suppress(Exception):
+                await loop.run_in_executor(None, concatenator.close)
+            with contextlib.suppress(FileNotFoundError):
+                await aos.remove(output_file)
+            raise
+        await loop.run_in_executor(None, concatenator.close)
+        await state.remove()
+
+    async def _download_export_segment(
+        self,
+        camera_id: str,
+        segment: tuple[datetime, datetime],
+        part: Path,
+        *,
+        channel_index: int,
+        state: ExportState,
+        retries: int,
+        progress_callback: ProgressCallback,
+        chunk_size: int,
+    ) -> None:
+        for attempt in range(retries + 1):
+            try:
+                size, sha256 = await self._download_export_part(
+                    camera_id,
+                    segment,
+                    part,
+                    channel_index=channel_index,
+                    progress_callback=progress_callback,
+                    chunk_size=chunk_size,
+                )
+            except (NvrError, client_exceptions.ClientError, TimeoutError):
+                if attempt == retries:
+                    raise
+                _LOGGER.debug(
+                    "Retrying export of %s segment %s-%s", camera_id, *segment
+                )
+                await asyncio.sleep(calculate_retry_delay(attempt))
+            else:
+                await state.complete(*segment, part, size, sha256)
+                return
+
+    async def _download_export_part(
+        self,
+        camera_id: str,
+        segment: tuple[datetime, datetime],
+        part: Path,
+        *,
+        channel_index: int,
+        progress_callback: ProgressCallback,
+        chunk_size: int,
+    ) -> tuple[int, str]:
+        digest = hashlib.sha256()
+        size = 0
+
+        async def _hash(total: int, chunk: bytes | None) -> None:
+            nonlocal size
+            if chunk is not None:
+                digest.update(chunk)
+                size += len(chunk)
+
+        await self.get_camera_video(
+            camera_id,
+            *segment,
+            channel_index,
+            validate_channel_id=False,
+            output_file=part,
+            iterator_callback=_hash,
+            progress_callback=progress_callback,
+            chunk_size=chunk_size,
+        )
+        return size, digest.hexdigest()
+
     async def _get_image_with_retry(
         self,
         path: str,
@@ -3444,6 +4491,39 @@ class ProtectApiClient(BaseApiClient):
             retry_timeout=retry_timeout,
         )
 
+    @contextlib.asynccontextmanager
+    async def stream_event_thumbnail(
+        self,
+        thumbnail_id: str,
+        width: int | None = None,
+        height: int | None = None,
+        *,
+        retry_timeout: int = RETRY_TIMEOUT,
+        chunk_size: int = 65536,
+    ) -> AsyncIterator[MediaStream]:
+        """
+        Streams given thumbnail from a given event.
+
+        Streaming counterpart of `get_event_thumbnail`; raises instead of
+        returning None once `retry_timeout` has passed.
+        """
+        params: dict[str, Any] = {}
+
+        if width is not None:
+            params.update({"w": width})
+
+        if height is not None:
+            params.update({"h": height})
+
+        thumbnail_id = thumbnail_id.removeprefix("e-")
+        async with self._open_media_stream(
+            f"events/{thumbnail_id}/thumbnail",
+            chunk_size,
+            retry_timeout=retry_timeout,
+            params=params,
+        ) as stream:
+            yield stream
+
     async def get_event_animated_thumbnail(
         self,
         thumbnail_id: str,
@@ -3500,6 +4580,28 @@ class ProtectApiClient(BaseApiClient):
             retry_timeout=retry_timeout,
         )
 
+    @contextlib.asynccontextmanager
+    async def stream_event_heatmap(
+        self,
+        heatmap_id: str,
+        *,
+        retry_timeout: int = RETRY_TIMEOUT,
+        chunk_size: int = 65536,
+    ) -> AsyncIterator[MediaStream]:
+        """
+        Streams given heatmap from a given event.
+
+        Streaming counterpart of `get_event_heatmap`; raises instead of
+        returning None once `retry_timeout` has passed.
+        """
+        heatmap_id = heatmap_id.removeprefix("e-")
+        async with self._open_media_stream(
+            f"events/{heatmap_id}/heatmap",
+            chunk_size,
+            retry_timeout=retry_timeout,
+        ) as stream:
+            yield stream
+
     async def get_event_smart_detect_track_raw(self, event_id: str) -> dict[str, Any]:
         """Gets raw Smart Detect Track for a Smart Detection"""
         return await self.api_request_obj(f"events/{event_id}/smartDetectTrack")
@@ -3510,6 +4612,41 @@ class ProtectApiClient(BaseApiClient):
 
         return SmartDetectTrack.from_unifi_dict(api=self, **data)
 
+    @contextlib.asynccontextmanager
+    async def batch_update(
+        self,
+        max_concurrency: int = BATCH_UPDATE_CONCURRENCY,
+    ) -> AsyncIterator[DeviceUpdateBatch]:
+        """
+        Collects device updates made inside the context and saves them together on exit.
+
+        Updates from the `.set_` methods of devices (that use `queue_update`)
+        are added to the batch instead of being sent right away, so they do
+        not return their own errors. On exit, the changes for each device are
+        sent as one PATCH, up to `max_concurrency` at once, and the aggregated
+        `BatchUpdateResult` is returned from `DeviceUpdateBatch.commit()` and
+        stored as `DeviceUpdateBatch.result`. Nothing is saved if the context
+        exits with an exception. Tasks spawned inside the context inherit the
+        batch, but their updates after it is closed are saved on their own.
+
+        ```python
+        async with protect.batch_update() as batch:
+            for camera in protect.bootstrap.cameras.values():
+                await camera.set_recording_mode(RecordingMode.ALWAYS)
+        assert batch.result.ok
+        ```
+        """
+        batch = DeviceUpdateBatch(self, max_concurrency)
+        token = _current_batch.set(batch)
+        try:
+            yield batch
+        except BaseException:
+            batch.discard()
+            raise
+        finally:
+            _current_batch.reset(token)
+        await batch.commit()
+
     async def update_device(
         self,
         model_type: ModelType,
@@ -4032,6 +5169,7 @@ class ProtectApiClient(BaseApiClient):
             url=f"/v1/cameras/{camera_id}/talkback-session",
             method="post",
             public_api=True,
+            priority=RequestPriority.INTERACTIVE,
         )
         return TalkbackSession.from_unifi_dict(**data)
 
@@ -4214,6 +5352,7 @@ class ProtectApiClient(BaseApiClient):
             url=f"/v1/sirens/{siren_id}/play",
             method="post",
             public_api=True,
+            priority=RequestPriority.INTERACTIVE,
             json={"duration": norm_duration},
         )
 
@@ -4296,6 +5435,7 @@ class ProtectApiClient(BaseApiClient):
             url=f"/v1/relays/{relay_id}/outputs/{output_id}/activate",
             method="post",
             public_api=True,
+            priority=RequestPriority.INTERACTIVE,
             json=body or None,
         )
 
@@ -4410,6 +5550,7 @@ class ProtectApiClient(BaseApiClient):
             url=f"/v1/alarm-hubs/{hub_id}/outputs/{output_id}/trigger",
             method="post",
             public_api=True,
+            priority=RequestPriority.INTERACTIVE,
             json=body or None,
         )
 
@@ -4586,6 +5727,7 @@ class ProtectApiClient(BaseApiClient):
             url=f"/v1/alarm-manager/webhook/{quote(trigger_id, safe='')}",
             method="post",
             public_api=True,
+            priority=RequestPriority.INTERACTIVE,
         )
 
     async def get_arm_profiles_public(self) -> list[ArmProfile]:
@@ -4719,6 +5861,7 @@ class ProtectApiClient(BaseApiClient):
             url="/v1/arm-profiles/enable",
             method="post",
             public_api=True,
+            priority=RequestPriority.INTERACTIVE,
         )
         if (
             self._public_bootstrap is not None
@@ -4732,6 +5875,7 @@ class ProtectApiClient(BaseApiClient):
             url="/v1/arm-profiles/disable",
             method="post",
             public_api=True,
+            priority=RequestPriority.INTERACTIVE,
         )
         if (
             self._public_bootstrap is not None
@@ -0,0 +1,144 @@
+"""Batched device updates across many devices."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .data.types import PermissionNode
+from .exceptions import BadRequest, NotAuthorized
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .api import ProtectApiClient
+    from .data.base import ProtectModelWithId
+    from .data.types import ModelType
+
+#: Default number of device PATCHes a batch sends at once.
+BATCH_UPDATE_CONCURRENCY = 8
+
+_LOGGER = logging.getLogger(__name__)
+
+# Batch that `ProtectModelWithId.queue_update` adds callbacks to instead of
+# saving them, set while inside `ProtectApiClient.batch_update()`.
+_current_batch: ContextVar[DeviceUpdateBatch | None] = ContextVar(
+    "_current_batch", default=None
+)
+
+
+@dataclass(slots=True)
+class BatchUpdateResult:
+    """
+    Outcome of a `DeviceUpdateBatch`.
+
+    Attributes:
+        updated: IDs of the devices whose changes were saved (or had nothing to save).
+        errors: Exception raised for each device whose changes were not saved.
+
+    """
+
+    updated: list[str] = field(default_factory=list)
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the changes of every device were saved."""
+        return not self.errors
+
+
+class DeviceUpdateBatch:
+    """
+    Collects device updates from many devices and saves them together.
+
+    Created by `ProtectApiClient.batch_update()`. Callbacks queued for the
+    same device are merged into a single PATCH. Write permission is checked
+    once per model type (falling back to a per device check when the user
+    can only write some devices of that type) and the PATCHes are sent
+    concurrently, at most `max_concurrency` at a time. A device whose PATCH
+    fails has its changes reverted without affecting the other devices.
+
+    Once the batch is committed or discarded it is `closed`, and updates
+    queued afterwards, e.g. by tasks spawned inside the context, are saved
+    on their own instead.
+    """
+
+    def __init__(
+        self,
+        api: ProtectApiClient,
+        max_concurrency: int = BATCH_UPDATE_CONCURRENCY,
+    ) -> None:
+        self._api = api
+        self._max_concurrency = max_concurrency
+        self._pending: dict[
+            tuple[ModelType | None, str],
+            tuple[ProtectModelWithId, list[Callable[[], None]]],
+        ] = {}
+        self.result: BatchUpdateResult | None = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def queue(self, device: ProtectModelWithId, callback: Callable[[], None]) -> None:
+        """Adds an update `callback` for `device` to the batch."""
+        key = (device.model, device.id)
+        if (pending := self._pending.get(key)) is None:
+            pending = self._pending[key] = (device, [])
+        pending[1].append(callback)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the batch no longer takes updates."""
+        return self._closed
+
+    def discard(self) -> None:
+        """Drops the queued updates without saving them and closes the batch."""
+        self._closed = True
+        self._pending.clear()
+
+    async def commit(self) -> BatchUpdateResult:
+        """Saves all queued updates and returns the aggregated result."""
+        self._closed = True
+        pending, self._pending = self._pending, {}
+        result = BatchUpdateResult()
+        auth_user = self._api.bootstrap.auth_user
+        can_write: dict[ModelType, bool] = {}
+        allowed: list[tuple[ProtectModelWithId, list[Callable[[], None]]]] = []
+        for device, callbacks in pending.values():
+            if (model := device.model) is None:
+                result.errors[device.id] = BadRequest("Unknown model type")
+                continue
+            if model not in can_write:
+                can_write[model] = auth_user.can(model, PermissionNode.WRITE)
+            if can_write[model] or auth_user.can(model, PermissionNode.WRITE, device):
+                allowed.append((device, callbacks))
+            else:
+                result.errors[device.id] = NotAuthorized(
+                    f"Do not have write permission for obj: {device.id}"
+                )
+
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def _save(
+            device: ProtectModelWithId, callbacks: list[Callable[[], None]]
+        ) -> None:
+            async with semaphore, device._update_sync.lock:
+                # yield to the event loop once we have the lock to process any pending updates
+                await asyncio.sleep(0)
+                try:
+                    await device._save_queued_updates(callbacks, check_permission=False)
+                except Exception as err:
+                    _LOGGER.debug("Failed to save batched update for %s", device.id)
+                    result.errors[device.id] = err
+                else:
+                    result.updated.append(device.id)
+
+        await asyncio.gather(
+            *(_save(device, callbacks) for device, callbacks in allowed)
+        )
+        self.result = result
+        return result
@@ -9,6 +9,7 @@ import time
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from enum import StrEnum
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, cast
 
@@ -27,12 +28,27 @@ from rich.progress import (
     TimeRemainingColumn,
     track,
 )
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func, or_, select
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+)
 from sqlalchemy import event as saevent
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import Mapped, declarative_base, relationship
 
 from .. import data as d
+from .._video_export import DEFAULT_EXPORT_SEGMENT
 from ..api import ProtectApiClient
 from ..cli import base
 from ..utils import (
@@ -50,6 +66,19 @@ Base = declarative_base()
 
 _LOGGER = logging.getLogger(__name__)
 
+# Events requested (and written to the database) at once.
+EVENT_PAGE_SIZE = 100
+_BACKUP_EVENT_TYPES = [
+    d.EventType.MOTION,
+    d.EventType.RING,
+    d.EventType.SMART_DETECT,
+    d.EventType.SMART_DETECT_LINE,
+]
+_SMART_EVENT_TYPES = {
+    d.EventType.SMART_DETECT.value,
+    d.EventType.SMART_DETECT_LINE.value,
+}
+
 _SLUG_BAD = re.compile(r"[^A-Za-z0-9._-]+")
 
 
@@ -157,6 +186,27 @@ class EventSmartType(Base):  # type: ignore[valid-type,misc]
     smart_type = Column(String(32), index=True)
 
 
+class EventFileKind(StrEnum):
+    THUMBNAIL = "thumbnail"
+    GIF = "gif"
+    VIDEO = "video"
+
+
+class EventFile(Base):  # type: ignore[valid-type,misc]
+    """Downloaded file of an event, so runs do not have to search for it."""
+
+    __tablename__ = "event_file"
+
+    event_id = Column(String(24), ForeignKey("event.id"), primary_key=True)
+    kind = Column(String(16), primary_key=True)
+    # relative to the output folder
+    path = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    mtime = Column(Float, nullable=False)
+    # the file passed verification and has the recorded size and mtime
+    verified = Column(Boolean, nullable=False, default=False)
+
+
 class Event(Base):  # type: ignore[valid-type,misc]
     __tablename__ = "event"
     __allow_unmapped__ = True
@@ -172,6 +222,11 @@ class Event(Base):  # type: ignore[valid-type,misc]
         lazy="joined",
         uselist=True,
     )
+    files: Mapped[list[EventFile]] = relationship(
+        "EventFile",
+        lazy="joined",
+        uselist=True,
+    )
 
     _start: datetime | None = None
     _end: datetime | None = None
@@ -279,35 +334,61 @@ class Event(Base):  # type: ignore[valid-type,misc]
             self._glob_context["camera_name"] = "*"
         return self._glob_context
 
-    def get_thumbnail_path(self, ctx: BackupContext) -> Path:
+    def _get_file_format(self, ctx: BackupContext, kind: EventFileKind) -> str:
+        if kind == EventFileKind.THUMBNAIL:
+            return ctx.thumbnail_format
+        if kind == EventFileKind.GIF:
+            return ctx.gif_format
+        return ctx.event_format
+
+    def get_path(self, ctx: BackupContext, kind: EventFileKind) -> Path:
         context = self.get_file_context(ctx)
-        file_path = ctx.thumbnail_format.format(**context)
+        file_path = self._get_file_format(ctx, kind).format(**context)
         return _safe_join(ctx.output, file_path)
 
-    def get_existing_thumbnail_path(self, ctx: BackupContext) -> Path | None:
+    def find_existing_path(
+        self, ctx: BackupContext, kind: EventFileKind
+    ) -> Path | None:
+        """Searches the output folder for the file, under any camera name."""
         context = self.get_glob_file_context(ctx)
-        file_path = ctx.thumbnail_format.format(**context)
+        file_path = self._get_file_format(ctx, kind).format(**context)
         return _safe_first_glob_match(ctx.output, file_path)
 
+    def get_indexed_file(self, kind: EventFileKind) -> EventFile | None:
+        for file in self.files:
+            if file.kind == kind.value:
+                return file
+        return None
+
+    def get_existing_path(self, ctx: BackupContext, kind: EventFileKind) -> Path | None:
+        """Path of the file recorded in the file index, if it is still there."""
+        file = self.get_indexed_file(kind)
+        if file is None:
+            return None
+        try:
+            path = _safe_join(ctx.output, cast("str", file.path))
+        except ValueError as exc:
+            _LOGGER.warning("Ignoring indexed file: %s", exc)
+            return None
+        return path if path.exists() else None
+
+    def get_thumbnail_path(self, ctx: BackupContext) -> Path:
+        return self.get_path(ctx, EventFileKind.THUMBNAIL)
+
+    def get_existing_thumbnail_path(self, ctx: BackupContext) -> Path | None:
+        return self.get_existing_path(ctx, EventFileKind.THUMBNAIL)
+
     def get_gif_path(self, ctx: BackupContext) -> Path:
-        context = self.get_file_context(ctx)
-        file_path = ctx.gif_format.format(**context)
-        return _safe_join(ctx.output, file_path)
+        return self.get_path(ctx, EventFileKind.GIF)
 
     def get_existing_gif_path(self, ctx: BackupContext) -> Path | None:
-        context = self.get_glob_file_context(ctx)
-        file_path = ctx.gif_format.format(**context)
-        return _safe_first_glob_match(ctx.output, file_path)
+        return self.get_existing_path(ctx, EventFileKind.GIF)
 
     def get_event_path(self, ctx: BackupContext) -> Path:
-        context = self.get_file_context(ctx)
-        file_path = ctx.event_format.format(**context)
-        return _safe_join(ctx.output, file_path)
+        return self.get_path(ctx, EventFileKind.VIDEO)
 
     def get_existing_event_path(self, ctx: BackupContext) -> Path | None:
-        context = self.get_glob_file_context(ctx)
-        file_path = ctx.event_format.format(**context)
-        return _safe_first_glob_match(ctx.output, file_path)
+        return self.get_existing_path(ctx, EventFileKind.VIDEO)
 
 
 @dataclass
@@ -536,6 +617,8 @@ async def _prune_events(ctx: BackupContext) -> int:
             }:
                 for smart_type in event.smart_detect_types:
                     await db.delete(smart_type)
+            for file in event.files:
+                await db.delete(file)
             await db.delete(event)
             deleted += 1
         await db.commit()
@@ -543,48 +626,144 @@ async def _prune_events(ctx: BackupContext) -> int:
     return deleted
 
 
-async def _update_event(ctx: BackupContext, event: d.Event) -> None:
-    if event.camera is None:
+async def _upsert_events(ctx: BackupContext, events: list[d.Event]) -> None:
+    """Writes `events` and their smart detect types in one transaction."""
+    events = [event for event in events if event.camera is not None]
+    if not events:
         return
 
+    stmt = sqlite_insert(Event).values(
+        [
+            {
+                "id": event.id,
+                "start_naive": event.start,
+                "end_naive": event.end,
+                "camera_mac": event.camera.mac,  # type: ignore[union-attr]
+                "event_type": event.type.value,
+            }
+            for event in events
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Event.id],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("start_naive", "end_naive", "camera_mac", "event_type")
+        },
+    )
+
+    wanted = {
+        (event.id, smart_type.value)
+        for event in events
+        if event.type in _SMART_EVENT_TYPES
+        for smart_type in event.smart_detect_types
+    }
+    smart_ids = [event.id for event in events if event.type in _SMART_EVENT_TYPES]
+
     db = ctx.create_db_session()
-    to_delete: list[EventSmartType] = []
-    async with db:
-        result = await db.execute(select(Event).where(Event.id == event.id))
-        db_event = result.scalars().first()
-        do_insert = False
-        if db_event is None:
-            db_event = Event(id=event.id)
-            do_insert = True
-        db_event.start_naive = event.start
-        db_event.end_naive = event.end
-        db_event.camera_mac = event.camera.mac
-        db_event.event_type = event.type.value
-
-        if event.type in {
-            d.EventType.SMART_DETECT.value,
-            d.EventType.SMART_DETECT_LINE.value,
-        }:
-            types = {e.value for e in event.smart_detect_types}
-
-            result = await db.execute(
-                select(EventSmartType).where(EventSmartType.event_id == event.id),
-            )
-            for event_smart_type in result.unique().scalars():
-                event_type = cast("EventSmartType", event_smart_type)
-                if event_type.smart_type not in types:
-                    to_delete.append(event_type)
-                else:
-                    types.remove(event_type.smart_type)
+    async with db, db.begin():
+        await db.execute(stmt)
+        if smart_ids:
+            await _sync_smart_types(db, smart_ids, wanted)
 
-            for smart_type_str in types:
-                db.add(EventSmartType(event_id=event.id, smart_type=smart_type_str))
 
-        if do_insert:
-            db.add(db_event)
-        for smart_type in to_delete:
-            await db.delete(smart_type)
-        await db.commit()
+async def _sync_smart_types(
+    db: AsyncSession, smart_ids: list[str], wanted: set[tuple[str, str]]
+) -> None:
+    """Replaces the smart detect types of `smart_ids` with the `wanted` ones."""
+    # table columns rather than the declarative attributes, which mypy cannot type
+    columns = EventSmartType.__table__.c
+    result = await db.execute(
+        select(columns.id, columns.event_id, columns.smart_type).where(
+            columns.event_id.in_(smart_ids)
+        ),
+    )
+    stale: list[int] = []
+    for row_id, event_id, smart_type in result:
+        if (event_id, smart_type) in wanted:
+            wanted.discard((event_id, smart_type))
+        else:
+            stale.append(row_id)
+
+    if stale:
+        await db.execute(delete(EventSmartType).where(columns.id.in_(stale)))
+    if wanted:
+        await db.execute(
+            insert(EventSmartType),
+            [
+                {"event_id": event_id, "smart_type": smart_type}
+                for event_id, smart_type in wanted
+            ],
+        )
+
+
+def _event_file_row(
+    ctx: BackupContext,
+    event: Event,
+    kind: EventFileKind,
+    path: Path,
+    *,
+    verified: bool,
+) -> dict[str, Any]:
+    stat = path.stat()
+    return {
+        "event_id": event.id,
+        "kind": kind.value,
+        "path": path.relative_to(ctx.output.resolve()).as_posix(),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "verified": verified,
+    }
+
+
+async def _upsert_event_files(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    stmt = sqlite_insert(EventFile).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EventFile.event_id, EventFile.kind],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("path", "size", "mtime", "verified")
+        },
+    )
+    await db.execute(stmt)
+
+
+async def _index_file(
+    ctx: BackupContext,
+    event: Event,
+    kind: EventFileKind,
+    path: Path,
+    *,
+    verified: bool,
+) -> None:
+    """Records `path` as the `kind` file of `event` in the file index."""
+    row = await asyncio.get_running_loop().run_in_executor(
+        None, partial(_event_file_row, ctx, event, kind, path, verified=verified)
+    )
+    db = ctx.create_db_session()
+    async with db, db.begin():
+        await _upsert_event_files(db, [row])
+
+
+async def _unindex_file(ctx: BackupContext, event: Event, kind: EventFileKind) -> None:
+    db = ctx.create_db_session()
+    async with db, db.begin():
+        await db.execute(
+            delete(EventFile)
+            .where(EventFile.event_id == event.id)
+            .where(EventFile.kind == kind.value),
+        )
+
+
+async def _is_verified(file: EventFile | None, path: Path) -> bool:
+    """Whether `path` passed verification and has not changed since."""
+    if file is None or not file.verified:
+        return False
+    try:
+        stat = await aos.stat(path)
+    except FileNotFoundError:
+        return False
+    return bool(file.size == stat.st_size and file.mtime == stat.st_mtime)
 
 
 async def _update_ongoing_events(ctx: BackupContext) -> int:
@@ -600,9 +779,12 @@ async def _update_ongoing_events(ctx: BackupContext) -> int:
 
     if len(events) == 0:
         return 0
-    for event in track(events, description="Updating Events"):
-        event_id = cast("str", event.id)
-        await _update_event(ctx, await ctx.protect.get_event(event_id))
+    updated = [
+        await ctx.protect.get_event(cast("str", event.id))
+        for event in track(events, description="Updating Events")
+    ]
+    for index in range(0, len(updated), EVENT_PAGE_SIZE):
+        await _upsert_events(ctx, updated[index : index + EVENT_PAGE_SIZE])
     return len(events)
 
 
@@ -616,46 +798,53 @@ async def _update_events(ctx: BackupContext) -> int:
     total = int((end - ctx.start).total_seconds())
     _LOGGER.debug("total: %s: %s %s", total, start, end)
 
-    prev_start = start
-    with Progress() as pb:
-        task_id = pb.add_task("Fetching New Events", total=total)
-        task = pb.tasks[0]
-        pb.refresh()
-        while not pb.finished:
-            progress = int((start - prev_start).total_seconds())
-            pb.update(task_id, advance=progress)
-            _LOGGER.debug(
-                "progress: +%s: %s/%s: %s %s",
-                progress,
-                task.completed,
-                task.total,
+    def _fetch_page(start: datetime) -> asyncio.Task[list[d.Event]]:
+        return asyncio.create_task(
+            ctx.protect.get_events(
                 start,
                 end,
+                limit=EVENT_PAGE_SIZE,
+                types=_BACKUP_EVENT_TYPES,
             )
+        )
 
-            events = await ctx.protect.get_events(
-                start,
-                end,
-                limit=100,
-                types=[
-                    d.EventType.MOTION,
-                    d.EventType.RING,
-                    d.EventType.SMART_DETECT,
-                    d.EventType.SMART_DETECT_LINE,
-                ],
-            )
+    prev_start = start
+    page = _fetch_page(start)
+    try:
+        with Progress() as pb:
+            task_id = pb.add_task("Fetching New Events", total=total)
+            task = pb.tasks[0]
+            pb.refresh()
+            while not pb.finished:
+                progress = int((start - prev_start).total_seconds())
+                pb.update(task_id, advance=progress)
+                _LOGGER.debug(
+                    "progress: +%s: %s/%s: %s %s",
+                    progress,
+                    task.completed,
+                    task.total,
+                    start,
+                    end,
+                )
 
-            prev_start = start
-            count = 0
-            for event in events:
-                start = event.start
-                if event.id not in processed:
-                    count += 1
-                    processed.add(event.id)
-                    await _update_event(ctx, event)
+                events = await page
 
-            if start == prev_start and count == 0:
-                pb.update(task_id, completed=total)
+                prev_start = start
+                new_events: list[d.Event] = []
+                for event in events:
+                    start = event.start
+                    if event.id not in processed:
+                        processed.add(event.id)
+                        new_events.append(event)
+
+                if start == prev_start and not new_events:
+                    pb.update(task_id, completed=total)
+                else:
+                    # request the next page while this one is written
+                    page = _fetch_page(start)
+                await _upsert_events(ctx, new_events)
+    finally:
+        page.cancel()
 
     return updated_ongoing + len(processed)
 
@@ -739,16 +928,19 @@ async def _download_event_thumb(
 ) -> bool:
     if animated:
         thumb_type = "gif"
-        thumb_path = event.get_gif_path(ctx)
-        existing_thumb_path = event.get_existing_gif_path(ctx)
+        kind = EventFileKind.GIF
     else:
         thumb_type = "thumbnail"
-        thumb_path = event.get_thumbnail_path(ctx)
-        existing_thumb_path = event.get_existing_thumbnail_path(ctx)
+        kind = EventFileKind.THUMBNAIL
+    thumb_path = event.get_path(ctx, kind)
+    existing_thumb_path = event.get_existing_path(ctx, kind)
+    indexed = event.get_indexed_file(kind)
 
     if force and existing_thumb_path:
         _LOGGER.debug("Delete file %s", existing_thumb_path)
         await aos.remove(existing_thumb_path)
+        await _unindex_file(ctx, event, kind)
+        existing_thumb_path = indexed = None
 
     if existing_thumb_path and str(existing_thumb_path) != str(thumb_path):
         _LOGGER.debug(
@@ -762,20 +954,30 @@ async def _download_event_thumb(
         )
         await aos.makedirs(thumb_path.parent, exist_ok=True)
         await aos.rename(existing_thumb_path, thumb_path)
+        await _index_file(
+            ctx,
+            event,
+            kind,
+            thumb_path,
+            verified=bool(indexed is not None and indexed.verified),
+        )
+    elif indexed is None and thumb_path.exists():
+        # adopt files downloaded before they were indexed
+        await _index_file(ctx, event, kind, thumb_path, verified=False)
 
-    if (
-        verify
-        and thumb_path.exists()
-        and not await asyncio.get_running_loop().run_in_executor(
+    if verify and thumb_path.exists() and not await _is_verified(indexed, thumb_path):
+        if await asyncio.get_running_loop().run_in_executor(
             None, _verify_thumbnail, thumb_path
-        )
-    ):
-        _LOGGER.warning(
-            "Corrupted event %s file for event (%s), redownloading",
-            thumb_type,
-            event.id,
-        )
-        await aos.remove(thumb_path)
+        ):
+            await _index_file(ctx, event, kind, thumb_path, verified=True)
+        else:
+            _LOGGER.warning(
+                "Corrupted event %s file for event (%s), redownloading",
+                thumb_type,
+                event.id,
+            )
+            await aos.remove(thumb_path)
+            await _unindex_file(ctx, event, kind)
 
     if not thumb_path.exists():
         _LOGGER.debug(
@@ -795,6 +997,7 @@ async def _download_event_thumb(
             await aos.makedirs(thumb_path.parent, exist_ok=True)
             async with aiofiles.open(thumb_path, mode="wb") as f:
                 await f.write(thumbnail)
+            await _index_file(ctx, event, kind, thumb_path, verified=False)
             return True
     return False
 
@@ -877,11 +1080,15 @@ async def _download_event_video(
     verify: bool,
     force: bool,
 ) -> bool:
-    event_path = event.get_event_path(ctx)
-    existing_event_path = event.get_existing_event_path(ctx)
+    kind = EventFileKind.VIDEO
+    event_path = event.get_path(ctx, kind)
+    existing_event_path = event.get_existing_path(ctx, kind)
+    indexed = event.get_indexed_file(kind)
     if force and existing_event_path:
         _LOGGER.debug("Delete file %s", existing_event_path)
         await aos.remove(existing_event_path)
+        await _unindex_file(ctx, event, kind)
+        existing_event_path = indexed = None
 
     if existing_event_path and str(existing_event_path) != str(event_path):
         _LOGGER.debug(
@@ -894,9 +1101,19 @@ async def _download_event_video(
         )
         await aos.makedirs(event_path.parent, exist_ok=True)
         await aos.rename(existing_event_path, event_path)
+        await _index_file(
+            ctx,
+            event,
+            kind,
+            event_path,
+            verified=bool(indexed is not None and indexed.verified),
+        )
+    elif indexed is None and event_path.exists():
+        # adopt files downloaded before they were indexed
+        await _index_file(ctx, event, kind, event_path, verified=False)
 
     metadata_valid = True
-    if verify and event_path.exists():
+    if verify and event_path.exists() and not await _is_verified(indexed, event_path):
         valid = False
         if event.end is not None:
             valid, metadata_valid = await asyncio.get_running_loop().run_in_executor(
@@ -915,6 +1132,9 @@ async def _download_event_video(
                 event.id,
             )
             await aos.remove(event_path)
+            await _unindex_file(ctx, event, kind)
+        elif metadata_valid:
+            await _index_file(ctx, event, kind, event_path, verified=True)
 
     downloaded = False
     if not event_path.exists() and event.end is not None:
@@ -927,7 +1147,12 @@ async def _download_event_video(
             event_path,
         )
         await aos.makedirs(event_path.parent, exist_ok=True)
-        await camera.get_video(event.start, event.end, output_file=event_path)
+        if event.end - event.start > DEFAULT_EXPORT_SEGMENT:
+            # long events are exported in segments, so an interrupted backup
+            # continues from the segments it already has
+            await camera.export_video(event.start, event.end, event_path)
+        else:
+            await camera.get_video(event.start, event.end, output_file=event_path)
         downloaded = True
 
     if (downloaded or not metadata_valid) and event.end is not None:
@@ -936,6 +1161,7 @@ async def _download_event_video(
             None, _add_metadata, event_path, event.start, file_context["title"]
         ):
             _LOGGER.warning("Failed to write metadata for event (%s)", event.id)
+        await _index_file(ctx, event, kind, event_path, verified=False)
     return downloaded
 
 
@@ -1135,3 +1361,87 @@ def events_cmd(
     asyncio.run(
         _events(ctx.obj, ufp_events, smart_types, prune, force, verify, no_input),
     )
+
+
+def _find_event_files(
+    ctx: BackupContext,
+    events: list[Event],
+    kinds: list[EventFileKind],
+) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for event in events:
+        for kind in kinds:
+            try:
+                expected = event.get_path(ctx, kind)
+            except ValueError as exc:
+                _LOGGER.warning("Skipping %s of event %s: %s", kind, event.id, exc)
+                continue
+            # only search for files of renamed cameras if the file is not
+            # where it is expected
+            path = (
+                expected if expected.is_file() else event.find_existing_path(ctx, kind)
+            )
+            if path is not None:
+                rows.append(_event_file_row(ctx, event, kind, path, verified=False))
+    return rows
+
+
+async def _reindex(ctx: BackupContext) -> int:
+    kinds = [
+        kind
+        for kind, enabled in (
+            (EventFileKind.THUMBNAIL, ctx.download_thumbnails),
+            (EventFileKind.GIF, ctx.download_gifs),
+            (EventFileKind.VIDEO, ctx.download_videos),
+        )
+        if enabled
+    ]
+    loop = asyncio.get_running_loop()
+    indexed = 0
+    try:
+        await ctx.create_db()
+        db = ctx.create_db_session()
+        async with db:
+            count = cast(
+                "int", (await db.execute(select(func.count(Event.id)))).scalar()
+            )
+            query = select(Event).order_by(Event.id).limit(ctx.page_size)
+            with Progress() as pb:
+                task_id = pb.add_task("Indexing Files", total=count)
+                for offset in range(0, count, ctx.page_size):
+                    result = await db.execute(query.offset(offset))
+                    events: list[Event] = list(result.unique().scalars())
+                    rows = await loop.run_in_executor(
+                        None, _find_event_files, ctx, events, kinds
+                    )
+                    event_ids = [event.id for event in events]
+                    # the table column, which mypy can type unlike the attribute
+                    await db.execute(
+                        delete(EventFile).where(
+                            EventFile.__table__.c.event_id.in_(event_ids)
+                        ),
+                    )
+                    if rows:
+                        await _upsert_event_files(db, rows)
+                    await db.commit()
+                    indexed += len(rows)
+                    pb.update(task_id, advance=len(events))
+    finally:
+        _LOGGER.debug("Cleaning up Protect connection/database...")
+        await ctx.protect.close_session()
+        await ctx.protect.close_public_api_session()
+        await ctx.db_engine.dispose()
+    return indexed
+
+
+@app.command(name="reindex")
+def reindex_cmd(ctx: typer.Context) -> None:
+    """
+    Rebuilds the file index from the files in the output folder.
+
+    Runs of `events` look up downloaded files in the index of the database
+    instead of searching the output folder; run this once to adopt a folder
+    from an older version or after files were changed by hand.
+    """
+    indexed = asyncio.run(_reindex(ctx.obj))
+    _LOGGER.warning("Indexed %s file(s)", indexed)
@@ -4,10 +4,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from asyncio import timeout as asyncio_timeout
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta
-from functools import cache
+from functools import cache, partial
 from ipaddress import IPv4Address, IPv6Address
 from typing import TYPE_CHECKING, Any, NamedTuple, Protocol, runtime_checkable
 from uuid import UUID
@@ -17,13 +16,16 @@ from pydantic import BaseModel, ConfigDict
 from pydantic.fields import PrivateAttr
 
 from .._compat import cached_property
+from ..batch import _current_batch
 from ..exceptions import BadRequest, ClientError, NotAuthorized
 from ..utils import (
+    SNAKE_CASE_KEYS,
     convert_to_datetime,
-    convert_unifi_data,
     dict_diff,
+    get_unifi_data_converter,
     is_debug,
     serialize_unifi_obj,
+    to_camel_case,
     to_snake_case,
 )
 from .types import (
@@ -55,17 +57,67 @@ EVENT_PING_INTERVAL = timedelta(seconds=3)
 EVENT_PING_INTERVAL_SECONDS = EVENT_PING_INTERVAL.total_seconds()
 
 _EMPTY_EVENT_PING_BACK: dict[Any, Any] = {}
+_MISSING: Any = object()
 
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _dump_value(value: Any) -> Any:
+    """Converts a field value the same way `model_dump()` does."""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, list):
+        return [_dump_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _dump_value(v) for k, v in value.items()}
+    return value
+
+
+def _child_objects(value: Any) -> list[ProtectBaseObject]:
+    """Gets the UFP objects held by a field value."""
+    if isinstance(value, ProtectBaseObject):
+        return [value]
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, list):
+        return []
+    return [v for v in value if isinstance(v, ProtectBaseObject)]
+
+
+def _revert_tracked_changes(
+    originals: list[tuple[ProtectBaseObject, dict[str, Any]]],
+) -> None:
+    """Restores the fields recorded by `ProtectBaseObject._untrack_changes()`."""
+    for obj, dirty in reversed(originals):
+        for key, value in dirty.items():
+            setattr(obj, key, value)
+
+
 @cache
 def _is_protect_base_object(cls: type[Any]) -> bool:
     """A cached version of `issubclass(cls, ProtectBaseObject)` to speed up the check."""
     return issubclass(cls, ProtectBaseObject)
 
 
+_VALUE = 0
+_OBJ = 1
+_LIST = 2
+_DICT = 3
+
+# values `model_dump()` and `serialize_unifi_obj()` return as is
+_PLAIN_TYPES: frozenset[type] = frozenset({str, int, float, bool, type(None)})
+
+
+class _UnifiDictField(NamedTuple):
+    """How a field is written by `ProtectBaseObject.unifi_dict()`."""
+
+    name: str
+    key: str
+    kind: int
+    klass: type[ProtectBaseObject] | None
+
+
 class _ProtectModelObjects(NamedTuple):
     """
     Class to track all child of UFP objects.
@@ -83,6 +135,26 @@ class _ProtectModelObjects(NamedTuple):
     has_dicts: bool
 
 
+class _UnifiKeyDecoder(NamedTuple):
+    """
+    Precompiled decoder for a single UFP JSON key of a class.
+
+    name is the Python field name the key is stored as
+    pre_convert is the conversion from `.unifi_dict_conversions()`
+    convert is the conversion for the type of the field
+    child_klass / child_origin are set if the field holds UFP objects
+    """
+
+    name: str
+    pre_convert: Callable[[Any], Any] | None
+    convert: Callable[[Any], Any] | None
+    child_klass: type[ProtectBaseObject] | None
+    child_origin: type | None
+
+
+_API_KEY_DECODER = _UnifiKeyDecoder("api", None, None, None, None)
+
+
 class ProtectBaseObject(BaseModel):
     """
     Base class for building Python objects from UniFi Protect JSON.
@@ -93,6 +165,8 @@ class ProtectBaseObject(BaseModel):
     """
 
     _api: ProtectApiClient = PrivateAttr(None)  # type: ignore[assignment]
+    # original values of fields assigned since `_track_changes()`, `None` when not tracking
+    _dirty_fields: dict[str, Any] | None = PrivateAttr(None)
     model_config = ConfigDict(arbitrary_types_allowed=True, validate_assignment=True)
 
     def __init__(self, api: ProtectApiClient | None = None, **data: Any) -> None:
@@ -105,6 +179,16 @@ class ProtectBaseObject(BaseModel):
         if api is not None:
             self._api = api
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if (
+            (private := self.__pydantic_private__)
+            and (dirty := private.get("_dirty_fields")) is not None
+            and name not in dirty
+            and name in self.__class__.model_fields
+        ):
+            dirty[name] = getattr(self, name)
+        super().__setattr__(name, value)
+
     @classmethod
     def from_unifi_dict(
         cls,
@@ -237,10 +321,10 @@ class ProtectBaseObject(BaseModel):
 
     @classmethod
     @cache
-    def _get_excluded_fields(cls) -> set[str]:
-        """Helper method to get all excluded fields for the current object."""
+    def _get_child_fields(cls) -> tuple[str, ...]:
+        """Helper method to get all attrs of current class that hold UFP Objects."""
         protect_model = cls._get_protect_model()
-        return set(protect_model.objs) | set(protect_model.lists)
+        return (*protect_model.objs, *protect_model.lists, *protect_model.dicts)
 
     @classmethod
     def _clean_protect_obj(
@@ -286,6 +370,56 @@ class ProtectBaseObject(BaseModel):
         """
         return {}
 
+    @classmethod
+    @cache
+    def _get_unifi_field_converters(cls) -> dict[str, Callable[[Any], Any] | None]:
+        """Helper method to get the UFP data converter for each field of the current class."""
+        return {
+            name: get_unifi_data_converter(field)
+            for name, field in cls.model_fields.items()
+        }
+
+    @classmethod
+    @cache
+    def _get_unifi_decoders(cls) -> dict[str, _UnifiKeyDecoder | None]:
+        """
+        Helper method to get the precompiled decoders for the UFP JSON keys of the current class.
+
+        Built from `.model_fields`, `._get_unifi_remaps()` and `.unifi_dict_conversions()`.
+        Keys that are not known up front are compiled on first use and added to the returned dict.
+        `None` means the key is not a field and is dropped.
+        """
+        keys = {to_camel_case(name) for name in cls.model_fields}
+        keys.update(cls._get_unifi_remaps(), cls.unifi_dict_conversions())
+        return {key: cls._compile_unifi_decoder(key) for key in keys}
+
+    @classmethod
+    def _compile_unifi_decoder(cls, key: str) -> _UnifiKeyDecoder | None:
+        """Helper method to compile the decoder for a single UFP JSON key."""
+        # remap keys that will not be converted correctly by snake_case convert
+        name = to_snake_case(cls._get_unifi_remaps().get(key, key))
+        if name == "api":
+            return _API_KEY_DECODER
+        if name not in cls.model_fields:
+            return None
+
+        pre_convert = cls.unifi_dict_conversions().get(key)
+        protect_model = cls._get_protect_model()
+        child_origin: type | None = None
+        if (child_klass := protect_model.objs.get(name)) is None:
+            if (child_klass := protect_model.lists.get(name)) is not None:
+                child_origin = list
+            elif (child_klass := protect_model.dicts.get(name)) is not None:
+                child_origin = dict
+
+        return _UnifiKeyDecoder(
+            name,
+            pre_convert,  # type: ignore[arg-type]
+            cls._get_unifi_field_converters()[name],
+            child_klass,
+            child_origin,
+        )
+
     @classmethod
     def unifi_dict_to_dict(cls, data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -296,6 +430,8 @@ class ProtectBaseObject(BaseModel):
         * Injects ProtectAPIClient into any child UFP object Dicts
         * Runs `.unifi_dict_to_dict` for any child UFP objects
 
+        Each key is decoded with the precompiled decoder from `._get_unifi_decoders()`.
+
         Args:
         ----
             data: decoded UFP JSON dict
@@ -306,61 +442,34 @@ class ProtectBaseObject(BaseModel):
             cls._api if isinstance(cls, ProtectBaseObject) else None
         )
 
-        conversions = cls.unifi_dict_conversions()
-        for key, convert in conversions.items():
-            if (val := data.get(key)) is not None:
-                data[key] = convert(val)  # type: ignore[operator]
-
-        remaps = cls._get_unifi_remaps()
-        # convert to snake_case and remove extra fields
-        _fields = cls.model_fields
-        for key in data.copy():
-            if key not in data:
-                # key may have already been consumed by a previous
-                # iteration when two keys map to the same snake_case key
-                continue
-            current_key = key
-            if current_key in remaps:
-                # remap keys that will not be converted correctly by snake_case convert
-                remapped_key = remaps[current_key]
-                data[remapped_key] = data.pop(current_key)
-                current_key = remapped_key
-
-            new_key = to_snake_case(current_key)
-            data[new_key] = data.pop(current_key)
-            current_key = new_key
-
-            if current_key == "api":
+        decoders = cls._get_unifi_decoders()
+        new_data: dict[str, Any] = {}
+        for key, raw_value in data.items():
+            if (decoder := decoders.get(key, _MISSING)) is _MISSING:
+                # key not seen before for this class, compile it once
+                decoder = decoders[key] = cls._compile_unifi_decoder(key)
+            if decoder is None:
+                # remove extra fields
                 continue
 
-            if current_key not in _fields:
-                del data[current_key]
-                continue
-            data[current_key] = convert_unifi_data(
-                data[current_key], _fields[current_key]
-            )
-
-        if not data:
-            return data
-
-        # clean child UFP objs
-        (
-            unifi_objs,
-            has_unifi_objs,
-            unifi_lists,
-            has_unifi_lists,
-            unifi_dicts,
-            has_unifi_dicts,
-        ) = cls._get_protect_model()
-        for key, value in data.items():
-            if has_unifi_objs and key in unifi_objs:
-                data[key] = cls._clean_protect_obj(value, unifi_objs[key], api)
-            elif has_unifi_lists and key in unifi_lists and isinstance(value, list):
-                data[key] = cls._clean_protect_obj_list(value, unifi_lists[key], api)
-            elif has_unifi_dicts and key in unifi_dicts and isinstance(value, dict):
-                data[key] = cls._clean_protect_obj_dict(value, unifi_dicts[key], api)
+            name, pre_convert, convert, child_klass, child_origin = decoder
+            value = raw_value
+            if value is not None:
+                if pre_convert is not None:
+                    value = pre_convert(value)
+                if convert is not None:
+                    value = convert(value)
+                # clean child UFP objs
+                if child_klass is not None:
+                    if child_origin is None:
+                        value = cls._clean_protect_obj(value, child_klass, api)
+                    elif child_origin is list and isinstance(value, list):
+                        value = cls._clean_protect_obj_list(value, child_klass, api)
+                    elif child_origin is dict and isinstance(value, dict):
+                        value = cls._clean_protect_obj_dict(value, child_klass, api)
+            new_data[name] = value
 
-        return data
+        return new_data
 
     def _unifi_dict_protect_obj(
         self,
@@ -419,6 +528,60 @@ class ProtectBaseObject(BaseModel):
             for obj_key, obj in value.items()
         }
 
+    @classmethod
+    @cache
+    def _get_unifi_dict_fields(cls) -> tuple[_UnifiDictField, ...]:
+        """Helper method to get how each field is written by `.unifi_dict()`, in field order."""
+        unifi_objs, _, unifi_lists, _, unifi_dicts, _ = cls._get_protect_model()
+        remaps = cls._get_to_unifi_remaps()
+        fields: list[_UnifiDictField] = []
+        for name in cls.model_fields:
+            key = name if name in SNAKE_CASE_KEYS else to_camel_case(name)
+            key = remaps.get(key, key)
+            if name in unifi_objs:
+                fields.append(_UnifiDictField(name, key, _OBJ, unifi_objs[name]))
+            elif name in unifi_lists:
+                fields.append(_UnifiDictField(name, key, _LIST, unifi_lists[name]))
+            elif name in unifi_dicts:
+                fields.append(_UnifiDictField(name, key, _DICT, unifi_dicts[name]))
+            else:
+                fields.append(_UnifiDictField(name, key, _VALUE, None))
+        return tuple(fields)
+
+    def _unifi_dict_from_fields(self, exclude: set[str] | None) -> dict[str, Any]:
+        """Converts the current object into UFP JSON in one pass over its fields."""
+        new_data: dict[str, Any] = {}
+        empty: dict[str, Any] = {}
+        for name, key, kind, klass in self._get_unifi_dict_fields():
+            if kind == _VALUE:
+                if exclude is not None and name in exclude:
+                    continue
+                value = getattr(self, name)
+                if type(value) not in _PLAIN_TYPES:
+                    value = serialize_unifi_obj(_dump_value(value), levels=1)
+            elif kind == _OBJ:
+                value = self._unifi_dict_protect_obj(empty, name, True, klass)  # type: ignore[arg-type]
+            elif kind == _LIST:
+                value = self._unifi_dict_protect_obj_list(empty, name, True, klass)  # type: ignore[arg-type]
+            elif isinstance(
+                value := self._unifi_dict_protect_obj_dict(empty, name, True), dict
+            ):
+                value = {
+                    k if k in SNAKE_CASE_KEYS else to_camel_case(k): v
+                    for k, v in value.items()
+                }
+            new_data[key] = value
+
+        if extra := self.__pydantic_extra__:
+            remaps = self._get_to_unifi_remaps()
+            for name, value in extra.items():
+                if exclude is None or name not in exclude:
+                    key = name if name in SNAKE_CASE_KEYS else to_camel_case(name)
+                    new_data[remaps.get(key, key)] = serialize_unifi_obj(
+                        _dump_value(value), levels=1
+                    )
+        return new_data
+
     def unifi_dict(
         self,
         data: dict[str, Any] | None = None,
@@ -434,18 +597,13 @@ class ProtectBaseObject(BaseModel):
 
         Args:
         ----
-            data: Optional output of `.dict()` for the Python object. If `None`, will call `.dict` first
+            data: Optional output of `.dict()` for the Python object. If `None`, the fields of the object are converted directly
             exclude: Optional set of fields to exclude from convert. Useful for subclassing and having custom
                 processing for dumping to UFP JSON data.
 
         """
-        use_obj = False
         if data is None:
-            excluded_fields = self._get_excluded_fields()
-            if exclude is not None:
-                excluded_fields = excluded_fields.copy() | exclude
-            data = self.model_dump(exclude=excluded_fields)
-            use_obj = True
+            return self._unifi_dict_from_fields(exclude)
 
         (
             unifi_objs,
@@ -458,20 +616,20 @@ class ProtectBaseObject(BaseModel):
 
         if has_unifi_objs:
             for key, klass in unifi_objs.items():
-                if use_obj or key in data:
-                    data[key] = self._unifi_dict_protect_obj(data, key, use_obj, klass)
+                if key in data:
+                    data[key] = self._unifi_dict_protect_obj(data, key, False, klass)
 
         if has_unifi_lists:
             for key, klass in unifi_lists.items():
-                if use_obj or key in data:
+                if key in data:
                     data[key] = self._unifi_dict_protect_obj_list(
-                        data, key, use_obj, klass
+                        data, key, False, klass
                     )
 
         if has_unifi_dicts:
             for key in unifi_dicts:
-                if use_obj or key in data:
-                    data[key] = self._unifi_dict_protect_obj_dict(data, key, use_obj)
+                if key in data:
+                    data[key] = self._unifi_dict_protect_obj_dict(data, key, False)
 
         # all child objects have been serialized correctly do not do it twice
         new_data: dict[str, Any] = serialize_unifi_obj(data, levels=2)
@@ -497,7 +655,7 @@ class ProtectBaseObject(BaseModel):
             _has_unifi_dicts,
         ) = self._get_protect_model()
         api = self._api
-        _fields = self.__class__.model_fields
+        converters = self.__class__._get_unifi_field_converters()
         unifi_obj: ProtectBaseObject | None
         value: Any
 
@@ -514,8 +672,10 @@ class ProtectBaseObject(BaseModel):
                     for i in item
                     if i is not None and isinstance(i, (dict, ProtectBaseObject))
                 ]
+            elif (convert := converters[key]) is not None:
+                value = convert(item)
             else:
-                value = convert_unifi_data(item, _fields[key])
+                value = item
 
             setattr(self, key, value)
 
@@ -526,9 +686,91 @@ class ProtectBaseObject(BaseModel):
         excludes = self.__class__._get_excluded_changed_fields()
         return self.model_dump(exclude=excludes)
 
-    def get_changed(self, data_before_changes: dict[str, Any]) -> dict[str, Any]:
+    def get_changed(
+        self, data_before_changes: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """
+        Gets dictionary of all changed fields.
+
+        If `data_before_changes` is `None`, only the fields assigned since
+        `_track_changes()` are compared instead of dumping the whole object.
+        """
+        if data_before_changes is None:
+            return self._get_tracked_changes()
         return dict_diff(data_before_changes, self.model_dump())
 
+    def _track_changes(self) -> None:
+        """
+        Starts recording the original value of fields of this object and its children when assigned.
+
+        Lists and dicts of plain values are copied up front instead, so
+        changing them in place (e.g. ``append``) is recorded as well.
+        """
+        child_fields = self._get_child_fields()
+        self._dirty_fields = {
+            key: value.copy()
+            for key, value in self.__dict__.items()
+            if isinstance(value, list | dict) and key not in child_fields
+        }
+        for key in child_fields:
+            for child in _child_objects(getattr(self, key)):
+                child._track_changes()
+
+    def _get_tracked_changes(self) -> dict[str, Any]:
+        """Gets the changed fields out of the ones assigned since `_track_changes()`."""
+        dirty = self._dirty_fields or {}
+        excludes = self.__class__._get_excluded_changed_fields()
+        before = {k: _dump_value(v) for k, v in dirty.items() if k not in excludes}
+        changed = dict_diff(before, {k: _dump_value(getattr(self, k)) for k in before})
+        protect_model = self._get_protect_model()
+        for key in self._get_child_fields():
+            if key in dirty or (value := getattr(self, key)) is None:
+                continue
+            if key in protect_model.objs:
+                if child_changed := value._get_tracked_changes():
+                    changed[key] = child_changed
+            elif key in protect_model.lists:
+                # lists are diffed as a whole
+                if any(
+                    isinstance(item, ProtectBaseObject) and item._get_tracked_changes()
+                    for item in value
+                ):
+                    changed[key] = _dump_value(value)
+            elif items_changed := {
+                k: item_changed
+                for k, item in value.items()
+                if isinstance(item, ProtectBaseObject)
+                and (item_changed := item._get_tracked_changes())
+            }:
+                changed[key] = items_changed
+        return changed
+
+    def _untrack_changes(self) -> list[tuple[ProtectBaseObject, dict[str, Any]]]:
+        """
+        Stops recording assigned fields.
+
+        Returns the objects that had fields assigned with the original values
+        of those fields, to be passed to `_revert_tracked_changes`.
+        """
+        dirty, self._dirty_fields = self._dirty_fields, None
+        originals: list[tuple[ProtectBaseObject, dict[str, Any]]] = []
+        # lists and dicts are all recorded, only keep the ones that changed
+        if dirty and (
+            changed := {
+                k: v
+                for k, v in dirty.items()
+                if not isinstance(v, list | dict) or v != getattr(self, k)
+            }
+        ):
+            originals.append((self, changed))
+        for key in self._get_child_fields():
+            children = _child_objects(getattr(self, key))
+            if dirty and key in dirty:
+                children.extend(_child_objects(dirty[key]))
+            for child in children:
+                originals.extend(child._untrack_changes())
+        return originals
+
     @property
     def api(self) -> ProtectApiClient:
         """
@@ -565,22 +807,80 @@ class ProtectModel(ProtectBaseObject):
 
 
 class UpdateSynchronization:
-    """Helper class for managing updates to Protect devices."""
+    """
+    Helper class for managing updates to Protect devices.
+
+    Callbacks queued with `queue` are collected into a batch that is saved
+    `window` seconds after its first callback, or right away on `flush`.
+    The batch stays open until its save gets the update lock, so callbacks
+    queued while a previous save is in flight are merged into the next one.
+    """
+
+    def __init__(self) -> None:
+        self._callbacks: list[Callable[[], None]] = []
+        self._done: asyncio.Future[None] | None = None
+        self._save: Callable[[list[Callable[[], None]]], Awaitable[None]] | None = None
+        self._timer: TimerHandle | None = None
+        self._flush_task: asyncio.Task[None] | None = None
 
     @cached_property
     def lock(self) -> asyncio.Lock:
         """Lock to prevent multiple updates at once."""
         return asyncio.Lock()
 
-    @cached_property
-    def queue(self) -> asyncio.Queue[Callable[[], None]]:
-        """Queue to store device updates."""
-        return asyncio.Queue()
+    def queue(
+        self,
+        callback: Callable[[], None],
+        save: Callable[[list[Callable[[], None]]], Awaitable[None]],
+        window: float,
+    ) -> asyncio.Future[None]:
+        """
+        Adds `callback` to the pending batch.
 
-    @cached_property
-    def event(self) -> asyncio.Event:
-        """Event to signal when a device update has been queued."""
-        return asyncio.Event()
+        Returns a future resolved once `save` has been awaited with the batch.
+        """
+        if (done := self._done) is None:
+            loop = asyncio.get_running_loop()
+            done = self._done = loop.create_future()
+            self._save = save
+            self._timer = loop.call_later(window, self.flush)
+        self._callbacks.append(callback)
+        return done
+
+    def flush(self) -> asyncio.Future[None] | None:
+        """Saves the pending batch without waiting for the rest of its window."""
+        if (done := self._done) is None:
+            return None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush(done))
+        return done
+
+    async def _flush(self, done: asyncio.Future[None]) -> None:
+        try:
+            async with self.lock:
+                # Important! Now that we have the lock, we yield to the event loop so any
+                # updates from the websocket are processed before we generate the diff
+                await asyncio.sleep(0)
+                callbacks, self._callbacks = self._callbacks, []
+                save, self._save = self._save, None
+                self._done = self._flush_task = None
+                assert save is not None
+                await save(callbacks)
+        except asyncio.CancelledError:
+            done.cancel()
+            raise
+        except Exception as err:
+            done.set_exception(err)
+        else:
+            done.set_result(None)
+        finally:
+            if self._done is done:
+                # cancelled before the batch was taken
+                self._callbacks = []
+                self._done = self._save = self._flush_task = None
 
 
 class ProtectModelWithId(ProtectModel):
@@ -640,37 +940,75 @@ class ProtectModelWithId(ProtectModel):
         """
         Queues a device update.
 
-        This allows aggregating devices updates so if multiple ones come in all at once,
-        they can be combined in a single PATCH.
+        Updates queued within the API client's `update_debounce_window`, or
+        while a previous save of the device is still in flight, are combined
+        in a single PATCH. Returns once the PATCH with `callback` was sent.
+
+        The PATCH is built from the fields `callback` assigns or changes in
+        place; values nested in lists or dicts must be assigned rather than
+        mutated in place.
+
+        Inside `ProtectApiClient.batch_update()`, `callback` is added to the
+        batch instead and saved when the batch is committed.
         """
-        self._update_sync.queue.put_nowait(callback)
+        if (
+            (batch := _current_batch.get()) is not None
+            and batch._api is self._api
+            and not batch.closed
+        ):
+            batch.queue(self, callback)
+            return
+
+        done = self._update_sync.queue(
+            callback, self._save_queued_updates, self._api.update_debounce_window
+        )
+        await asyncio.shield(done)
+
+    async def flush_updates(self) -> None:
+        """Sends queued device updates now instead of at the end of the debounce window."""
+        if (done := self._update_sync.flush()) is not None:
+            await asyncio.shield(done)
+
+    async def _save_queued_updates(
+        self,
+        callbacks: list[Callable[[], None]],
+        check_permission: bool = True,
+    ) -> None:
+        def apply_queued() -> None:
+            for callback in callbacks:
+                callback()
+
+        await self._save_tracked_changes(
+            apply_queued, check_permission=check_permission
+        )
 
-        self._update_sync.event.set()
-        # release execution so other `queue_update` calls can abort
-        await asyncio.sleep(0.001)
-        self._update_sync.event.clear()
+    async def _save_tracked_changes(
+        self,
+        callback: Callable[[], None],
+        force_emit: bool = False,
+        check_permission: bool = True,
+    ) -> None:
+        """
+        Runs `callback` and saves the fields it assigned to UFP.
 
+        Only fields assigned by `callback` (on the object or its child objects)
+        and lists or dicts it changed in place are diffed. Must be called with
+        the update lock held.
+        """
+        self._track_changes()
         try:
-            async with asyncio_timeout(0.05):
-                await self._update_sync.event.wait()
-            self._update_sync.event.clear()
-            return
-        except TimeoutError:
-            async with self._update_sync.lock:
-                # Important! Now that we have the lock, we yield to the event loop so any
-                # updates from the websocket are processed before we generate the diff
-                await asyncio.sleep(0)
-                # Save the initial data before we generate the diff
-                data_before_changes = self.dict_with_excludes()
-                while not self._update_sync.queue.empty():
-                    callback = self._update_sync.queue.get_nowait()
-                    callback()
-                # Important, do not yield to the event loop before generating the diff
-                # otherwise we may miss updates from the websocket
-                await self._save_device_changes(
-                    data_before_changes,
-                    self.unifi_dict(data=self.get_changed(data_before_changes)),
-                )
+            callback()
+            # Important, do not yield to the event loop before generating the diff
+            # otherwise we may miss updates from the websocket
+            updated = self.unifi_dict(data=self.get_changed())
+        finally:
+            originals = self._untrack_changes()
+        await self._save_device_changes(
+            partial(_revert_tracked_changes, originals),
+            updated,
+            force_emit=force_emit,
+            check_permission=check_permission,
+        )
 
     async def save_device(
         self,
@@ -699,7 +1037,7 @@ class ProtectModelWithId(ProtectModel):
 
         try:
             await self._save_device_changes(
-                data_before_changes,
+                partial(self.revert_changes, data_before_changes),
                 self.unifi_dict(data=self.get_changed(data_before_changes)),
                 force_emit=force_emit,
                 revert_on_fail=revert_on_fail,
@@ -710,17 +1048,17 @@ class ProtectModelWithId(ProtectModel):
 
     async def _save_device_changes(
         self,
-        data_before_changes: dict[str, Any],
+        revert_changes: Callable[[], None],
         updated: dict[str, Any],
         force_emit: bool = False,
         revert_on_fail: bool = True,
+        check_permission: bool = True,
     ) -> None:
-        """Saves the current device changes to UFP."""
+        """Saves the current device changes to UFP, calling `revert_changes` on failure."""
         _LOGGER.debug(
-            "Saving device changes for %s (%s) data_before_changes=%s updated=%s",
+            "Saving device changes for %s (%s) updated=%s",
             self.id,
             self.model,
-            data_before_changes,
             updated,
         )
 
@@ -732,11 +1070,11 @@ class ProtectModelWithId(ProtectModel):
         if self.model is None:
             raise BadRequest("Unknown model type")
 
-        if not self._api.bootstrap.auth_user.can(
+        if check_permission and not self._api.bootstrap.auth_user.can(
             self.model, PermissionNode.WRITE, self
         ):
             if revert_on_fail:
-                self.revert_changes(data_before_changes)
+                revert_changes()
             raise NotAuthorized(f"Do not have write permission for obj: {self.id}")
 
         # do not patch when there are no updates
@@ -745,7 +1083,7 @@ class ProtectModelWithId(ProtectModel):
 
         read_only_keys = read_only_fields.intersection(updated)
         if len(read_only_keys) > 0:
-            self.revert_changes(data_before_changes)
+            revert_changes()
             raise BadRequest(
                 f"{type(self)} The following key(s) are read only: {read_only_keys}, updated: {updated}",
             )
@@ -754,7 +1092,7 @@ class ProtectModelWithId(ProtectModel):
             await self._api_update(updated)
         except ClientError:
             if revert_on_fail:
-                self.revert_changes(data_before_changes)
+                revert_changes()
             raise
 
         if force_emit:
@@ -1029,8 +1367,12 @@ class ProtectAdoptableDeviceModel(ProtectDeviceModel):
         """Verifies device is adopted and controlled by this NVR."""
         return self.is_adopted and not self.is_adopted_by_other
 
-    def get_changed(self, data_before_changes: dict[str, Any]) -> dict[str, Any]:
+    def get_changed(
+        self, data_before_changes: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """Gets dictionary of all changed fields"""
+        if data_before_changes is None:
+            return self._get_tracked_changes()
         return dict_diff(data_before_changes, self.dict_with_excludes())
 
     async def set_ssh(self, enabled: bool) -> None:
@@ -7,6 +7,7 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, cast
+from weakref import WeakValueDictionary
 
 from aiohttp.client_exceptions import ServerDisconnectedError
 from convertertools import pop_dict_set, pop_dict_tuple
@@ -37,12 +38,16 @@ from .nvr import MAX_EVENT_HISTORY_IN_STATE_MACHINE, NVR, Event, Liveview
 from .types import EventType, FixSizeOrderedDict, ModelType, SmartDetectObjectType
 from .user import Group, Keyrings, UlpUserKeyringBase, UlpUsers, User
 from .websocket import (
+    CopyOnWriteWSSubscriptionMessage,
     WSAction,
+    WSOldObjSnapshot,
     WSPacket,
     WSSubscriptionMessage,
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from ..api import ProtectApiClient
 
 
@@ -60,6 +65,8 @@ STATS_KEYS = {
     "recordingSchedules",
 }
 
+_EMPTY_WS_DATA: dict[str, Any] = {}
+
 IGNORE_DEVICE_KEYS = {"nvrMac", "guid"}
 STATS_AND_IGNORE_DEVICE_KEYS = STATS_KEYS | IGNORE_DEVICE_KEYS
 
@@ -86,6 +93,23 @@ STATS_AND_IGNORE_DEVICE_KEYS_BY_MODEL_TYPE = {
     for model_type, keys in _IGNORE_KEYS_BY_MODEL_TYPE.items()
 }
 
+#
+# Key sets of update packets that only carry keys removed with `ignore_stats`,
+# by `modelKey`. Update packets whose keys are a subset can be dropped right
+# after decoding, before any key is removed or converted.
+#
+_STATS_ONLY_KEYS_BY_MODEL_KEY: dict[str, frozenset[str]] = {
+    ModelType.NVR.value: frozenset(STATS_KEYS),
+    **{
+        model_type.value: frozenset(
+            STATS_AND_IGNORE_DEVICE_KEYS_BY_MODEL_TYPE.get(
+                model_type, STATS_AND_IGNORE_DEVICE_KEYS
+            )
+        )
+        for model_type in ModelType.bootstrap_models_types_and_event_set
+    },
+}
+
 
 CAMERA_EVENT_ATTR_MAP: dict[EventType, tuple[str, str]] = {
     EventType.MOTION: ("last_motion", "last_motion_event_id"),
@@ -107,6 +131,14 @@ CAMERA_EVENT_ATTR_MAP: dict[EventType, tuple[str, str]] = {
 }
 
 
+def _is_stats_only_update(action: dict[str, Any], data: dict[str, Any]) -> bool:
+    """Checks if an update packet only has keys that are removed by `ignore_stats`."""
+    if not data or action["action"] != "update":
+        return False
+    stats_keys = _STATS_ONLY_KEYS_BY_MODEL_KEY.get(action["modelKey"])
+    return stats_keys is not None and data.keys() <= stats_keys
+
+
 def _process_light_event(event: Event, light: Light) -> None:
     light.last_motion_event_id = event.id
 
@@ -268,6 +300,8 @@ class WSStat:
     keys_set: list[str]
     size: int
     filtered: bool
+    # dropped by `ignore_stats` because it only had stats keys
+    stats_only: bool = False
 
 
 class ProtectDeviceRef(ProtectBaseObject):
@@ -307,6 +341,9 @@ class Bootstrap(ProtectBaseObject):
     _has_media: bool | None = PrivateAttr(None)
     _recording_start: datetime | None = PrivateAttr(None)
     _refresh_tasks: set[asyncio.Task[None]] = PrivateAttr(set())
+    _old_obj_snapshots: WeakValueDictionary[str, WSOldObjSnapshot] = PrivateAttr(
+        default_factory=WeakValueDictionary
+    )
 
     @classmethod
     def unifi_dict_to_dict(cls, data: dict[str, Any]) -> dict[str, Any]:
@@ -441,14 +478,32 @@ class Bootstrap(ProtectBaseObject):
     def process_event(self, event: Event) -> None:
         event_type = event.type
         if event_type in CAMERA_EVENT_ATTR_MAP and (camera := event.camera):
+            self._materialize_old_obj(camera.id)
             _process_camera_event(event, camera)
         elif event_type is EventType.MOTION_LIGHT and (light := event.light):
+            self._materialize_old_obj(light.id)
             _process_light_event(event, light)
         elif event_type is EventType.MOTION_SENSOR and (sensor := event.sensor):
+            self._materialize_old_obj(sensor.id)
             _process_sensor_event(event, sensor)
 
         self.events[event.id] = event
 
+    def _snapshot_old_obj(
+        self, obj: ProtectModelWithId, keys: Iterable[str]
+    ) -> WSOldObjSnapshot:
+        """Records the current values of `keys` before `obj` is updated."""
+        obj_id = obj.id
+        self._materialize_old_obj(obj_id)
+        snapshot = WSOldObjSnapshot(obj, keys)
+        self._old_obj_snapshots[obj_id] = snapshot
+        return snapshot
+
+    def _materialize_old_obj(self, obj_id: str) -> None:
+        """Copies the `old_obj` of a pending message before the object changes again."""
+        if (snapshot := self._old_obj_snapshots.pop(obj_id, None)) is not None:
+            snapshot.materialize()
+
     def _process_add_packet(
         self,
         model_type: ModelType,
@@ -556,16 +611,16 @@ class Bootstrap(ProtectBaseObject):
             if updated_obj is None:
                 return None
 
-            old_obj = updated_obj.model_copy()
             updated_data = {to_snake_case(k): v for k, v in data.items()}
+            snapshot = self._snapshot_old_obj(updated_obj, updated_data)
             updated_obj.update_from_dict(updated_data)
 
-            return WSSubscriptionMessage(
-                action=WSAction.UPDATE,
-                new_update_id=self.last_update_id,
-                changed_data=updated_data,
-                new_obj=updated_obj,
-                old_obj=old_obj,
+            return CopyOnWriteWSSubscriptionMessage(
+                WSAction.UPDATE,
+                self.last_update_id,
+                updated_data,
+                updated_obj,
+                snapshot,
             )
         _LOGGER.debug("Unexpected ws action for %s: %s", model_type, action_type)
         return None
@@ -591,15 +646,15 @@ class Bootstrap(ProtectBaseObject):
         if not (data := self.nvr.unifi_dict_to_dict(data)):
             return None
 
-        old_nvr = self.nvr.model_copy()
+        snapshot = self._snapshot_old_obj(self.nvr, data)
         self.nvr = self.nvr.update_from_dict(data)
 
-        return WSSubscriptionMessage(
-            action=WSAction.UPDATE,
-            new_update_id=self.last_update_id,
-            changed_data=data,
-            new_obj=self.nvr,
-            old_obj=old_nvr,
+        return CopyOnWriteWSSubscriptionMessage(
+            WSAction.UPDATE,
+            self.last_update_id,
+            data,
+            self.nvr,
+            snapshot,
         )
 
     def _process_device_update(
@@ -647,7 +702,7 @@ class Bootstrap(ProtectBaseObject):
             # nothing left to process
             return None
 
-        old_obj = obj.model_copy()
+        snapshot = self._snapshot_old_obj(obj, data)
         obj = obj.update_from_dict(data)
 
         if model_type is ModelType.EVENT:
@@ -663,12 +718,12 @@ class Bootstrap(ProtectBaseObject):
                 _LOGGER.debug("alarm_triggered_at for %s (%s)", obj.id, is_recent)
 
         devices[action_id] = obj
-        return WSSubscriptionMessage(
-            action=WSAction.UPDATE,
-            new_update_id=self.last_update_id,
-            changed_data=data,
-            new_obj=obj,
-            old_obj=old_obj,
+        return CopyOnWriteWSSubscriptionMessage(
+            WSAction.UPDATE,
+            self.last_update_id,
+            data,
+            obj,
+            snapshot,
         )
 
     def process_ws_packet(
@@ -678,36 +733,94 @@ class Bootstrap(ProtectBaseObject):
         ignore_stats: bool = False,
         is_ping_back: bool = False,
     ) -> WSSubscriptionMessage | None:
-        """Process a WS packet."""
-        capture_ws_stats = self.capture_ws_stats
+        """
+        Process a WS packet.
+
+        The action frame is decoded first. Unless WS stats are captured, the
+        data frame is only decoded if the packet can result in a message.
+        """
         action = packet.action_frame.data
-        data = packet.data_frame.data
-        keys = list(data) if capture_ws_stats else None
 
         new_update_id: str | None = action["newUpdateId"]
         if new_update_id is not None:
             self.last_update_id = new_update_id
 
-        message = self._make_ws_packet_message(
-            action, data, models, ignore_stats, is_ping_back
-        )
+        if not self.capture_ws_stats:
+            if not self._is_ws_packet_wanted(action, models):
+                return None
+            if action["action"] == "remove":
+                # remove packets do not need the data frame
+                data = _EMPTY_WS_DATA
+            else:
+                data = packet.data_frame.data
+                if ignore_stats and _is_stats_only_update(action, data):
+                    return None
+            return self._make_ws_packet_message(
+                action, data, models, ignore_stats, is_ping_back
+            )
 
-        if capture_ws_stats:
-            if TYPE_CHECKING:
-                assert keys is not None
-            self._ws_stats.append(
-                WSStat(
-                    model=action["modelKey"],
-                    action=action["action"],
-                    keys=keys,
-                    keys_set=[] if message is None else list(message.changed_data),
-                    size=len(packet.raw),
-                    filtered=message is None,
-                ),
+        data = packet.data_frame.data
+        keys = list(data)
+        message: WSSubscriptionMessage | None = None
+        stats_only = ignore_stats and _is_stats_only_update(action, data)
+        if not stats_only:
+            message = self._make_ws_packet_message(
+                action, data, models, ignore_stats, is_ping_back
             )
+        self._ws_stats.append(
+            WSStat(
+                model=action["modelKey"],
+                action=action["action"],
+                keys=keys,
+                keys_set=[] if message is None else list(message.changed_data),
+                size=len(packet.raw),
+                filtered=message is None,
+                stats_only=stats_only,
+            ),
+        )
 
         return message
 
+    def _is_ws_packet_wanted(
+        self,
+        action: dict[str, Any],
+        models: set[ModelType] | None,
+    ) -> bool:
+        """
+        Checks from the action frame alone if a WS packet can result in a message.
+
+        Packets for unknown or unsubscribed models, updates for devices/events
+        that are not in the bootstrap and updates for other NVRs are dropped
+        without decoding the data frame.
+        """
+        model_key: str = action["modelKey"]
+        if (model_type := ModelType.from_string(model_key)) is ModelType.UNKNOWN:
+            _LOGGER.debug("Unknown model type: %s", model_key)
+            return False
+
+        if models and model_type not in models:
+            return False
+
+        if action["action"] != "update":
+            return True
+
+        action_id: str | None = action.get("id")
+        if model_type is ModelType.NVR:
+            # for another NVR in stack
+            return not action_id or action_id == self.nvr.id
+
+        if (
+            model_type in ModelType.bootstrap_models_types_and_event_set
+            and action_id is not None
+            and action_id not in getattr(self, model_type.devices_key)
+        ):
+            # ignore updates to events that phase out
+            if model_type is not ModelType.EVENT:
+                _LOGGER.debug("Unexpected %s: %s", model_type, action_id)
+            return False
+
+        return True
+
     def _make_ws_packet_message(  # noqa: PLR0911
         self,
         action: dict[str, Any],
@@ -17,6 +17,11 @@ from convertertools import pop_dict_set_if_none, pop_dict_tuple
 from pydantic import model_validator
 from pydantic.fields import PrivateAttr
 
+from .._video_export import (
+    DEFAULT_EXPORT_SEGMENT,
+    EXPORT_CONCURRENCY,
+    EXPORT_SEGMENT_RETRIES,
+)
 from ..exceptions import BadRequest, NotAuthorized, StreamError
 from ..stream import TalkbackSession, TalkbackStream
 from ..utils import (
@@ -185,12 +190,11 @@ class Light(ProtectMotionDeviceModel):
         async with self._update_sync.lock:
             # yield to the event loop once we have the lock to process any pending updates
             await asyncio.sleep(0)
-            data_before_changes = self.dict_with_excludes()
-            if camera is None:
-                self.camera_id = None
-            else:
-                self.camera_id = camera.id
-            await self.save_device(data_before_changes, force_emit=True)
+
+            def callback() -> None:
+                self.camera_id = None if camera is None else camera.id
+
+            await self._save_tracked_changes(callback, force_emit=True)
 
     async def set_flood_light(self, enabled: bool) -> None:
         """Sets the flood light (force on) for the light"""
@@ -1377,7 +1381,9 @@ class Camera(ProtectMotionDeviceModel):
 
         return data
 
-    def get_changed(self, data_before_changes: dict[str, Any]) -> dict[str, Any]:
+    def get_changed(
+        self, data_before_changes: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         updated = super().get_changed(data_before_changes)
 
         if "lcd_message" in updated:
@@ -2314,23 +2320,31 @@ class Camera(ProtectMotionDeviceModel):
             if len(privacy_zones) > 0:
                 zone_id = privacy_zones[-1].id + 1
 
-            privacy_zones.append(CameraZone.create_privacy_zone(zone_id))
+            self.privacy_zones = [
+                *privacy_zones,
+                CameraZone.create_privacy_zone(zone_id),
+            ]
 
     def remove_privacy_zone(self) -> None:
         index, _ = self.get_privacy_zone()
         if index is not None:
-            self.privacy_zones.pop(index)
+            self.privacy_zones = [
+                zone for i, zone in enumerate(self.privacy_zones) if i != index
+            ]
 
     async def get_snapshot(
         self,
         width: int | None = None,
         height: int | None = None,
         dt: datetime | None = None,
+        max_age: float | None = None,
     ) -> bytes | None:
         """
         Gets snapshot for camera.
 
         Datetime of screenshot is approximate. It may be +/- a few seconds.
+        With `max_age`, a recent cached live snapshot may be returned, see
+        `ProtectApiClient.get_camera_snapshot`.
         """
         # Use READ_LIVE if dt is None, otherwise READ_MEDIA
         auth_user = self._api.bootstrap.auth_user
@@ -2350,10 +2364,15 @@ class Camera(ProtectMotionDeviceModel):
         if height is None and width is None and self.high_camera_channel is not None:
             height = self.high_camera_channel.height
 
-        return await self._api.get_camera_snapshot(self.id, width, height, dt=dt)
+        return await self._api.get_camera_snapshot(
+            self.id, width, height, dt=dt, max_age=max_age
+        )
 
     async def get_public_api_snapshot(
-        self, high_quality: bool | None = None, package: bool = False
+        self,
+        high_quality: bool | None = None,
+        package: bool = False,
+        max_age: float | None = None,
     ) -> bytes | None:
         """Gets snapshot for camera using public API; ``package=True`` fetches the package camera."""
         if self._api._api_key is None:
@@ -2363,7 +2382,10 @@ class Camera(ProtectMotionDeviceModel):
             high_quality = self.feature_flags.support_full_hd_snapshot or False
 
         return await self._api.get_public_api_camera_snapshot(
-            camera_id=self.id, high_quality=high_quality, package=package
+            camera_id=self.id,
+            high_quality=high_quality,
+            package=package,
+            max_age=max_age,
         )
 
     async def create_rtsps_streams(
@@ -2396,11 +2418,14 @@ class Camera(ProtectMotionDeviceModel):
         width: int | None = None,
         height: int | None = None,
         dt: datetime | None = None,
+        max_age: float | None = None,
     ) -> bytes | None:
         """
         Gets snapshot from the package camera.
 
         Datetime of screenshot is approximate. It may be +/- a few seconds.
+        With `max_age`, a recent cached live snapshot may be returned, see
+        `ProtectApiClient.get_camera_snapshot`.
         """
         if not self.feature_flags.has_package_camera:
             raise BadRequest("Device does not have package camera")
@@ -2424,7 +2449,7 @@ class Camera(ProtectMotionDeviceModel):
             height = self.package_camera_channel.height
 
         return await self._api.get_package_camera_snapshot(
-            self.id, width, height, dt=dt
+            self.id, width, height, dt=dt, max_age=max_age
         )
 
     async def get_video(
@@ -2472,6 +2497,48 @@ class Camera(ProtectMotionDeviceModel):
             fps=fps,
         )
 
+    async def export_video(
+        self,
+        start: datetime,
+        end: datetime,
+        output_file: Path,
+        *,
+        channel_index: int = 0,
+        segment_length: timedelta = DEFAULT_EXPORT_SEGMENT,
+        max_concurrency: int = EXPORT_CONCURRENCY,
+        retries: int = EXPORT_SEGMENT_RETRIES,
+        fragmented: bool = False,
+        progress_callback: ProgressCallback | None = None,
+        chunk_size: int = 65536,
+    ) -> None:
+        """
+        Exports MP4 video in segments downloaded in parallel.
+
+        See `ProtectApiClient.export_camera_video`.
+        """
+        if not self._api.bootstrap.auth_user.can(
+            ModelType.CAMERA,
+            PermissionNode.READ_MEDIA,
+            self,
+        ):
+            raise NotAuthorized(
+                f"Do not have permission to read media for camera: {self.id}",
+            )
+
+        await self._api.export_camera_video(
+            self.id,
+            start,
+            end,
+            output_file,
+            channel_index=channel_index,
+            segment_length=segment_length,
+            max_concurrency=max_concurrency,
+            retries=retries,
+            fragmented=fragmented,
+            progress_callback=progress_callback,
+            chunk_size=chunk_size,
+        )
+
     async def set_recording_mode(self, mode: RecordingMode) -> None:
         """Sets recording mode on camera"""
         if self.use_global:
@@ -2766,7 +2833,7 @@ class Camera(ProtectMotionDeviceModel):
                     objects = [*objects, obj_to_mod]
                     objects.sort()
             elif obj_to_mod in objects:
-                objects.remove(obj_to_mod)
+                objects = [o for o in objects if o != obj_to_mod]
             self.smart_detect_settings.object_types = objects
 
         await self.queue_update(callback)
@@ -2792,7 +2859,7 @@ class Camera(ProtectMotionDeviceModel):
                     objects = [*objects, obj_to_mod]
                     objects.sort()
             elif obj_to_mod in objects:
-                objects.remove(obj_to_mod)
+                objects = [o for o in objects if o != obj_to_mod]
             self.smart_detect_settings.audio_types = objects
 
         await self.queue_update(callback)
@@ -2811,10 +2878,12 @@ class Camera(ProtectMotionDeviceModel):
             async with self._update_sync.lock:
                 # yield to the event loop once we have the lock to process any pending updates
                 await asyncio.sleep(0)
-                data_before_changes = self.dict_with_excludes()
-                self.lcd_message = None
+
+                def clear_lcd_message() -> None:
+                    self.lcd_message = None
+
                 # UniFi Protect bug: clearing LCD text message does _not_ emit a WS message
-                await self.save_device(data_before_changes, force_emit=True)
+                await self._save_tracked_changes(clear_lcd_message, force_emit=True)
                 return
 
         if text_type != DoorbellMessageType.CUSTOM_MESSAGE:
@@ -3353,10 +3422,12 @@ class Viewer(ProtectAdoptableDeviceModel):
         async with self._update_sync.lock:
             # yield to the event loop once we have the lock to process any pending updates
             await asyncio.sleep(0)
-            data_before_changes = self.dict_with_excludes()
-            self.liveview_id = liveview.id
+
+            def callback() -> None:
+                self.liveview_id = liveview.id
+
             # UniFi Protect bug: changing the liveview does _not_ emit a WS message
-            await self.save_device(data_before_changes, force_emit=True)
+            await self._save_tracked_changes(callback, force_emit=True)
 
     async def set_name_public(self, name: str) -> None:
         """Set viewer name via public API."""
@@ -4122,7 +4193,7 @@ class Chime(ProtectAdoptableDeviceModel):
             raise BadRequest("Camera is already paired")
 
         def callback() -> None:
-            self.camera_ids.append(camera.id)
+            self.camera_ids = [*self.camera_ids, camera.id]
 
         await self.queue_update(callback)
 
@@ -4132,7 +4203,7 @@ class Chime(ProtectAdoptableDeviceModel):
             raise BadRequest("Camera is not paired")
 
         def callback() -> None:
-            self.camera_ids.remove(camera.id)
+            self.camera_ids = [i for i in self.camera_ids if i != camera.id]
 
         await self.queue_update(callback)
 
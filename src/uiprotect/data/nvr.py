@@ -1288,22 +1288,27 @@ class NVR(ProtectDeviceModel):
         if message in self.doorbell_settings.custom_messages:
             raise BadRequest("Custom doorbell message already exists")
 
-        await self._update_doorbell_messages(
-            lambda: self.doorbell_settings.custom_messages.append(
-                DoorbellText(message)
-            ),
-        )
+        def callback() -> None:
+            settings = self.doorbell_settings
+            settings.custom_messages = [
+                *settings.custom_messages,
+                DoorbellText(message),
+            ]
+
+        await self._update_doorbell_messages(callback)
 
     async def remove_custom_doorbell_message(self, message: str) -> None:
         """Removes custom doorbell message"""
         if message not in self.doorbell_settings.custom_messages:
             raise BadRequest("Custom doorbell message does not exists")
 
-        await self._update_doorbell_messages(
-            lambda: self.doorbell_settings.custom_messages.remove(
-                DoorbellText(message)
-            ),
-        )
+        def callback() -> None:
+            settings = self.doorbell_settings
+            settings.custom_messages = [
+                m for m in settings.custom_messages if m != message
+            ]
+
+        await self._update_doorbell_messages(callback)
 
     async def _update_doorbell_messages(
         self, update_callback: Callable[[], None]
@@ -1312,9 +1317,7 @@ class NVR(ProtectDeviceModel):
         async with self._update_sync.lock:
             # yield to the event loop once we have the lock to ensure websocket updates are processed
             await asyncio.sleep(0)
-            data_before_changes = self.dict_with_excludes()
-            update_callback()
-            await self.save_device(data_before_changes)
+            await self._save_tracked_changes(update_callback)
             self.update_all_messages()
 
     async def reboot(self) -> None:
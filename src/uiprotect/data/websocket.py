@@ -17,6 +17,8 @@ from ..exceptions import WSDecodeError, WSEncodeError
 from .types import ProtectWSPayloadFormat
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from .base import ProtectModelWithId
 
 WS_HEADER_SIZE = 8
@@ -47,27 +49,141 @@ class WSSubscriptionMessage:
     old_obj: ProtectModelWithId | None = None
 
 
+_OLD_OBJ_SLOT: Any = WSSubscriptionMessage.__dict__["old_obj"]
+_MISSING: Any = object()
+
+
+class WSOldObjSnapshot:
+    """
+    Copy-on-write snapshot of an object from before it was updated.
+
+    Only the previous values of the changed fields are recorded. The full
+    old object is only copied when it is accessed, or before the object is
+    changed again while the snapshot is still referenced.
+    """
+
+    __slots__ = ("__weakref__", "_obj", "_old_obj", "_old_values")
+
+    _obj: ProtectModelWithId | None
+    _old_obj: ProtectModelWithId | None
+    _old_values: dict[str, Any] | None
+
+    def __init__(self, obj: ProtectModelWithId, keys: Iterable[str]) -> None:
+        obj_dict = obj.__dict__
+        self._obj = obj
+        self._old_obj = None
+        self._old_values = {key: obj_dict.get(key, _MISSING) for key in keys}
+
+    def materialize(self) -> ProtectModelWithId:
+        """Returns the object as it was before the update."""
+        if (old_obj := self._old_obj) is not None:
+            return old_obj
+
+        if TYPE_CHECKING:
+            assert self._obj is not None
+            assert self._old_values is not None
+        old_obj = self._obj.model_copy()
+        old_dict = old_obj.__dict__
+        for key, value in self._old_values.items():
+            if value is _MISSING:
+                old_dict.pop(key, None)
+            else:
+                old_dict[key] = value
+
+        self._old_obj = old_obj
+        self._obj = None
+        self._old_values = None
+        return old_obj
+
+
+class CopyOnWriteWSSubscriptionMessage(WSSubscriptionMessage):
+    """`WSSubscriptionMessage` that only builds `old_obj` when it is accessed."""
+
+    __slots__ = ("_old_obj_snapshot",)
+
+    _old_obj_snapshot: WSOldObjSnapshot | None
+
+    def __init__(
+        self,
+        action: WSAction,
+        new_update_id: str,
+        changed_data: dict[str, Any],
+        new_obj: ProtectModelWithId | None,
+        old_obj_snapshot: WSOldObjSnapshot,
+    ) -> None:
+        WSSubscriptionMessage.__init__(
+            self, action, new_update_id, changed_data, new_obj
+        )
+        self._old_obj_snapshot = old_obj_snapshot
+
+    def __eq__(self, other: object) -> bool:
+        # compare equal to a plain `WSSubscriptionMessage` with the same data
+        if not isinstance(other, WSSubscriptionMessage):
+            return NotImplemented
+        return (
+            self.action,
+            self.new_update_id,
+            self.changed_data,
+            self.new_obj,
+            self.old_obj,
+        ) == (
+            other.action,
+            other.new_update_id,
+            other.changed_data,
+            other.new_obj,
+            other.old_obj,
+        )
+
+    @property  # type: ignore[override]
+    def old_obj(self) -> ProtectModelWithId | None:
+        if (snapshot := self._old_obj_snapshot) is not None:
+            _OLD_OBJ_SLOT.__set__(self, snapshot.materialize())
+            self._old_obj_snapshot = None
+        return _OLD_OBJ_SLOT.__get__(self)  # type: ignore[no-any-return]
+
+    @old_obj.setter
+    def old_obj(self, value: ProtectModelWithId | None) -> None:
+        _OLD_OBJ_SLOT.__set__(self, value)
+        self._old_obj_snapshot = None
+
+
 _PACKET_STRUCT = struct.Struct("!bbbbi")
 
 
 class BaseWSPacketFrame:
     unpack = _PACKET_STRUCT.unpack
+    unpack_from = _PACKET_STRUCT.unpack_from
     pack = _PACKET_STRUCT.pack
 
     data: Any
     position: int = 0
-    header: WSPacketFrameHeader | None = None
     payload_format: ProtectWSPayloadFormat = ProtectWSPayloadFormat.NodeBuffer
     is_deflated: bool = False
     length: int = 0
 
+    _header: WSPacketFrameHeader | None = None
+    _header_fields: tuple[int, int, int, int, int] | None = None
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} header={self.header} data={self.data}>"
 
-    def set_data_from_binary(self, data: bytes) -> None:
-        self.data = data
-        if self.header is not None and self.header.deflated:
-            self.data = zlib.decompress(self.data)
+    @property
+    def header(self) -> WSPacketFrameHeader | None:
+        """Frame header, only created from the decoded header fields when needed."""
+        if self._header is None and (header_fields := self._header_fields) is not None:
+            self._header = WSPacketFrameHeader(*header_fields)
+        return self._header
+
+    @header.setter
+    def header(self, header: WSPacketFrameHeader | None) -> None:
+        self._header = header
+        self._header_fields = None
+
+    def set_data_from_binary(self, data: bytes | memoryview) -> None:
+        if self.is_deflated:
+            self.data = zlib.decompress(data)
+        else:
+            self.data = bytes(data)
 
     def get_binary_from_data(self) -> bytes:
         raise NotImplementedError
@@ -84,7 +200,7 @@ class BaseWSPacketFrame:
 
     @staticmethod
     def from_binary(
-        data: bytes,
+        data: bytes | memoryview,
         position: int = 0,
         klass: type[WSRawPacketFrame] | None = None,
     ) -> BaseWSPacketFrame:
@@ -97,57 +213,50 @@ class BaseWSPacketFrame:
         b: deflated
         b: unknown
         i: payload_size
+
+        The payload is decoded from a `memoryview` of `data` so it is not
+        copied before it is passed to `zlib` / `orjson`.
         """
-        header_end = position + WS_HEADER_SIZE
-        payload_size: int
         try:
-            (
-                packet_type,
-                payload_format,
-                deflated,
-                unknown,
-                payload_size,
-            ) = BaseWSPacketFrame.unpack(
-                data[position:header_end],
+            header_fields: tuple[int, int, int, int, int] = (
+                BaseWSPacketFrame.unpack_from(data, position)
             )
         except struct.error as e:
             raise WSDecodeError from e
 
+        payload_format = header_fields[1]
+        payload_size = header_fields[4]
         if klass is None:
             frame = WSRawPacketFrame.klass_from_format(payload_format)()
         else:
             frame = klass()
             frame.payload_format = ProtectWSPayloadFormat(payload_format)
 
-        frame.header = WSPacketFrameHeader(
-            packet_type=packet_type,
-            payload_format=payload_format,
-            deflated=deflated,
-            unknown=unknown,
-            payload_size=payload_size,
-        )
+        frame._header_fields = header_fields
         frame.length = WS_HEADER_SIZE + payload_size
-        frame.is_deflated = bool(deflated)
-        frame_end = header_end + payload_size
-        frame.set_data_from_binary(data[header_end:frame_end])
+        frame.is_deflated = bool(header_fields[2])
+        header_end = position + WS_HEADER_SIZE
+        frame.set_data_from_binary(
+            memoryview(data)[header_end : header_end + payload_size]
+        )
 
         return frame
 
     @property
     def packed(self) -> bytes:
-        if self.header is None:
+        if (header := self.header) is None:
             raise WSEncodeError("No header to encode")
 
         data = self.get_binary_from_data()
-        header = self.pack(
-            self.header.packet_type,
-            self.header.payload_format,
-            self.header.deflated,
-            self.header.unknown,
+        packed_header = self.pack(
+            header.packet_type,
+            header.payload_format,
+            header.deflated,
+            header.unknown,
             len(data),
         )
 
-        return header + data
+        return packed_header + data
 
 
 class WSRawPacketFrame(BaseWSPacketFrame):
@@ -165,8 +274,8 @@ class WSJSONPacketFrame(BaseWSPacketFrame):
     data: dict[str, Any] = {}
     payload_format: ProtectWSPayloadFormat = ProtectWSPayloadFormat.NodeBuffer
 
-    def set_data_from_binary(self, data: bytes) -> None:
-        if self.header is not None and self.header.deflated:
+    def set_data_from_binary(self, data: bytes | memoryview) -> None:
+        if self.is_deflated:
             data = zlib.decompress(data)
 
         self.data = orjson.loads(data)
@@ -199,30 +308,33 @@ class WSPacket:
         return f"<{self.__class__.__name__} action_frame={self.action_frame} data_frame={self.data_frame}>"
 
     def decode(self) -> None:
-        data = self._raw
-        self._action_frame = WSRawPacketFrame.from_binary(data)
-        length = self._action_frame.length
-        self._data_frame = WSRawPacketFrame.from_binary(data, length)
+        self._decode_action_frame()
+        self._decode_data_frame()
+
+    def _decode_action_frame(self) -> BaseWSPacketFrame:
+        self._action_frame = WSRawPacketFrame.from_binary(memoryview(self._raw))
+        return self._action_frame
+
+    def _decode_data_frame(self) -> BaseWSPacketFrame:
+        if (action_frame := self._action_frame) is None:
+            action_frame = self._decode_action_frame()
+        self._data_frame = WSRawPacketFrame.from_binary(
+            memoryview(self._raw), action_frame.length
+        )
+        return self._data_frame
 
     @cached_property
     def action_frame(self) -> BaseWSPacketFrame:
-        if self._action_frame is None:
-            self.decode()
-        if TYPE_CHECKING:
-            assert self._action_frame is not None
-            assert self._data_frame is not None
-        self.__dict__["data_frame"] = self._data_frame
-        return self._action_frame
+        """Action frame, decoded without decoding the data frame."""
+        if (action_frame := self._action_frame) is None:
+            action_frame = self._decode_action_frame()
+        return action_frame
 
     @cached_property
     def data_frame(self) -> BaseWSPacketFrame:
-        if self._data_frame is None:
-            self.decode()
-        if TYPE_CHECKING:
-            assert self._action_frame is not None
-            assert self._data_frame is not None
-        self.__dict__["action_frame"] = self._action_frame
-        return self._data_frame
+        if (data_frame := self._data_frame) is None:
+            data_frame = self._decode_data_frame()
+        return data_frame
 
     @property
     def raw(self) -> bytes:
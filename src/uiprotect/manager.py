@@ -0,0 +1,255 @@
+"""Running many UniFi Protect clients in one process."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import random
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from .api import ProtectApiClient
+from .utils import utc_now
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from types import TracebackType
+    from typing import Self
+
+    from .websocket import Websocket
+
+#: Default total number of connections kept by the shared connector.
+DEFAULT_CONNECTION_LIMIT = 100
+#: Default number of connections to a single NVR.
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 10
+#: Default seconds resolved NVR host names are cached by the shared connector.
+DEFAULT_DNS_CACHE_TTL = 300
+#: Default number of NVRs `ProtectClientManager.update()` refreshes at once.
+DEFAULT_UPDATE_CONCURRENCY = 4
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ProtectClientHealth:
+    """
+    Health of a client managed by `ProtectClientManager`.
+
+    Attributes:
+        host: Host of the NVR.
+        connected: Whether the client's Websocket is connected (the private one, or the devices one for public-only clients).
+        last_refresh: When the bootstrap was last refreshed successfully.
+        last_error: Error of the last failed refresh, cleared by a successful one.
+        refreshes: Number of successful refreshes.
+        failures: Number of refreshes failed in a row.
+
+    """
+
+    host: str
+    connected: bool = False
+    last_refresh: datetime | None = None
+    last_error: Exception | None = None
+    refreshes: int = 0
+    failures: int = 0
+
+
+class ProtectClientManager:
+    """
+    Manages `ProtectApiClient`s for many NVRs.
+
+    Every client created with `add_client` sends its requests (and opens its
+    Websockets) through one shared `aiohttp.TCPConnector`, so connections,
+    the DNS cache and TLS setup are pooled across NVRs while
+    `limit_per_host` still caps the connections to each one. Each client
+    keeps its own sessions so their cookies stay separate.
+
+    With `refresh_interval`, `start` refreshes the bootstrap of every client
+    periodically, with the clients spread evenly across the interval instead
+    of all refreshing at once.
+
+    ```python
+    async with ProtectClientManager(refresh_interval=600) as manager:
+        for host in hosts:
+            manager.add_client(host, 443, username, password)
+        await manager.update()
+        manager.start()
+        ...
+    ```
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float | None = None,
+        limit: int = DEFAULT_CONNECTION_LIMIT,
+        limit_per_host: int = DEFAULT_CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache: int = DEFAULT_DNS_CACHE_TTL,
+    ) -> None:
+        self._refresh_interval = refresh_interval
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._ttl_dns_cache = ttl_dns_cache
+        self._connector: aiohttp.TCPConnector | None = None
+        self._clients: dict[ProtectApiClient, ProtectClientHealth] = {}
+        self._refresh_tasks: dict[ProtectApiClient, asyncio.Task[None]] = {}
+        self._started = False
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    @property
+    def clients(self) -> list[ProtectApiClient]:
+        """Managed clients, in the order they were added."""
+        return list(self._clients)
+
+    @property
+    def connector(self) -> aiohttp.TCPConnector:
+        """Connector shared by the managed clients."""
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                ttl_dns_cache=self._ttl_dns_cache,
+            )
+        return self._connector
+
+    def add_client(
+        self,
+        host: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        **kwargs: Any,
+    ) -> ProtectApiClient:
+        """
+        Creates a client for the NVR at `host` that uses the shared connector.
+
+        `kwargs` are passed to `ProtectApiClient`. Must be called from the
+        event loop. If the manager was started, the client is refreshed
+        periodically as well.
+        """
+        client = ProtectApiClient(
+            host, port, username, password, connector=self.connector, **kwargs
+        )
+        self._clients[client] = ProtectClientHealth(host)
+        if self._started:
+            assert self._refresh_interval is not None
+            self._start_refresh(client, random.uniform(0, self._refresh_interval))  # noqa: S311
+        return client
+
+    async def remove_client(self, client: ProtectApiClient) -> None:
+        """Stops refreshing `client` and closes its sessions."""
+        del self._clients[client]
+        if (task := self._refresh_tasks.pop(client, None)) is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await client.close_session()
+
+    async def update(self, max_concurrency: int = DEFAULT_UPDATE_CONCURRENCY) -> None:
+        """Refreshes every client, at most `max_concurrency` at once; failures are recorded in `health()`."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _update(client: ProtectApiClient) -> None:
+            async with semaphore:
+                await self._refresh(client)
+
+        await asyncio.gather(*(_update(client) for client in self._clients))
+
+    def start(self) -> None:
+        """Starts refreshing the clients every `refresh_interval` seconds, staggered across the interval."""
+        if self._refresh_interval is None:
+            raise ValueError("refresh_interval is required to start refreshing")
+        if self._started:
+            return
+        self._started = True
+        count = len(self._clients)
+        for index, client in enumerate(self._clients):
+            self._start_refresh(client, self._refresh_interval * (index + 1) / count)
+
+    async def stop(self) -> None:
+        """Stops refreshing the clients."""
+        self._started = False
+        tasks = list(self._refresh_tasks.values())
+        self._refresh_tasks.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def close(self) -> None:
+        """Stops refreshing, closes every client and the shared connector."""
+        await self.stop()
+        await asyncio.gather(
+            *(client.close_session() for client in self._clients),
+            return_exceptions=True,
+        )
+        self._clients.clear()
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+    def health(self) -> list[ProtectClientHealth]:
+        """Health of every client, in the order they were added."""
+        for client, health in self._clients.items():
+            health.connected = _is_websocket_connected(client)
+        return list(self._clients.values())
+
+    def metrics(self) -> dict[str, int]:
+        """Aggregated counters over every client."""
+        health = self.health()
+        return {
+            "clients": len(health),
+            "connected": sum(h.connected for h in health),
+            "failing": sum(h.failures > 0 for h in health),
+            "refreshes": sum(h.refreshes for h in health),
+        }
+
+    def _start_refresh(self, client: ProtectApiClient, delay: float) -> None:
+        self._refresh_tasks[client] = asyncio.create_task(
+            self._refresh_loop(client, delay)
+        )
+
+    async def _refresh_loop(self, client: ProtectApiClient, delay: float) -> None:
+        assert self._refresh_interval is not None
+        await asyncio.sleep(delay)
+        while True:
+            await self._refresh(client)
+            await asyncio.sleep(self._refresh_interval)
+
+    async def _refresh(self, client: ProtectApiClient) -> None:
+        health = self._clients[client]
+        try:
+            if client.is_public_only:
+                await client.update_public()
+            else:
+                await client.update()
+        except Exception as err:
+            _LOGGER.warning("Failed to refresh %s: %s", health.host, err)
+            health.last_error = err
+            health.failures += 1
+        else:
+            health.last_refresh = utc_now()
+            health.last_error = None
+            health.refreshes += 1
+            health.failures = 0
+
+
+def _is_websocket_connected(client: ProtectApiClient) -> bool:
+    websocket: Websocket | None = (
+        client._devices_websocket
+        if client.is_public_only
+        else client._private_websocket
+    )
+    return websocket is not None and websocket.is_connected
@@ -1,4 +1,4 @@
-"""Audio streaming utilities for UniFi Protect cameras using PyAV."""
+"""Audio streaming to UniFi Protect cameras using PyAV, and media streaming from the NVR."""
 
 from __future__ import annotations
 
@@ -17,8 +17,9 @@ from .exceptions import BadRequest, StreamError
 from .utils import format_host_for_url
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import AsyncIterator, Callable
 
+    import aiohttp
     from av.audio import AudioStream
 
     from .data import Camera
@@ -344,3 +345,58 @@ class TalkbackStream:
                 if isinstance(error, BaseException):
                     raise error
                 raise StreamError(f"Unexpected error: {error}")
+
+
+class MediaStream:
+    """
+    Media downloaded from the NVR, read as it arrives.
+
+    Returned by the ``stream_`` methods of `ProtectApiClient`. Iterating it
+    yields chunks of at most `chunk_size` bytes straight from the
+    connection; the NVR is only read from as fast as the chunks are
+    consumed, so nothing is buffered beyond the socket buffers.
+
+    ```python
+    async with client.stream_camera_video(camera_id, start, end) as stream:
+        response.content_length = stream.content_length
+        async for chunk in stream:
+            await response.write(chunk)
+    ```
+
+    Attributes:
+        content_type: MIME type of the media.
+        content_length: Size of the media in bytes, if the NVR sent it.
+        bytes_read: Bytes yielded so far.
+
+    """
+
+    __slots__ = (
+        "_chunk_size",
+        "_response",
+        "bytes_read",
+        "content_length",
+        "content_type",
+    )
+
+    def __init__(self, response: aiohttp.ClientResponse, chunk_size: int) -> None:
+        self._response = response
+        self._chunk_size = chunk_size
+        self.content_type: str = response.content_type
+        self.content_length: int | None = response.content_length
+        self.bytes_read = 0
+
+    @property
+    def progress(self) -> float | None:
+        """Fraction of the media read so far, if its size is known."""
+        if not self.content_length:
+            return None
+        return self.bytes_read / self.content_length
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._response.content.iter_chunked(self._chunk_size):
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    async def read(self) -> bytes:
+        """Reads the rest of the media."""
+        return b"".join([chunk async for chunk in self])
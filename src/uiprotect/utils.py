@@ -221,49 +221,92 @@ def to_camel_case(name: str) -> str:
 _EMPTY_UUID = UUID("0" * 32)
 
 
-def convert_unifi_data(value: Any, field: FieldInfo) -> Any:  # noqa: PLR0911, PLR0912
+def convert_unifi_data(value: Any, field: FieldInfo) -> Any:
     """Converts value from UFP data into pydantic field class"""
+    if (converter := get_unifi_data_converter(field)) is None:
+        return value
+    return converter(value)
+
+
+def get_unifi_data_converter(field: FieldInfo) -> Callable[[Any], Any] | None:
+    """
+    Builds a converter from UFP data into pydantic field class.
+
+    Returns `None` if values for the field never need to be converted.
+    """
     origin, type_ = get_field_type(field.annotation)  # type: ignore[arg-type]
 
     if type_ is Any:
-        return value
+        return None
+
+    convert_value = _get_value_converter(type_)
+    if origin not in {list, set, dict}:
+        if convert_value is None:
+            return None
+        return partial(_convert_if_not_none, convert_value)
+
+    if convert_value is None and origin is not set:
+        return None
 
-    if origin is not None:
+    def convert(value: Any) -> Any:
         if origin is list and isinstance(value, list):
-            return [convert_unifi_data(v, field) for v in value]
+            return [convert(v) for v in value]
         if origin is set and isinstance(value, list):
-            return {convert_unifi_data(v, field) for v in value}
+            return {convert(v) for v in value}
         if origin is dict and isinstance(value, dict):
-            return {k: convert_unifi_data(v, field) for k, v in value.items()}
-
-    if value is not None:
-        if type_ in _IP_TYPES:
-            # Handle IP addresses - use _cached_ip_address to support cases where
-            # UniFi returns IPv6 for a field typed as IPv4Address or vice versa
-            if value == "":
-                # Return empty string only if str is in the union, otherwise None
-                return value if type_ in _IP_TYPES_WITH_STR else None
-            return _cached_ip_address(value)
-        if type_ is datetime:
-            return from_js_time(value)
-        if type_ in _CREATE_TYPES:
-            # cannot do this check too soon because some types cannot be used in isinstance
-            if isinstance(value, type_):
-                return value
-            if type_ is UUID:
-                if not value:
-                    return None
-                # handle edge case for improperly formatted UUIDs
-                # 00000000-0000-00 0- 000-000000000000
-                if value == _BAD_UUID:
-                    return _EMPTY_UUID
-            return type_(value)
-        if _is_enum_type(type_):
-            if _is_from_string_enum(type_):
-                return type_.from_string(value)
-            return type_(value)
+            return {k: convert(v) for k, v in value.items()}
+        if value is None or convert_value is None:
+            return value
+        return convert_value(value)
 
-    return value
+    return convert
+
+
+def _convert_if_not_none(convert_value: Callable[[Any], Any], value: Any) -> Any:
+    if value is None:
+        return value
+    return convert_value(value)
+
+
+def _get_value_converter(type_: Any) -> Callable[[Any], Any] | None:
+    """Gets the converter for a single (not None) value of a given type."""
+    if type_ in _IP_TYPES:
+        # Handle IP addresses - use _cached_ip_address to support cases where
+        # UniFi returns IPv6 for a field typed as IPv4Address or vice versa
+        # Return empty string only if str is in the union, otherwise None
+        empty = "" if type_ in _IP_TYPES_WITH_STR else None
+        return partial(_convert_ip_address, empty)
+    if type_ is datetime:
+        return from_js_time
+    if type_ in _CREATE_TYPES:
+        return partial(_convert_create_type, type_)
+    if _is_enum_type(type_):
+        if _is_from_string_enum(type_):
+            return type_.from_string  # type: ignore[no-any-return]
+        return type_  # type: ignore[no-any-return]
+    return None
+
+
+def _convert_ip_address(
+    empty: str | None, value: str
+) -> IPv4Address | IPv6Address | str | None:
+    if value == "":
+        return empty
+    return _cached_ip_address(value)
+
+
+def _convert_create_type(type_: type[Any], value: Any) -> Any:
+    # cannot do this check too soon because some types cannot be used in isinstance
+    if isinstance(value, type_):
+        return value
+    if type_ is UUID:
+        if not value:
+            return None
+        # handle edge case for improperly formatted UUIDs
+        # 00000000-0000-00 0- 000-000000000000
+        if value == _BAD_UUID:
+            return _EMPTY_UUID
+    return type_(value)
 
 
 @lru_cache
@@ -485,6 +528,7 @@ def print_ws_stat_summary(
         "-" * side_length + title + "-" * side_length,
         f"packet count: {len(stats)}",
         f"filtered packet count: {len(unfiltered)} ({percent:.4}%)",
+        f"stats only packet count: {sum(s.stats_only for s in stats)}",
         "-" * 80,
     ]
 
@@ -94,6 +94,11 @@ class Websocket:
         """Return if the websocket connection is open."""
         return self._ws_connection is not None and not self._ws_connection.closed
 
+    @property
+    def is_running(self) -> bool:
+        """Return if the websocket is started and will keep reconnecting."""
+        return self._running
+
     async def _websocket_loop(self) -> None:
         """Running loop for websocket."""
         await self.wait_closed()
@@ -0,0 +1,72 @@
+"""
+Benchmarks for WSPacket decoding.
+
+Every private websocket message is wrapped in a ``WSPacket`` and both of its
+frames are decoded before ``Bootstrap.process_ws_packet`` runs. The timed
+region here is that decode step: header unpacking, inflating and JSON
+parsing of the recorded message stream, and how much of it is skipped when
+packets are filtered before the data frame is decoded.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uiprotect.data import ModelType, WSPacket
+
+if TYPE_CHECKING:
+    from pytest_codspeed import BenchmarkFixture
+
+    from uiprotect.data import Bootstrap
+
+
+_ROUNDS = 5
+
+
+def test_ws_packet_decode(
+    benchmark: BenchmarkFixture,
+    ws_raw_frames: list[bytes],
+) -> None:
+    """Decode the action and data frame of every recorded packet."""
+
+    def _run() -> None:
+        for raw in ws_raw_frames:
+            packet = WSPacket(raw)
+            _ = packet.action_frame.data
+            _ = packet.data_frame.data
+
+    benchmark.pedantic(_run, rounds=_ROUNDS)
+
+
+def test_ws_packet_decode_action_only(
+    benchmark: BenchmarkFixture,
+    ws_raw_frames: list[bytes],
+) -> None:
+    """Decode every recorded packet and read only the action frame."""
+
+    def _run() -> None:
+        for raw in ws_raw_frames:
+            _ = WSPacket(raw).action_frame.data
+
+    benchmark.pedantic(_run, rounds=_ROUNDS)
+
+
+@pytest.mark.asyncio
+async def test_ws_packet_decode_and_process_cameras_only(
+    benchmark: BenchmarkFixture,
+    benchmark_bootstrap: Bootstrap,
+    ws_raw_frames: list[bytes],
+) -> None:
+    """Decode and process every recorded packet when only cameras are subscribed."""
+    bootstrap = benchmark_bootstrap
+    bootstrap.capture_ws_stats = False
+    process = bootstrap.process_ws_packet
+    models = {ModelType.CAMERA}
+
+    def _run() -> None:
+        for raw in ws_raw_frames:
+            process(WSPacket(raw), models)
+
+    benchmark.pedantic(_run, rounds=_ROUNDS)
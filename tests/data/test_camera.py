@@ -11,6 +11,7 @@ from pydantic import ValidationError
 
 from tests.conftest import TEST_CAMERA_EXISTS
 from uiprotect import ProtectApiClient
+from uiprotect._rate_limit import RequestPriority
 from uiprotect.data import (
     CHANNEL_ID_BY_RTSPS_QUALITY,
     RTSPS_QUALITY_BY_CHANNEL_ID,
@@ -1470,7 +1471,10 @@ async def test_get_public_api_snapshot_hq(camera_obj: Camera, high_quality: bool
 
     assert snapshot == b"snapshot_data"
     camera_obj._api.get_public_api_camera_snapshot.assert_called_once_with(
-        camera_id=camera_obj.id, high_quality=high_quality, package=False
+        camera_id=camera_obj.id,
+        high_quality=high_quality,
+        package=False,
+        max_age=None,
     )
 
 
@@ -1490,7 +1494,10 @@ async def test_get_public_api_snapshot_default_quality(
 
     assert snapshot == b"snapshot_data"
     camera_obj._api.get_public_api_camera_snapshot.assert_called_once_with(
-        camera_id=camera_obj.id, high_quality=high_quality, package=False
+        camera_id=camera_obj.id,
+        high_quality=high_quality,
+        package=False,
+        max_age=None,
     )
 
 
@@ -1508,7 +1515,10 @@ async def test_get_public_api_snapshot_package(camera_obj: Camera, package: bool
 
     assert snapshot == b"snapshot_data"
     camera_obj._api.get_public_api_camera_snapshot.assert_called_once_with(
-        camera_id=camera_obj.id, high_quality=False, package=package
+        camera_id=camera_obj.id,
+        high_quality=False,
+        package=package,
+        max_age=None,
     )
 
 
@@ -1525,7 +1535,11 @@ async def test_get_snapshot_with_dt(camera_obj: Camera):
 
     assert snapshot == b"snapshot_data"
     camera_obj._api.get_camera_snapshot.assert_called_once_with(
-        camera_obj.id, None, camera_obj.high_camera_channel.height, dt=now
+        camera_obj.id,
+        None,
+        camera_obj.high_camera_channel.height,
+        dt=now,
+        max_age=None,
     )
 
 
@@ -1624,7 +1638,7 @@ async def test_get_package_snapshot_with_dt(camera_obj: Camera):
 
     assert snapshot == b"snapshot_data"
     camera_obj._api.get_package_camera_snapshot.assert_called_once_with(
-        camera_obj.id, None, None, dt=now
+        camera_obj.id, None, None, dt=now, max_age=None
     )
 
 
@@ -1893,4 +1907,5 @@ async def test_camera_ptz_public_api(
         url=f"/v1/cameras/{ptz_camera.id}{expected_path}",
         method="post",
         public_api=True,
+        priority=RequestPriority.INTERACTIVE,
     )
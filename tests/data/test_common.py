@@ -47,7 +47,12 @@ from uiprotect.data.devices import LCDMessage
 from uiprotect.data.nvr import EventMetadata
 from uiprotect.data.types import RecordingType, ResolutionStorageType
 from uiprotect.data.user import CloudAccount
-from uiprotect.exceptions import BadRequest, NotAuthorized, StreamError
+from uiprotect.exceptions import (
+    BadRequest,
+    NotAuthorized,
+    StreamError,
+    WSDecodeError,
+)
 from uiprotect.utils import set_debug, set_no_debug, utc_now
 
 from ..common import assert_equal_dump
@@ -129,6 +134,30 @@ def test_packet_raw_setter():
     assert packet.data_frame.data == PACKET2_DATA
 
 
+def test_packet_decode_lazy_header():
+    packet_raw = base64.b64decode(PACKET_B64)
+
+    packet = WSPacket(packet_raw)
+    action_frame = packet.action_frame
+
+    assert action_frame._header is None
+    assert action_frame.is_deflated is True
+    assert packet.data_frame.data == PACKET_DATA
+
+    repacked = WSPacket(packet.pack_frames())
+    assert repacked.action_frame.data == PACKET_ACTION
+    assert repacked.data_frame.data == PACKET_DATA
+    header = action_frame.header
+    assert header is not None
+    assert header.deflated == 1
+    assert header.payload_size == action_frame.length - 8
+
+
+def test_packet_decode_truncated():
+    with pytest.raises(WSDecodeError):
+        WSPacket(base64.b64decode(PACKET_B64)[:4]).decode()
+
+
 def compare_devices(data):
     obj = create_from_unifi_dict(deepcopy(data))
     obj_dict = obj.unifi_dict()
@@ -1483,6 +1512,151 @@ async def test_save_device_no_changes(camera_obj: Camera):
     assert not camera_obj.api.api_request.called  # type: ignore[attr-defined]
 
 
+@pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
+def test_unifi_dict_exclude_keeps_children(camera_obj: Camera):
+    data = camera_obj.unifi_dict(exclude={"name", "is_dark", "isp_settings"})
+
+    assert "name" not in data
+    assert "isDark" not in data
+    # UFP child objects are always included
+    assert data["ispSettings"] == camera_obj.isp_settings.unifi_dict()
+    assert data["lastMotion"] == camera_obj.unifi_dict()["lastMotion"]
+
+
+@pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
+def test_get_changed_tracked(camera_obj: Camera):
+    camera_obj.name = "Before"
+    camera_obj.recording_settings.enable_motion_detection = True
+
+    camera_obj._track_changes()
+    camera_obj.name = "Before"
+    camera_obj.recording_settings.enable_motion_detection = False
+    camera_obj.mic_volume = camera_obj.mic_volume
+    with patch.object(Camera, "model_dump") as model_dump:
+        changed = camera_obj.get_changed()
+    originals = camera_obj._untrack_changes()
+
+    model_dump.assert_not_called()
+    assert changed == {"recording_settings": {"enable_motion_detection": False}}
+    assert camera_obj._dirty_fields is None
+    assert camera_obj.recording_settings._dirty_fields is None
+    assert {id(obj) for obj, _ in originals} == {
+        id(camera_obj),
+        id(camera_obj.recording_settings),
+    }
+
+
+@pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
+@pytest.mark.asyncio()
+async def test_queue_update_reverts_tracked_fields(camera_obj: Camera):
+    camera_obj.recording_settings.enable_motion_detection = True
+
+    def ws_update_then_fail(*args: Any, **kwargs: Any) -> None:
+        # a websocket update arriving mid-save is not reverted
+        camera_obj.name = "From websocket"
+        raise BadRequest("failed")
+
+    camera_obj.api.api_request = AsyncMock(side_effect=ws_update_then_fail)  # type: ignore[method-assign]
+
+    def callback() -> None:
+        camera_obj.recording_settings.enable_motion_detection = False
+
+    with pytest.raises(BadRequest):
+        await camera_obj.queue_update(callback)
+
+    camera_obj.api.api_request.assert_called_once_with(  # type: ignore[attr-defined]
+        f"cameras/{camera_obj.id}",
+        method="patch",
+        json={"recordingSettings": {"enableMotionDetection": False}},
+    )
+    assert camera_obj.recording_settings.enable_motion_detection is True
+    assert camera_obj.name == "From websocket"
+
+
+@pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
+@pytest.mark.asyncio()
+async def test_queue_update_in_place_mutation(camera_obj: Camera):
+    camera_obj.smart_detect_settings.object_types = [SmartDetectObjectType.PERSON]
+    camera_obj.api.api_request = AsyncMock(side_effect=BadRequest("failed"))  # type: ignore[method-assign]
+
+    def callback() -> None:
+        camera_obj.smart_detect_settings.object_types.append(
+            SmartDetectObjectType.VEHICLE
+        )
+
+    with pytest.raises(BadRequest):
+        await camera_obj.queue_update(callback)
+
+    camera_obj.api.api_request.assert_called_once_with(  # type: ignore[attr-defined]
+        f"cameras/{camera_obj.id}",
+        method="patch",
+        json={"smartDetectSettings": {"objectTypes": ["person", "vehicle"]}},
+    )
+    # reverted to the list from before the callback
+    assert camera_obj.smart_detect_settings.object_types == [
+        SmartDetectObjectType.PERSON
+    ]
+
+
+@pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
+@pytest.mark.asyncio()
+async def test_queue_update_merges_burst(camera_obj: Camera):
+    camera_obj.api.api_request.reset_mock()  # type: ignore[attr-defined]
+    camera_obj.recording_settings.enable_motion_detection = False
+    camera_obj.mic_volume = 0
+
+    await asyncio.gather(
+        camera_obj.set_motion_detection(True),
+        camera_obj.set_mic_volume(50),
+    )
+
+    camera_obj.api.api_request.assert_called_once_with(  # type: ignore[attr-defined]
+        f"cameras/{camera_obj.id}",
+        method="patch",
+        json={"recordingSettings": {"enableMotionDetection": True}, "micVolume": 50},
+    )
+
+
+@pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
+@pytest.mark.asyncio()
+async def test_queue_update_window_and_flush(camera_obj: Camera):
+    camera_obj.api.api_request.reset_mock()  # type: ignore[attr-defined]
+    camera_obj.api.update_debounce_window = 60
+    camera_obj.mic_volume = 0
+
+    task = asyncio.create_task(camera_obj.set_mic_volume(50))
+    await asyncio.sleep(0.01)
+    assert not camera_obj.api.api_request.called  # type: ignore[attr-defined]
+
+    await camera_obj.flush_updates()
+    await task
+    camera_obj.api.api_request.assert_called_once_with(  # type: ignore[attr-defined]
+        f"cameras/{camera_obj.id}",
+        method="patch",
+        json={"micVolume": 50},
+    )
+    # nothing pending
+    await camera_obj.flush_updates()
+
+
+@pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
+@pytest.mark.asyncio()
+async def test_queue_update_error_raised_to_all_callers(camera_obj: Camera):
+    camera_obj.api.api_request = AsyncMock(side_effect=BadRequest("failed"))  # type: ignore[method-assign]
+    camera_obj.recording_settings.enable_motion_detection = False
+    camera_obj.mic_volume = 0
+
+    results = await asyncio.gather(
+        camera_obj.set_motion_detection(True),
+        camera_obj.set_mic_volume(50),
+        return_exceptions=True,
+    )
+
+    assert [type(r) for r in results] == [BadRequest, BadRequest]
+    assert camera_obj.recording_settings.enable_motion_detection is False
+    assert camera_obj.mic_volume == 0
+
+
 @pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
 @pytest.mark.asyncio()
 async def test_device_reboot(camera_obj: Camera):
@@ -1994,6 +2168,26 @@ def test_event_metadata_collapse_keys_non_dict_passthrough():
     assert result["type"] == "motion"
 
 
+def test_unifi_dict_to_dict_compiled_decoders():
+    """Decoders are compiled once per key, including remapped and unknown keys."""
+    decoders = Camera._get_unifi_decoders()
+    decoder = decoders["modelKey"]
+    assert decoder is not None
+    assert decoder.name == "model"
+    assert decoders["lastSeen"].pre_convert is not None  # type: ignore[union-attr]
+    assert decoders["featureFlags"].child_klass is not None  # type: ignore[union-attr]
+
+    data: dict[str, Any] = {
+        "modelKey": "camera",
+        "isMotionDetected": True,
+        "notARealCameraKey": 1,
+    }
+    result = Camera.unifi_dict_to_dict(data)
+
+    assert result == {"model": ModelType.CAMERA, "is_motion_detected": True}
+    assert decoders["notARealCameraKey"] is None
+
+
 def test_handle_ws_error_event_model(
     protect_client: ProtectApiClient,
 ):
@@ -5,13 +5,15 @@ from __future__ import annotations
 import asyncio
 import logging
 from copy import deepcopy
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
+from functools import partial
 from io import BytesIO
 from ipaddress import IPv4Address, IPv6Address
 from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock, Mock, patch
 
 import aiohttp
+import av
 import orjson
 import pytest
 from aiofiles import os as aos
@@ -41,10 +43,19 @@ from tests.conftest import (
     async_write_text,
     compare_objs,
     get_time,
+    mock_api_request,
     validate_video_file,
 )
 from tests.sample_data.constants import CONSTANTS
-from uiprotect.api import ProtectApiClient, RTSPSStreams, get_user_hash
+from uiprotect._rate_limit import RequestPriority
+from uiprotect._snapshot_cache import SnapshotCache
+from uiprotect.api import (
+    EVENT_PAGE_CONCURRENCY,
+    EVENT_PAGE_SIZE,
+    ProtectApiClient,
+    RTSPSStreams,
+    get_user_hash,
+)
 from uiprotect.data import (
     Camera,
     ChannelQuality,
@@ -59,13 +70,14 @@ from uiprotect.data import (
 )
 from uiprotect.data.devices import LEDSettings
 from uiprotect.data.types import DeviceState, Version, VideoMode
-from uiprotect.data.websocket import WSAction
+from uiprotect.data.websocket import WSAction, WSSubscriptionMessage
 from uiprotect.exceptions import (
     ArmedModeError,
     BadRequest,
     GlobalAlarmManagerError,
     NotAuthorized,
     NvrError,
+    StreamError,
 )
 from uiprotect.stream import TalkbackSession
 from uiprotect.utils import decode_token_cookie, to_js_time
@@ -435,6 +447,58 @@ async def test_connection_host_update_fallback_to_first(
     assert protect_client._connection_host == IPv4Address("192.168.1.1")
 
 
+@pytest.mark.asyncio()
+async def test_update_from_bootstrap_cache(
+    protect_client: ProtectApiClient, tmp_path: Path
+):
+    protect_client._cache_bootstrap = True
+    protect_client.config_dir = tmp_path
+    protect_client._bootstrap = None
+    await protect_client.update()
+    expected = protect_client.bootstrap
+    stat = await aos.stat(protect_client.bootstrap_cache_file)
+    assert stat.st_mode & 0o777 == 0o600
+    assert await aos.listdir(tmp_path) == [protect_client.bootstrap_cache_file.name]
+
+    client = ProtectApiClient(
+        "127.0.0.1",
+        0,
+        "username",
+        "password",
+        config_dir=tmp_path,
+        store_sessions=False,
+        cache_bootstrap=True,
+    )
+    client.api_request = AsyncMock(side_effect=mock_api_request)  # type: ignore[method-assign]
+    bootstrap = await client.update()
+
+    client.api_request.assert_not_called()
+    assert bootstrap.unifi_dict() == expected.unifi_dict()
+    assert bootstrap.keyrings == expected.keyrings
+    assert bootstrap.ulp_users == expected.ulp_users
+    assert client.ws_url.endswith(f"lastUpdateId={expected.last_update_id}")
+
+    # once the bootstrap is loaded, updates go back to UniFi Protect
+    await client.update()
+    client.api_request.assert_called()
+    await client.close_session()
+
+
+@pytest.mark.asyncio()
+async def test_update_invalid_bootstrap_cache(
+    protect_client: ProtectApiClient, tmp_path: Path
+):
+    protect_client._cache_bootstrap = True
+    protect_client.config_dir = tmp_path
+    protect_client._bootstrap = None
+    await async_write_bytes(protect_client.bootstrap_cache_file, b"{}")
+
+    await protect_client.update()
+
+    protect_client.api_request.assert_called()
+    assert protect_client.bootstrap.last_update_id
+
+
 def test_connection_host_ipv6(protect_client: ProtectApiClient):
     """Test that IPv6 addresses work correctly for connection_host."""
     protect_client.bootstrap.nvr.hosts = [
@@ -623,6 +687,39 @@ async def test_force_update_with_nfc_fingerprint_version(
     assert len(protect_client.bootstrap.ulp_users)
 
 
+@pytest.mark.asyncio()
+async def test_update_fetches_keyrings_with_bootstrap(
+    protect_client: ProtectApiClient,
+):
+    protect_client.bootstrap.nvr.version = NFC_FINGERPRINT_SUPPORT_VERSION
+    bootstrap_requested = asyncio.Event()
+    release_bootstrap = asyncio.Event()
+    list_requests: list[str] = []
+
+    async def _get_bootstrap() -> Mock:
+        bootstrap_requested.set()
+        await release_bootstrap.wait()
+        return Mock(nvr=Mock(version=NFC_FINGERPRINT_SUPPORT_VERSION))
+
+    async def _list(url: str) -> list[dict[str, Any]]:
+        list_requests.append(url)
+        return []
+
+    with (
+        patch.object(protect_client, "get_bootstrap", side_effect=_get_bootstrap),
+        patch.object(protect_client, "api_request_list", side_effect=_list),
+    ):
+        update = asyncio.create_task(protect_client.update())
+        await bootstrap_requested.wait()
+        await asyncio.sleep(0)
+        # the NVR version is already known, keyrings do not wait for bootstrap
+        assert sorted(list_requests) == ["keyrings", "ulp-users"]
+        release_bootstrap.set()
+        await update
+
+    assert sorted(list_requests) == ["keyrings", "ulp-users"]
+
+
 @pytest.mark.asyncio()
 async def test_force_update_no_user_keyring_access(protect_client: ProtectApiClient):
     protect_client._bootstrap = None
@@ -817,6 +914,204 @@ async def test_get_events_not_event_with_type(protect_client: ProtectApiClient,
     assert await protect_client.get_events() == []
 
 
+def _paged_events(total: int, newest: int) -> list[dict[str, Any]]:
+    """Events sorted newest first, one second apart."""
+    return [
+        {"id": f"event{i}", "start": newest - i * 1000, "end": newest - i * 1000}
+        for i in range(total)
+    ]
+
+
+@pytest.mark.asyncio()
+async def test_get_events_raw_manual_paginate(protect_client: ProtectApiClient):
+    end = datetime(2024, 1, 1, tzinfo=UTC)
+    start = end - timedelta(seconds=450)
+    all_events = _paged_events(1000, to_js_time(end) + 50_000)
+    in_flight = 0
+    max_in_flight = 0
+    offsets: list[int] = []
+
+    async def _list(url: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        nonlocal in_flight, max_in_flight
+        assert url == "events"
+        assert params["orderDirection"] == "DESC"
+        offsets.append(params["offset"])
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        offset = params["offset"]
+        if offset >= 200:
+            # an event arriving mid-backfill shifts later pages by one
+            offset -= 1
+        return all_events[offset : offset + params["limit"]]
+
+    protect_client.api_request_list = AsyncMock(side_effect=_list)  # type: ignore[method-assign]
+
+    events = await protect_client.get_events_raw(start=start, end=end)
+
+    expected = [
+        event
+        for event in reversed(all_events)
+        if to_js_time(start) <= event["start"] <= to_js_time(end)
+    ]
+    assert events == expected
+    assert max_in_flight <= EVENT_PAGE_CONCURRENCY
+    # slow start: 1, 2, 4 pages in flight; stops once a page passes `start`
+    assert sorted(offsets)[:6] == [0, 100, 200, 300, 400, 500]
+    assert len(offsets) < len(all_events) // EVENT_PAGE_SIZE
+
+    events = await protect_client.get_events_raw(
+        start=start, end=end, sorting="desc", limit=10, offset=5
+    )
+    assert events == list(reversed(expected))[5:15]
+
+
+@pytest.mark.asyncio()
+async def test_get_events_raw_manual_paginate_short_page(
+    protect_client: ProtectApiClient,
+):
+    end = datetime(2024, 1, 1, tzinfo=UTC)
+    all_events = _paged_events(30, to_js_time(end))
+    protect_client.api_request_list = AsyncMock(return_value=all_events)  # type: ignore[method-assign]
+
+    events = await protect_client.get_events_raw(
+        start=end - timedelta(days=1), end=end, sorting="desc"
+    )
+
+    assert events == all_events
+    protect_client.api_request_list.assert_called_once()
+
+
+@pytest.mark.asyncio()
+async def test_iter_events_raw_manual_paginate(protect_client: ProtectApiClient):
+    end = datetime(2024, 1, 1, tzinfo=UTC)
+    start = end - timedelta(seconds=450)
+    all_events = _paged_events(1000, to_js_time(end))
+
+    async def _list(url: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        offset = params["offset"]
+        return all_events[offset : offset + params["limit"]]
+
+    protect_client.api_request_list = AsyncMock(side_effect=_list)  # type: ignore[method-assign]
+
+    streamed = [
+        event
+        async for event in protect_client.iter_events_raw(
+            start=start, end=end, sorting="desc", offset=150, limit=120
+        )
+    ]
+    assert streamed == all_events[150:270]
+
+    streamed = [
+        event
+        async for event in protect_client.iter_events_raw(
+            start=start, end=end, offset=5, limit=3
+        )
+    ]
+    assert streamed == await protect_client.get_events_raw(
+        start=start, end=end, offset=5, limit=3
+    )
+
+
+@pytest.mark.asyncio()
+async def test_iter_events_raw_manual_paginate_asc_windows(
+    protect_client: ProtectApiClient,
+):
+    end = datetime(2024, 1, 1, tzinfo=UTC)
+    start = end - timedelta(seconds=450)
+    all_events = _paged_events(1000, to_js_time(end) + 50_000)
+    expected = [e for e in reversed(all_events) if e["start"] >= to_js_time(start)]
+    expected = [e for e in expected if e["start"] <= to_js_time(end)]
+
+    async def _list(url: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        offset = params["offset"]
+        return all_events[offset : offset + params["limit"]]
+
+    protect_client.api_request_list = AsyncMock(side_effect=_list)  # type: ignore[method-assign]
+
+    with patch("uiprotect.api.EVENT_ASC_WINDOW", timedelta(seconds=100)):
+        streamed = [
+            event
+            async for event in protect_client.iter_events_raw(start=start, end=end)
+        ]
+        assert streamed == expected
+        windows = {
+            call.kwargs["params"]["start"]
+            for call in protect_client.api_request_list.call_args_list
+        }
+        assert len(windows) == 5
+
+        # the newer windows are never walked once the limit is reached
+        protect_client.api_request_list.reset_mock()
+        streamed = [
+            event
+            async for event in protect_client.iter_events_raw(
+                start=start, end=end, offset=5, limit=3
+            )
+        ]
+        assert streamed == expected[5:8]
+        assert {
+            call.kwargs["params"]["start"]
+            for call in protect_client.api_request_list.call_args_list
+        } == {to_js_time(start)}
+
+
+@pytest.mark.asyncio()
+async def test_iter_events_raw_pages_server_side(protect_client: ProtectApiClient):
+    all_events = _paged_events(250, 1_700_000_000_000)
+
+    async def _list(url: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        assert params["types"] == ["motion"]
+        offset = params["offset"]
+        return all_events[offset : offset + params["limit"]]
+
+    protect_client.api_request_list = AsyncMock(side_effect=_list)  # type: ignore[method-assign]
+
+    stream = protect_client.iter_events_raw(types=[EventType.MOTION], offset=20)
+    assert await anext(stream) == all_events[20]
+    # only the first page has been requested so far
+    assert protect_client.api_request_list.call_count == 1
+    rest = [event async for event in stream]
+    assert rest == all_events[21:]
+    assert [
+        call.kwargs["params"]["offset"]
+        for call in protect_client.api_request_list.call_args_list
+    ] == [20, 120, 220]
+
+    protect_client.api_request_list.reset_mock()
+    streamed = [
+        event
+        async for event in protect_client.iter_events_raw(
+            types=[EventType.MOTION], limit=130
+        )
+    ]
+    assert streamed == all_events[:130]
+    assert [
+        call.kwargs["params"]["limit"]
+        for call in protect_client.api_request_list.call_args_list
+    ] == [100, 30]
+
+
+@pytest.mark.asyncio()
+async def test_iter_events(protect_client: ProtectApiClient, raw_events):
+    protect_client._minimum_score = 50
+
+    expected = await protect_client.get_events(_allow_manual_paginate=False)
+
+    async def _list(url: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        offset = params["offset"]
+        return raw_events[offset : offset + params["limit"]]
+
+    protect_client.api_request_list = AsyncMock(side_effect=_list)  # type: ignore[method-assign]
+    events = [
+        event
+        async for event in protect_client.iter_events(_allow_manual_paginate=False)
+    ]
+
+    assert [event.id for event in events] == [event.id for event in expected]
+
+
 @pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
 @pytest.mark.asyncio()
 async def test_get_device_mismatch(protect_client: ProtectApiClient, camera):
@@ -1104,6 +1399,87 @@ async def test_get_package_camera_snapshot_args(protect_client: ProtectApiClient
     assert img.format in {"PNG", "JPEG"}
 
 
+@pytest.mark.asyncio()
+async def test_get_camera_snapshot_max_age(protect_client: ProtectApiClient):
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    protect_client.api_request_raw = AsyncMock(  # type: ignore[method-assign]
+        side_effect=[b"zero", b"one", b"two", b"three", b"four", b"five"]
+    )
+    # caching is opt-in
+    assert await protect_client.get_camera_snapshot(camera.id, max_age=5) == b"zero"
+    assert len(protect_client._snapshot_cache) == 0
+    protect_client._snapshot_cache = SnapshotCache(max_bytes=1024)
+
+    assert await protect_client.get_camera_snapshot(camera.id, max_age=5) == b"one"
+    assert await protect_client.get_camera_snapshot(camera.id, max_age=5) == b"one"
+    # other sizes and lenses are cached separately
+    assert await protect_client.get_camera_snapshot(camera.id, 640, max_age=5) == b"two"
+    assert (
+        await protect_client.get_package_camera_snapshot(camera.id, max_age=5)
+        == b"three"
+    )
+    # without max_age a new snapshot is fetched and cached
+    assert await protect_client.get_camera_snapshot(camera.id) == b"four"
+    assert await protect_client.get_camera_snapshot(camera.id, max_age=5) == b"four"
+    assert protect_client.api_request_raw.call_count == 5
+
+    protect_client._invalidate_snapshots(
+        WSSubscriptionMessage(
+            action=WSAction.UPDATE,
+            new_update_id="update",
+            changed_data={"is_motion_detected": True},
+            new_obj=camera,
+        )
+    )
+    assert await protect_client.get_camera_snapshot(camera.id, max_age=5) == b"five"
+    assert protect_client.snapshot_cache_stats() == {
+        "hits": 2,
+        "misses": 4,
+        "evictions": 0,
+        "entries": 1,
+        "bytes": 4,
+    }
+
+
+@pytest.mark.asyncio()
+async def test_get_camera_snapshot_max_age_skips_stale(
+    protect_client: ProtectApiClient, now
+):
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    protect_client._snapshot_cache = SnapshotCache(max_bytes=1024)
+
+    async def _fetch(*args: Any, **kwargs: Any) -> bytes:
+        # motion detected while the snapshot was being taken
+        protect_client._snapshot_cache.invalidate(camera.id)
+        return b"before"
+
+    protect_client.api_request_raw = AsyncMock(side_effect=_fetch)  # type: ignore[method-assign]
+
+    await protect_client.get_camera_snapshot(camera.id, max_age=5)
+    await protect_client.get_camera_snapshot(camera.id, max_age=5)
+    await protect_client.get_camera_snapshot(camera.id, dt=now, max_age=5)
+
+    assert protect_client.api_request_raw.call_count == 3
+    assert len(protect_client._snapshot_cache) == 0
+
+
+def test_snapshot_cache_lru_eviction():
+    cache = SnapshotCache(max_bytes=10)
+    cache.put("a", 1, b"1234", 0)
+    cache.put("b", 1, b"1234", 0)
+    assert cache.get("a", 1, 60) == b"1234"
+    cache.put("c", 1, b"1234", 0)
+    assert cache.get("b", 1, 60) is None
+    assert cache.get("a", 1, 60) == b"1234"
+    # larger than the whole cache
+    cache.put("d", 1, b"x" * 11, 0)
+    assert cache.get("d", 1, 60) is None
+    assert cache.get("a", 1, -1) is None
+
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 3, 1)
+    assert (len(cache), cache.nbytes) == (2, 8)
+
+
 @pytest.mark.skipif(not TEST_VIDEO_EXISTS, reason="Missing testdata")
 @patch("uiprotect.api.datetime", MockDatetime)
 @patch("uiprotect.api.time.time", get_time)
@@ -1133,6 +1509,210 @@ async def test_get_camera_video(protect_client: ProtectApiClient, now, tmp_path:
     )
 
 
+def _write_test_mp4(path: Path, frames: int) -> None:
+    with av.open(str(path), "w", format="mp4") as container:
+        stream = container.add_stream("mpeg4", rate=10)
+        stream.width = 64
+        stream.height = 48
+        stream.pix_fmt = "yuv420p"
+        for index in range(frames):
+            frame = av.VideoFrame(64, 48, "yuv420p")
+            for plane in frame.planes:
+                plane.update(bytes(plane.buffer_size))
+            frame.pts = index
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+
+def _read_test_mp4(path: Path) -> tuple[int, float]:
+    with av.open(str(path)) as container:
+        frames = sum(1 for _ in container.decode(video=0))
+        return frames, container.duration / av.time_base
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("fragmented", [False, True])
+async def test_export_camera_video(
+    protect_client: ProtectApiClient, now: datetime, tmp_path: Path, fragmented: bool
+) -> None:
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    segment = tmp_path / "segment.mp4"
+    await asyncio.to_thread(_write_test_mp4, segment, 20)
+    data = await asyncio.to_thread(segment.read_bytes)
+    calls: list[tuple[datetime, datetime]] = []
+    failed: set[datetime] = set()
+
+    async def _get_camera_video(
+        camera_id: str,
+        start: datetime,
+        end: datetime,
+        channel_index: int,
+        *,
+        output_file: Path,
+        iterator_callback: Any,
+        progress_callback: Any,
+        **kwargs: Any,
+    ) -> None:
+        calls.append((start, end))
+        await progress_callback(len(data), len(data), len(data))
+        if start == now - timedelta(minutes=5) and start not in failed:
+            failed.add(start)
+            raise NvrError("connection dropped")
+        await iterator_callback(len(data), data)
+        await async_write_bytes(output_file, data)
+
+    protect_client.get_camera_video = AsyncMock(side_effect=_get_camera_video)  # type: ignore[method-assign]
+    progress = AsyncMock()
+    output = tmp_path / "export.mp4"
+
+    with patch("uiprotect.api.calculate_retry_delay", return_value=0):
+        await protect_client.export_camera_video(
+            camera.id,
+            now - timedelta(minutes=25),
+            now + timedelta(minutes=5),
+            output,
+            segment_length=timedelta(minutes=10),
+            max_concurrency=2,
+            fragmented=fragmented,
+            progress_callback=progress,
+        )
+
+    assert sorted(calls) == [
+        (now - timedelta(minutes=25), now - timedelta(minutes=15)),
+        (now - timedelta(minutes=15), now - timedelta(minutes=5)),
+        (now - timedelta(minutes=5), now + timedelta(minutes=5)),
+        (now - timedelta(minutes=5), now + timedelta(minutes=5)),
+    ]
+    assert progress.await_args.args == (len(data), 3 * len(data), 0)
+    frames, duration = await asyncio.to_thread(_read_test_mp4, output)
+    assert frames == 60
+    assert duration == pytest.approx(6, abs=0.2)
+    # the downloaded segments are removed
+    assert sorted(await asyncio.to_thread(lambda: list(tmp_path.iterdir()))) == [
+        output,
+        segment,
+    ]
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("length", [timedelta(0), timedelta(seconds=-1)])
+async def test_export_camera_video_empty_range(
+    protect_client: ProtectApiClient, now: datetime, tmp_path: Path, length: timedelta
+) -> None:
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    output = tmp_path / "export.mp4"
+    protect_client.get_camera_video = AsyncMock()  # type: ignore[method-assign]
+
+    with pytest.raises(BadRequest, match="not after its start"):
+        await protect_client.export_camera_video(camera.id, now, now + length, output)
+
+    protect_client.get_camera_video.assert_not_called()
+    assert await asyncio.to_thread(sorted, tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio()
+async def test_export_camera_video_resume(
+    protect_client: ProtectApiClient, now: datetime, tmp_path: Path
+) -> None:
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    segment = tmp_path / "segment.mp4"
+    await asyncio.to_thread(_write_test_mp4, segment, 20)
+    data = await asyncio.to_thread(segment.read_bytes)
+    calls: list[datetime] = []
+    down = True
+
+    async def _get_camera_video(
+        camera_id: str,
+        start: datetime,
+        end: datetime,
+        channel_index: int,
+        *,
+        output_file: Path,
+        iterator_callback: Any,
+        **kwargs: Any,
+    ) -> None:
+        calls.append(start)
+        if down and start == now - timedelta(minutes=10):
+            raise NvrError("down")
+        await iterator_callback(len(data), data)
+        await async_write_bytes(output_file, data)
+
+    protect_client.get_camera_video = AsyncMock(side_effect=_get_camera_video)  # type: ignore[method-assign]
+    output = tmp_path / "export.mp4"
+    sidecar = tmp_path / "export.mp4.export.json"
+    parts = tmp_path / ".export.mp4.parts"
+    export = partial(
+        protect_client.export_camera_video,
+        camera.id,
+        now - timedelta(minutes=30),
+        now,
+        output,
+        max_concurrency=1,
+        retries=0,
+    )
+
+    with pytest.raises(NvrError):
+        await export()
+
+    # the completed segments and their checksums are kept for the next run
+    assert calls == [
+        now - timedelta(minutes=30),
+        now - timedelta(minutes=20),
+        now - timedelta(minutes=10),
+    ]
+    assert not await asyncio.to_thread(output.exists)
+    state = orjson.loads(await asyncio.to_thread(sidecar.read_bytes))
+    assert [s["start"] for s in state["segments"]] == [
+        to_js_time(now - timedelta(minutes=30)),
+        to_js_time(now - timedelta(minutes=20)),
+    ]
+    assert state["segments"][0]["bytes"] == len(data)
+    # a segment changed on disk is downloaded again
+    await async_write_bytes(parts / "00001.mp4", data[:-1] + bytes([data[-1] ^ 0xFF]))
+
+    calls.clear()
+    down = False
+    await export()
+
+    assert sorted(calls) == [now - timedelta(minutes=20), now - timedelta(minutes=10)]
+    frames, _ = await asyncio.to_thread(_read_test_mp4, output)
+    assert frames == 60
+    assert sorted(await asyncio.to_thread(lambda: list(tmp_path.iterdir()))) == [
+        output,
+        segment,
+    ]
+
+    # without resume, everything is downloaded again
+    calls.clear()
+    await async_write_bytes(sidecar, b"not json")
+    await export(resume=False)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio()
+async def test_export_camera_video_close_error_keeps_original(
+    protect_client: ProtectApiClient, now: datetime, tmp_path: Path
+) -> None:
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    protect_client.get_camera_video = AsyncMock(side_effect=NvrError("down"))  # type: ignore[method-assign]
+    output = tmp_path / "export.mp4"
+
+    with (
+        patch(
+            "uiprotect.api.Mp4Concatenator.close",
+            side_effect=StreamError("no packets"),
+        ),
+        pytest.raises(NvrError, match="down"),
+    ):
+        await protect_client.export_camera_video(
+            camera.id, now - timedelta(minutes=5), now, output, retries=0
+        )
+
+    assert not await asyncio.to_thread(output.exists)
+
+
 @pytest.mark.asyncio()
 async def test_get_camera_video_http_error(
     protect_client: ProtectApiClient, now: datetime
@@ -1215,6 +1795,101 @@ async def test_get_camera_video_logging(
     )
 
 
+def _media_response(status: int, chunks: list[bytes], content_type: str) -> Mock:
+    async def iter_chunked(chunk_size: int):
+        for chunk in chunks:
+            yield chunk
+
+    response = Mock(status=status, content_type=content_type)
+    response.content_length = sum(len(chunk) for chunk in chunks)
+    response.content.iter_chunked = iter_chunked
+    return response
+
+
+@pytest.mark.asyncio()
+async def test_stream_camera_video(
+    protect_client: ProtectApiClient, now: datetime
+) -> None:
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    start = now - timedelta(seconds=CONSTANTS["camera_video_length"])
+    response = _media_response(200, [b"a" * 10, b"b" * 30], "video/mp4")
+    protect_client.request = AsyncMock(return_value=response)  # type: ignore[method-assign]
+
+    async with protect_client.stream_camera_video(camera.id, start, now) as stream:
+        assert stream.content_type == "video/mp4"
+        assert stream.content_length == 40
+        assert stream.progress == 0
+        chunks = [chunk async for chunk in stream]
+        assert stream.bytes_read == 40
+        assert stream.progress == 1
+        response.close.assert_not_called()
+
+    assert chunks == [b"a" * 10, b"b" * 30]
+    response.close.assert_called_once()
+    protect_client.request.assert_called_once_with(
+        "get",
+        f"{protect_client.private_api_path}video/export",
+        require_auth=True,
+        auto_close=False,
+        timeout=0,
+        params={
+            "camera": camera.id,
+            "start": to_js_time(start),
+            "end": to_js_time(now),
+            "channel": 0,
+        },
+    )
+
+
+@pytest.mark.asyncio()
+async def test_stream_event_thumbnail_retries(
+    protect_client: ProtectApiClient,
+) -> None:
+    missing = _media_response(404, [], "text/plain")
+    found = _media_response(200, [b"jpeg"], "image/jpeg")
+    protect_client.request = AsyncMock(side_effect=[missing, found])  # type: ignore[method-assign]
+
+    with patch("uiprotect.api.asyncio.sleep", AsyncMock()) as sleep:
+        async with protect_client.stream_event_thumbnail("e-test_id", 640) as stream:
+            assert await stream.read() == b"jpeg"
+
+    sleep.assert_called_once_with(0.5)
+    missing.close.assert_called_once()
+    found.close.assert_called_once()
+    assert protect_client.request.call_args.args[1].endswith("events/test_id/thumbnail")
+    assert protect_client.request.call_args.kwargs["params"] == {"w": 640}
+
+
+@pytest.mark.asyncio()
+async def test_stream_event_heatmap_timeout(
+    protect_client: ProtectApiClient,
+) -> None:
+    missing = _media_response(404, [], "text/plain")
+    protect_client.request = AsyncMock(return_value=missing)  # type: ignore[method-assign]
+
+    with (
+        patch("uiprotect.api.get_response_reason", AsyncMock(return_value="")),
+        pytest.raises(BadRequest),
+    ):
+        async with protect_client.stream_event_heatmap("e-test_id", retry_timeout=0):
+            pass
+
+    missing.close.assert_called_once()
+
+
+@pytest.mark.asyncio()
+async def test_stream_event_video_not_ended(
+    protect_client: ProtectApiClient, now: datetime
+) -> None:
+    protect_client.get_event = AsyncMock(  # type: ignore[method-assign]
+        return_value=Mock(camera_id="camera", start=now, end=None)
+    )
+    with pytest.raises(BadRequest, match="has not ended"):
+        async with protect_client.stream_event_video("missing_event"):
+            pass
+    protect_client.get_event.assert_called_once_with("missing_event")
+
+
 @pytest.mark.skipif(not TEST_THUMBNAIL_EXISTS, reason="Missing testdata")
 @pytest.mark.asyncio()
 async def test_get_event_thumbnail(protect_client: ProtectApiClient):
@@ -1644,6 +2319,118 @@ async def test_api_request_raw_with_default_api_path() -> None:
     )
 
 
+@pytest.mark.asyncio()
+async def test_api_request_raw_single_flight() -> None:
+    """Test concurrent identical GETs share one request"""
+    client = ProtectApiClient(
+        "127.0.0.1",
+        0,
+        "test",
+        "test",
+        verify_ssl=False,
+    )
+
+    release = asyncio.Event()
+
+    async def _read() -> bytes:
+        await release.wait()
+        return b"snapshot"
+
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.read = _read
+    mock_response.release = Mock()
+    client.request = AsyncMock(return_value=mock_response)
+
+    params = {"w": 640, "h": 360}
+    first = asyncio.create_task(client.api_request_raw("cameras/a", params=params))
+    second = asyncio.create_task(
+        client.api_request_raw("cameras/a", params={"h": 360, "w": 640})
+    )
+    other = asyncio.create_task(client.api_request_raw("cameras/b", params=params))
+    # a cancelled caller does not cancel the shared request
+    cancelled = asyncio.create_task(client.api_request_raw("cameras/a", params=params))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+
+    assert await first == b"snapshot"
+    assert await second == b"snapshot"
+    assert await other == b"snapshot"
+    assert client.request.call_count == 2
+    assert not client._inflight_gets
+
+    # sequential requests are not cached
+    assert await client.api_request_raw("cameras/a", params=params) == b"snapshot"
+    assert client.request.call_count == 3
+
+
+@pytest.mark.asyncio()
+async def test_api_request_raw_single_flight_not_shared() -> None:
+    """Test writes and non-idempotent GETs are never shared"""
+    client = ProtectApiClient(
+        "127.0.0.1",
+        0,
+        "test",
+        "test",
+        verify_ssl=False,
+    )
+
+    release = asyncio.Event()
+
+    async def _read() -> bytes:
+        await release.wait()
+        return b"{}"
+
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.read = _read
+    mock_response.release = Mock()
+    client.request = AsyncMock(return_value=mock_response)
+
+    before_write = asyncio.create_task(client.api_request_raw("cameras/a"))
+    await asyncio.sleep(0)
+    write = asyncio.create_task(
+        client.api_request_raw("cameras/a", method="patch", json={"name": "a"})
+    )
+    await asyncio.sleep(0)
+    # started after the write, so it must not reuse the earlier GET
+    after_write = asyncio.create_task(client.api_request_raw("cameras/a"))
+    with_timeout = asyncio.create_task(client.api_request_raw("cameras/a", timeout=5))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(before_write, write, after_write, with_timeout)
+
+    assert client.request.call_count == 4
+
+
+@pytest.mark.asyncio()
+async def test_api_request_raw_single_flight_error() -> None:
+    """Test every caller of a shared request gets its error"""
+    client = ProtectApiClient(
+        "127.0.0.1",
+        0,
+        "test",
+        "test",
+        verify_ssl=False,
+    )
+
+    async def _request(*args: Any, **kwargs: Any) -> None:
+        await asyncio.sleep(0)
+        raise NvrError("down")
+
+    client.request = AsyncMock(side_effect=_request)
+
+    results = await asyncio.gather(
+        client.api_request_raw("events/a"),
+        client.api_request_raw("events/a"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, NvrError) for result in results)
+    assert client.request.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_read_auth_config_file_not_found():
     client = ProtectApiClient(
@@ -4880,6 +5667,7 @@ async def test_ptz_public_api(
         url=f"/v1/cameras/camera123{expected_path}",
         method="post",
         public_api=True,
+        priority=RequestPriority.INTERACTIVE,
     )
 
 
@@ -4906,4 +5694,108 @@ async def test_create_talkback_session_public(protect_client: ProtectApiClient):
         url="/v1/cameras/camera123/talkback-session",
         method="post",
         public_api=True,
+        priority=RequestPriority.INTERACTIVE,
+    )
+
+
+@pytest.mark.asyncio()
+async def test_batch_update(protect_client: ProtectApiClient):
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    light = next(iter(protect_client.bootstrap.lights.values()))
+    camera.mic_volume = 0
+    camera.recording_settings.enable_motion_detection = False
+    light.light_device_settings.is_indicator_enabled = False
+    protect_client.api_request.reset_mock()  # type: ignore[attr-defined]
+
+    async with protect_client.batch_update(max_concurrency=1) as batch:
+        await camera.set_mic_volume(50)
+        await camera.set_motion_detection(True)
+        await light.set_status_light(True)
+        assert len(batch) == 2
+        assert not protect_client.api_request.called  # type: ignore[attr-defined]
+
+    assert batch.result is not None
+    assert batch.result.ok
+    assert sorted(batch.result.updated) == sorted([camera.id, light.id])
+    assert protect_client.api_request.call_count == 2  # type: ignore[attr-defined]
+    protect_client.api_request.assert_any_call(  # type: ignore[attr-defined]
+        f"cameras/{camera.id}",
+        method="patch",
+        json={"recordingSettings": {"enableMotionDetection": True}, "micVolume": 50},
+    )
+    protect_client.api_request.assert_any_call(  # type: ignore[attr-defined]
+        f"lights/{light.id}",
+        method="patch",
+        json={"lightDeviceSettings": {"isIndicatorEnabled": True}},
+    )
+
+
+@pytest.mark.asyncio()
+async def test_batch_update_errors(protect_client: ProtectApiClient):
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    light = next(iter(protect_client.bootstrap.lights.values()))
+    camera.mic_volume = 0
+    light.light_device_settings.is_indicator_enabled = False
+
+    async def api_request(url: str, *args: Any, **kwargs: Any) -> None:
+        if url.startswith("cameras/"):
+            raise BadRequest("failed")
+
+    protect_client.api_request = AsyncMock(side_effect=api_request)  # type: ignore[method-assign]
+
+    async with protect_client.batch_update() as batch:
+        await camera.set_mic_volume(50)
+        await light.set_status_light(True)
+
+    result = batch.result
+    assert result is not None
+    assert not result.ok
+    assert result.updated == [light.id]
+    assert isinstance(result.errors[camera.id], BadRequest)
+    # only the failed device is reverted
+    assert camera.mic_volume == 0
+    assert light.light_device_settings.is_indicator_enabled is True
+
+
+@pytest.mark.asyncio()
+async def test_batch_update_not_committed_on_error(protect_client: ProtectApiClient):
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    camera.mic_volume = 0
+    protect_client.api_request.reset_mock()  # type: ignore[attr-defined]
+
+    with pytest.raises(ValueError, match="abort"):
+        async with protect_client.batch_update() as batch:
+            await camera.set_mic_volume(50)
+            raise ValueError("abort")
+
+    assert batch.result is None
+    assert camera.mic_volume == 0
+    assert not protect_client.api_request.called  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio()
+async def test_batch_update_spawned_task_after_commit(
+    protect_client: ProtectApiClient,
+):
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    camera.mic_volume = 0
+    protect_client.api_request.reset_mock()  # type: ignore[attr-defined]
+    committed = asyncio.Event()
+
+    async def _set_later() -> None:
+        await committed.wait()
+        await camera.set_mic_volume(50)
+
+    async with protect_client.batch_update() as batch:
+        # the task inherits the batch context, but outlives the batch
+        task = asyncio.create_task(_set_later())
+    assert batch.closed
+    committed.set()
+    await task
+
+    assert batch.result is not None
+    assert batch.result.updated == []
+    assert camera.mic_volume == 50
+    protect_client.api_request.assert_called_once_with(  # type: ignore[attr-defined]
+        f"cameras/{camera.id}", method="patch", json={"micVolume": 50}
     )
@@ -2,19 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 from datetime import timedelta
 from typing import TYPE_CHECKING
-from unittest.mock import patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from tests.conftest import MockDatetime
-from uiprotect.data import Camera, EventType
-from uiprotect.utils import to_js_time
+from uiprotect.data import Bootstrap, Camera, Event, EventType
+from uiprotect.exceptions import NvrError
+from uiprotect.utils import to_js_time, utc_now
+from uiprotect.websocket import WebsocketState
 
 from .common import assert_equal_dump
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from uiprotect import ProtectApiClient
 
 
@@ -217,3 +223,110 @@ async def test_event_return_none(protect_client: ProtectApiClient, now, camera):
     assert camera.last_nfc_card_scanned_event is None
     assert camera.last_motion_event is None
     assert camera.last_fingerprint_identified_event is None
+
+
+def _raw_event(camera_id: str, event_id: str, start, end) -> dict:
+    return {
+        "id": event_id,
+        "type": "motion",
+        "start": to_js_time(start),
+        "end": to_js_time(end),
+        "score": 0,
+        "smartDetectTypes": [],
+        "smartDetectEvents": [],
+        "camera": camera_id,
+        "partition": None,
+        "user": None,
+        "metadata": {},
+        "thumbnail": f"e-{event_id}",
+        "heatmap": f"e-{event_id}",
+        "modelKey": "event",
+    }
+
+
+@pytest.mark.asyncio()
+async def test_poll_events_incremental(protect_client: ProtectApiClient, camera):
+    now = utc_now()
+    closed = _raw_event(camera["id"], "closed", now - timedelta(seconds=5), now)
+    still_open = _raw_event(camera["id"], "open", now - timedelta(seconds=5), None)
+    responses = [[closed, still_open], [closed]]
+
+    async def get_events(*args, **kwargs):
+        return responses.pop(0)
+
+    protect_client.get_events_raw = get_events  # type: ignore[method-assign]
+    protect_client.get_event = AsyncMock(  # type: ignore[method-assign]
+        return_value=Event.from_unifi_dict(
+            **{**still_open, "end": to_js_time(now)}, api=protect_client
+        )
+    )
+
+    with patch.object(Bootstrap, "process_event", autospec=True) as process_event:
+        await protect_client.poll_events()
+        assert [c.args[1].id for c in process_event.call_args_list] == [
+            "closed",
+            "open",
+        ]
+        assert protect_client._poll_events_index["open"] is None
+
+        process_event.reset_mock()
+        await protect_client.poll_events()
+        # the closed event is skipped, the open one is re-fetched by id
+        assert [c.args[1].id for c in process_event.call_args_list] == ["open"]
+        protect_client.get_event.assert_called_once_with("open")
+
+    assert protect_client._poll_events_index == {}
+
+
+@pytest.mark.asyncio()
+async def test_poll_events_persisted_cursor(
+    protect_client: ProtectApiClient, camera, tmp_path: Path
+):
+    protect_client.store_sessions = True
+    protect_client.cache_dir = tmp_path
+    now = utc_now()
+    still_open = _raw_event(camera["id"], "open", now - timedelta(seconds=5), None)
+
+    async def get_events(*args, **kwargs):
+        return [still_open]
+
+    protect_client.get_events_raw = get_events  # type: ignore[method-assign]
+    await protect_client.poll_events()
+    cursor = protect_client._last_update_dt
+
+    protect_client._last_update_dt = None
+    protect_client._poll_events_index = {}
+    protect_client.get_events = AsyncMock(return_value=[])  # type: ignore[method-assign]
+    protect_client.get_event = AsyncMock(side_effect=NvrError("gone"))  # type: ignore[method-assign]
+    await protect_client.poll_events()
+
+    start = protect_client.get_events.call_args.kwargs["start"]
+    assert to_js_time(start) == to_js_time(cursor)
+    protect_client.get_event.assert_called_once_with("open")
+    assert protect_client._poll_events_index == {}
+
+
+@pytest.mark.asyncio()
+async def test_poll_events_fallback_when_ws_down(protect_client: ProtectApiClient):
+    protect_client._poll_events_fallback_interval = 60
+    protect_client.poll_events = AsyncMock()  # type: ignore[method-assign]
+    websocket = Mock(is_running=True)
+    protect_client._private_websocket = websocket
+
+    protect_client._on_websocket_state_change(WebsocketState.DISCONNECTED)
+    task = protect_client._poll_events_fallback_task
+    assert task is not None
+    await asyncio.sleep(0)
+    protect_client.poll_events.assert_called_once()
+
+    protect_client._on_websocket_state_change(WebsocketState.CONNECTED)
+    assert protect_client._poll_events_fallback_task is None
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+    assert task.cancelled()
+
+    # a deliberate disconnect does not start polling
+    websocket.is_running = False
+    protect_client._on_websocket_state_change(WebsocketState.DISCONNECTED)
+    assert protect_client._poll_events_fallback_task is None
+    protect_client._private_websocket = None
@@ -22,6 +22,7 @@ from tests.conftest import (
     MockDatetime,
     MockWebsocket,
 )
+from uiprotect._ws_coalesce import WSUpdateCoalescer
 from uiprotect.data import EventType, WSPacket
 from uiprotect.data.base import ProtectModel
 from uiprotect.data.devices import EVENT_PING_INTERVAL, Camera
@@ -1780,3 +1781,328 @@ async def test_refresh_device_catches_data_decode_error(
 
     # Should not raise — DataDecodeError is caught and logged as warning
     await protect_client.bootstrap.refresh_device(ModelType.SCHEDULE, "some-id")
+
+
+@pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
+@pytest.mark.asyncio()
+async def test_ws_update_old_obj_copy_on_write(
+    protect_client_no_debug: ProtectApiClient,
+    camera,
+    packet: WSPacket,
+):
+    """old_obj is built on access and keeps the pre-update state across later updates."""
+    protect_client = protect_client_no_debug
+    camera_obj = protect_client.bootstrap.cameras[camera["id"]]
+    camera_obj.is_motion_detected = False
+    camera_obj.is_dark = False
+
+    first = _send_ws_packet(
+        protect_client,
+        packet,
+        "update",
+        "camera",
+        camera["id"],
+        {"isMotionDetected": True},
+    )
+    assert len(first) == 1
+    assert first[0].new_obj is camera_obj
+    assert first[0]._old_obj_snapshot is not None  # type: ignore[attr-defined]
+
+    # a second update to the same camera copies the pending old_obj first
+    second = _send_ws_packet(
+        protect_client,
+        packet,
+        "update",
+        "camera",
+        camera["id"],
+        {"isDark": True},
+    )
+    assert len(second) == 1
+
+    old_obj = first[0].old_obj
+    assert isinstance(old_obj, Camera)
+    assert old_obj is not camera_obj
+    assert old_obj.is_motion_detected is False
+    assert old_obj.is_dark is False
+    assert first[0].old_obj is old_obj
+
+    second_old_obj = second[0].old_obj
+    assert isinstance(second_old_obj, Camera)
+    assert second_old_obj.is_motion_detected is True
+    assert second_old_obj.is_dark is False
+    assert camera_obj.is_motion_detected is True
+    assert camera_obj.is_dark is True
+
+
+@pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
+@pytest.mark.asyncio()
+async def test_ws_update_old_obj_not_copied_when_unused(
+    protect_client_no_debug: ProtectApiClient,
+    camera,
+    packet: WSPacket,
+):
+    """Snapshots of dropped messages are released without copying the object."""
+    protect_client = protect_client_no_debug
+    bootstrap = protect_client.bootstrap
+
+    with patch.object(Camera, "model_copy") as mock_copy:
+        messages = _send_ws_packet(
+            protect_client,
+            packet,
+            "update",
+            "camera",
+            camera["id"],
+            {"isMotionDetected": True},
+        )
+        assert len(messages) == 1
+        messages.clear()
+
+        assert camera["id"] not in bootstrap._old_obj_snapshots
+        mock_copy.assert_not_called()
+
+
+@pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
+@pytest.mark.asyncio()
+@pytest.mark.parametrize(
+    ("models", "model_key", "known_id"),
+    [
+        ({ModelType.LIGHT}, "camera", True),
+        (None, "camera", False),
+        (None, "event", False),
+        (None, "nvr", False),
+        (None, "notAModel", True),
+    ],
+)
+async def test_ws_packet_filtered_before_data_frame(
+    protect_client_no_debug: ProtectApiClient,
+    camera,
+    packet: WSPacket,
+    *,
+    models: set[ModelType] | None,
+    model_key: str,
+    known_id: bool,
+):
+    """Packets dropped by the action frame alone never decode the data frame."""
+    bootstrap = protect_client_no_debug.bootstrap
+    bootstrap.capture_ws_stats = False
+    action_frame: WSJSONPacketFrame = packet.action_frame  # type: ignore[assignment]
+    action_frame.data = {
+        "action": "update",
+        "newUpdateId": "0441ecc6-f0fa-4b19-b071-7987c143138a",
+        "modelKey": model_key,
+        "id": camera["id"] if known_id else "not-a-known-id",
+    }
+    data_frame: WSJSONPacketFrame = packet.data_frame  # type: ignore[assignment]
+    data_frame.data = {"isMotionDetected": True}
+    new_packet = WSPacket(packet.pack_frames())
+
+    assert bootstrap.process_ws_packet(new_packet, models) is None
+    assert new_packet._data_frame is None
+    assert bootstrap.last_update_id == "0441ecc6-f0fa-4b19-b071-7987c143138a"
+
+
+@pytest.mark.skipif(not TEST_CAMERA_EXISTS, reason="Missing testdata")
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("capture_ws_stats", [True, False])
+async def test_ws_stats_only_update_dropped(
+    protect_client_no_debug: ProtectApiClient,
+    camera,
+    packet: WSPacket,
+    capture_ws_stats: bool,
+):
+    """Updates with only ignorable stats keys are dropped before any model work."""
+    bootstrap = protect_client_no_debug.bootstrap
+    bootstrap.capture_ws_stats = capture_ws_stats
+    bootstrap.clear_ws_stats()
+    action_frame: WSJSONPacketFrame = packet.action_frame  # type: ignore[assignment]
+    action_frame.data = {
+        "action": "update",
+        "newUpdateId": "0441ecc6-f0fa-4b19-b071-7987c143138a",
+        "modelKey": "camera",
+        "id": camera["id"],
+    }
+    data_frame: WSJSONPacketFrame = packet.data_frame  # type: ignore[assignment]
+    data_frame.data = {"stats": {}, "upSince": 1, "lastMotion": 1, "guid": "x"}
+    stats_packet = WSPacket(packet.pack_frames())
+    data_frame.data = {"stats": {}, "isMotionDetected": True}
+    mixed_packet = WSPacket(packet.pack_frames())
+
+    with patch.object(
+        Camera, "unifi_dict_to_dict", side_effect=Camera.unifi_dict_to_dict
+    ) as mock_to_dict:
+        assert bootstrap.process_ws_packet(stats_packet, ignore_stats=True) is None
+        mock_to_dict.assert_not_called()
+        message = bootstrap.process_ws_packet(mixed_packet, ignore_stats=True)
+
+    assert message is not None
+    assert message.changed_data == {"is_motion_detected": True}
+    if capture_ws_stats:
+        assert [s.stats_only for s in bootstrap.ws_stats] == [True, False]
+        assert [s.filtered for s in bootstrap.ws_stats] == [True, False]
+    else:
+        assert bootstrap.ws_stats == []
+    bootstrap.capture_ws_stats = False
+
+
+@pytest.mark.asyncio()
+async def test_ws_subscribe_device(protect_client: ProtectApiClient):
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    light = next(iter(protect_client.bootstrap.lights.values()))
+    device_msgs: list[WSSubscriptionMessage] = []
+    motion_msgs: list[WSSubscriptionMessage] = []
+    light_msgs: list[WSSubscriptionMessage] = []
+
+    unsub_device = protect_client.subscribe_websocket_device(
+        device_msgs.append, ModelType.CAMERA, camera.id
+    )
+    unsub_motion = protect_client.subscribe_websocket_device(
+        motion_msgs.append, ModelType.CAMERA, fields=["is_motion_detected"]
+    )
+    unsub_light = protect_client.subscribe_websocket_device(
+        light_msgs.append, ModelType.LIGHT
+    )
+    assert protect_client._get_websocket().is_running
+
+    motion = WSSubscriptionMessage(
+        WSAction.UPDATE, "1", {"is_motion_detected": True}, camera, camera
+    )
+    rename = WSSubscriptionMessage(WSAction.UPDATE, "2", {"name": "x"}, camera, camera)
+    light_update = WSSubscriptionMessage(
+        WSAction.UPDATE, "3", {"name": "x"}, light, light
+    )
+    remove = WSSubscriptionMessage(WSAction.REMOVE, "4", {}, None, camera)
+    for msg in (motion, rename, light_update, remove):
+        protect_client.emit_message(msg)
+
+    assert device_msgs == [motion, rename, remove]
+    assert motion_msgs == [motion, remove]
+    assert light_msgs == [light_update]
+
+    unsub_device()
+    unsub_light()
+    assert protect_client._get_websocket().is_running
+    unsub_motion()
+    assert not protect_client._ws_router
+    assert not protect_client._get_websocket().is_running
+
+
+@pytest.mark.asyncio()
+async def test_ws_coalesce_updates(protect_client: ProtectApiClient):
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    light = next(iter(protect_client.bootstrap.lights.values()))
+    emitted: list[WSSubscriptionMessage] = []
+    coalescer = WSUpdateCoalescer(emitted.append, 60)
+
+    def update(obj: Any, update_id: str, **changed: Any) -> WSSubscriptionMessage:
+        return WSSubscriptionMessage(WSAction.UPDATE, update_id, changed, obj, obj)
+
+    coalescer.push(update(camera, "1", up_since=1))
+    coalescer.push(update(camera, "2", up_since=2, uptime=3))
+    coalescer.push(update(light, "3", uptime=4))
+    assert emitted == []
+    assert len(coalescer) == 2
+
+    # motion bypasses the window, merged with what is pending for the camera
+    coalescer.push(update(camera, "4", is_motion_detected=True))
+    assert [(m.new_update_id, m.changed_data) for m in emitted] == [
+        ("4", {"up_since": 2, "uptime": 3, "is_motion_detected": True})
+    ]
+
+    emitted.clear()
+    coalescer.push(update(camera, "5", uptime=5))
+    remove = WSSubscriptionMessage(WSAction.REMOVE, "6", {}, None, camera)
+    coalescer.push(remove)
+    assert [m.new_update_id for m in emitted] == ["5", "6"]
+
+    emitted.clear()
+    coalescer.flush()
+    assert [(m.new_update_id, m.changed_data) for m in emitted] == [
+        ("3", {"uptime": 4})
+    ]
+    assert len(coalescer) == 0
+
+
+@pytest.mark.asyncio()
+async def test_ws_coalesce_merges_nested_changes(protect_client: ProtectApiClient):
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    emitted: list[WSSubscriptionMessage] = []
+    coalescer = WSUpdateCoalescer(emitted.append, 60)
+
+    for update_id, changed in (
+        ("1", {"isp_settings": {"brightness": 40, "hdr_mode": "normal"}}),
+        ("2", {"isp_settings": {"contrast": 60}, "led_settings": {"is_enabled": 1}}),
+        ("3", {"isp_settings": {"brightness": 50}}),
+    ):
+        coalescer.push(
+            WSSubscriptionMessage(WSAction.UPDATE, update_id, changed, camera, camera)
+        )
+    coalescer.flush()
+
+    assert [(m.new_update_id, m.changed_data) for m in emitted] == [
+        (
+            "3",
+            {
+                "isp_settings": {
+                    "brightness": 50,
+                    "hdr_mode": "normal",
+                    "contrast": 60,
+                },
+                "led_settings": {"is_enabled": 1},
+            },
+        )
+    ]
+
+
+@pytest.mark.asyncio()
+async def test_ws_coalesce_window(protect_client: ProtectApiClient):
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    protect_client._ws_coalescer = WSUpdateCoalescer(protect_client.emit_message, 0.01)
+    messages: list[WSSubscriptionMessage] = []
+    unsub = protect_client.subscribe_websocket(messages.append)
+
+    for update_id in ("1", "2"):
+        protect_client._ws_coalescer.push(
+            WSSubscriptionMessage(
+                WSAction.UPDATE, update_id, {"uptime": update_id}, camera, camera
+            )
+        )
+    assert messages == []
+    await asyncio.sleep(0.05)
+
+    assert [(m.new_update_id, m.changed_data) for m in messages] == [
+        ("2", {"uptime": "2"})
+    ]
+    unsub()
+
+
+@pytest.mark.asyncio()
+async def test_ws_coalesce_flush_on_disconnect(protect_client: ProtectApiClient):
+    camera = next(iter(protect_client.bootstrap.cameras.values()))
+    protect_client._ws_coalescer = WSUpdateCoalescer(protect_client.emit_message, 60)
+    received: list[WSSubscriptionMessage | WebsocketState] = []
+    unsub = protect_client.subscribe_websocket(received.append)
+    unsub_state = protect_client.subscribe_websocket_state(received.append)
+
+    def update(update_id: str) -> WSSubscriptionMessage:
+        return WSSubscriptionMessage(
+            WSAction.UPDATE, update_id, {"uptime": update_id}, camera, camera
+        )
+
+    protect_client._ws_coalescer.push(update("1"))
+    protect_client._on_websocket_state_change(WebsocketState.CONNECTED)
+    assert received == [WebsocketState.CONNECTED]
+
+    protect_client._on_websocket_state_change(WebsocketState.DISCONNECTED)
+    assert [getattr(m, "new_update_id", m) for m in received[1:]] == [
+        "1",
+        WebsocketState.DISCONNECTED,
+    ]
+    assert protect_client._ws_coalescer._timer is None
+
+    received.clear()
+    protect_client._ws_coalescer.push(update("2"))
+    await protect_client.close_session()
+    assert [getattr(m, "new_update_id", m) for m in received] == ["2"]
+    assert len(protect_client._ws_coalescer) == 0
+    unsub()
+    unsub_state()
@@ -0,0 +1,181 @@
+"""Tests for event ingestion in the backup CLI."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tests.conftest import async_write_bytes
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+from aiofiles import os as aos
+from sqlalchemy import select
+
+from uiprotect import data as d
+from uiprotect.cli.backup import (
+    BackupContext,
+    Event,
+    EventFileKind,
+    EventSmartType,
+    _index_file,
+    _is_verified,
+    _reindex,
+    _update_events,
+    _upsert_events,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture()
+def ctx(tmp_path: Path) -> BackupContext:
+    context = BackupContext(
+        protect=MagicMock(),
+        start=_START,
+        end=_START + timedelta(hours=1),
+        output_format=MagicMock(),
+        output=tmp_path,
+        separator="-",
+        thumbnail_format="",
+        gif_format="",
+        event_format="",
+        title_format="",
+        max_download=1,
+        page_size=1,
+        length_cutoff=None,  # type: ignore[arg-type]
+    )
+    # the engine resolves the database path, which blocks; create it here
+    # outside of the event loop
+    assert context.db_engine is not None
+    return context
+
+
+def _api_event(
+    event_id: str,
+    minutes: int,
+    smart_types: list[d.SmartDetectObjectType] | None = None,
+) -> MagicMock:
+    event = MagicMock()
+    event.id = event_id
+    event.start = _START + timedelta(minutes=minutes)
+    event.end = event.start + timedelta(seconds=30)
+    event.camera.mac = "aabbccddeeff"
+    event.type = d.EventType.SMART_DETECT if smart_types else d.EventType.MOTION
+    event.smart_detect_types = smart_types or []
+    return event
+
+
+async def _smart_types(ctx: BackupContext) -> set[tuple[str, str]]:
+    async with ctx.create_db_session() as db:
+        result = await db.execute(
+            select(EventSmartType.event_id, EventSmartType.smart_type)
+        )
+        return {(row[0], row[1]) for row in result}
+
+
+@pytest.mark.asyncio()
+async def test_upsert_events(ctx: BackupContext) -> None:
+    await ctx.create_db()
+    person = d.SmartDetectObjectType.PERSON
+    vehicle = d.SmartDetectObjectType.VEHICLE
+
+    no_camera = _api_event("3", 2)
+    no_camera.camera = None
+    await _upsert_events(
+        ctx, [_api_event("1", 0), _api_event("2", 1, [person]), no_camera]
+    )
+    assert await _smart_types(ctx) == {("2", "person")}
+
+    moved = _api_event("1", 5)
+    await _upsert_events(ctx, [moved, _api_event("2", 1, [vehicle])])
+    assert await _smart_types(ctx) == {("2", "vehicle")}
+
+    async with ctx.create_db_session() as db:
+        result = await db.execute(select(Event).order_by(Event.id))
+        events = list(result.unique().scalars())
+    assert [event.id for event in events] == ["1", "2"]
+    assert events[0].start == moved.start
+    assert events[1].event_type == "smartDetectZone"
+    await ctx.db_engine.dispose()
+
+
+@pytest.mark.asyncio()
+async def test_update_events_pages(ctx: BackupContext) -> None:
+    await ctx.create_db()
+    pages = [
+        [_api_event(str(i), i) for i in range(3)],
+        # pages overlap on the last event of the previous one
+        [_api_event(str(i), i) for i in range(2, 5)],
+        [_api_event("4", 4)],
+    ]
+    ctx.protect.get_events = AsyncMock(side_effect=pages)
+
+    assert await _update_events(ctx) == 5
+
+    starts = [c.args[0] for c in ctx.protect.get_events.call_args_list]
+    assert starts == [_START, pages[0][-1].start, pages[1][-1].start]
+    async with ctx.create_db_session() as db:
+        result = await db.execute(select(Event.id))
+        assert sorted(row[0] for row in result) == ["0", "1", "2", "3", "4"]
+    await ctx.db_engine.dispose()
+
+
+async def _load_event(ctx: BackupContext, event_id: str) -> Event:
+    async with ctx.create_db_session() as db:
+        result = await db.execute(select(Event).where(Event.id == event_id))
+        return result.unique().scalars().one()
+
+
+@pytest.mark.asyncio()
+async def test_reindex_and_file_index(ctx: BackupContext, tmp_path: Path) -> None:
+    ctx.thumbnail_format = "{mac}{sep}{minute}{sep}{camera_slug}thumb.jpg"
+    ctx.event_format = "{mac}{sep}{minute}{sep}{camera_slug}video.mp4"
+    ctx.protect.bootstrap.get_device_from_mac.return_value = MagicMock(
+        display_name="Front Door"
+    )
+    ctx.protect.close_session = AsyncMock()
+    ctx.protect.close_public_api_session = AsyncMock()
+    await ctx.create_db()
+    await _upsert_events(ctx, [_api_event("1", 0), _api_event("2", 1)])
+
+    thumb = tmp_path / "aabbccddeeff-0-front-door-thumb.jpg"
+    # video of the camera from before it was renamed
+    video = tmp_path / "aabbccddeeff-0-old-cam-video.mp4"
+    await async_write_bytes(thumb, b"jpeg")
+    await async_write_bytes(video, b"mp4")
+
+    assert await _reindex(ctx) == 2
+
+    event = await _load_event(ctx, "1")
+    assert {(file.kind, file.path) for file in event.files} == {
+        ("thumbnail", thumb.name),
+        ("video", video.name),
+    }
+    assert not (await _load_event(ctx, "2")).files
+    existing = await asyncio.to_thread(
+        event.get_existing_path, ctx, EventFileKind.VIDEO
+    )
+    assert existing == video
+    assert not await _is_verified(event.get_indexed_file(EventFileKind.VIDEO), video)
+
+    await _index_file(ctx, event, EventFileKind.VIDEO, video, verified=True)
+    event = await _load_event(ctx, "1")
+    indexed = event.get_indexed_file(EventFileKind.VIDEO)
+    assert await _is_verified(indexed, video)
+    # changed files need to be verified again
+    await async_write_bytes(video, b"changed mp4")
+    assert not await _is_verified(indexed, video)
+
+    await aos.remove(thumb)
+    assert await _reindex(ctx) == 1
+    event = await _load_event(ctx, "1")
+    assert event.get_indexed_file(EventFileKind.THUMBNAIL) is None
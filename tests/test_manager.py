@@ -0,0 +1,102 @@
+"""Tests for the multi-NVR client manager."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from uiprotect import ProtectApiClient, ProtectClientManager
+from uiprotect.exceptions import NvrError
+
+
+@pytest.mark.asyncio()
+async def test_manager_shares_connector():
+    async with ProtectClientManager(limit_per_host=3) as manager:
+        first = manager.add_client(
+            "192.168.1.1", 443, "user", "pass", store_sessions=False
+        )
+        second = manager.add_client(
+            "192.168.1.2", 443, "user", "pass", store_sessions=False
+        )
+
+        sessions = [
+            await first.get_session(),
+            await first.get_public_api_session(),
+            await second.get_session(),
+        ]
+        assert all(s.connector is manager.connector for s in sessions)
+        assert manager.connector.limit_per_host == 3
+        # cookies are kept per client
+        assert sessions[0].cookie_jar is not sessions[2].cookie_jar
+
+        await manager.remove_client(first)
+        assert sessions[0].closed
+        assert not manager.connector.closed
+        assert manager.clients == [second]
+
+    assert sessions[2].closed
+    assert sessions[2].connector is None or sessions[2].connector.closed
+
+
+@pytest.mark.asyncio()
+async def test_manager_update_health_and_metrics():
+    async with ProtectClientManager() as manager:
+        ok = manager.add_client("192.168.1.1", 443, "user", "pass")
+        failing = manager.add_client("192.168.1.2", 443, "user", "pass")
+        ok.update = AsyncMock()  # type: ignore[method-assign]
+        failing.update = AsyncMock(side_effect=NvrError("down"))  # type: ignore[method-assign]
+        ok._private_websocket = Mock(is_connected=True)
+
+        await manager.update()
+
+        ok_health, failing_health = manager.health()
+        assert ok_health.host == "192.168.1.1"
+        assert ok_health.connected
+        assert ok_health.refreshes == 1
+        assert ok_health.last_refresh is not None
+        assert not failing_health.connected
+        assert failing_health.failures == 1
+        assert isinstance(failing_health.last_error, NvrError)
+        assert manager.metrics() == {
+            "clients": 2,
+            "connected": 1,
+            "failing": 1,
+            "refreshes": 1,
+        }
+        ok._private_websocket = None
+
+
+@pytest.mark.asyncio()
+async def test_manager_staggered_refresh():
+    manager = ProtectClientManager(refresh_interval=60)
+    clients = [
+        manager.add_client(f"192.168.1.{i}", 443, "user", "pass") for i in range(3)
+    ]
+
+    with patch.object(
+        ProtectClientManager, "_refresh_loop", autospec=True
+    ) as refresh_loop:
+        refresh_loop.return_value = None
+        manager.start()
+        await asyncio.sleep(0)
+
+    delays = {c.args[1]: c.args[2] for c in refresh_loop.call_args_list}
+    assert [delays[client] for client in clients] == [20, 40, 60]
+    await manager.close()
+    assert manager.clients == []
+
+
+@pytest.mark.asyncio()
+async def test_manager_start_requires_interval():
+    manager = ProtectClientManager()
+    with pytest.raises(ValueError, match="refresh_interval"):
+        manager.start()
+    await manager.close()
+
+
+def test_client_connector_kwarg():
+    connector = Mock()
+    client = ProtectApiClient("192.168.1.1", 443, "user", "pass", connector=connector)
+    assert client._connector is connector
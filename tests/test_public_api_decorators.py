@@ -17,6 +17,7 @@ from uiprotect._public_api import (
     public_post,
     registry,
 )
+from uiprotect._rate_limit import RequestPriority
 from uiprotect.api import ProtectApiClient
 from uiprotect.exceptions import BadRequest
 
@@ -149,7 +150,10 @@ async def test_post_fire_and_forget_binds_all_path_params() -> None:
 
     assert result is None
     client.api_request_raw.assert_called_once_with(
-        url="/v1/things/cam/go/3", method="post", public_api=True
+        url="/v1/things/cam/go/3",
+        method="post",
+        public_api=True,
+        priority=RequestPriority.INTERACTIVE,
     )
 
 
@@ -9,10 +9,13 @@ import pytest
 
 from uiprotect import _rate_limit as rl
 from uiprotect._rate_limit import (
-    DEFAULT_RATE,
+    DEFAULT_LIMIT,
+    DEFAULT_WINDOW,
     SAFETY_MARGIN,
     PublicApiRateLimiter,
-    _parse_policy_rate,
+    RequestPriority,
+    _parse_policy,
+    _parse_rate_limit_state,
     _to_float,
 )
 from uiprotect.api import BaseApiClient, ProtectApiClient
@@ -44,7 +47,11 @@ def virtual_clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
     fake_loop.time = lambda: clock[0]
 
     async def fake_sleep(delay: float) -> None:
-        clock[0] += delay
+        # Yield so gathered acquires interleave; overlapping sleeps share the
+        # same timeline rather than adding up.
+        target = clock[0] + delay
+        await asyncio.sleep(0)
+        clock[0] = max(clock[0], target)
 
     monkeypatch.setattr(rl, "get_running_loop", lambda: fake_loop)
     monkeypatch.setattr(rl, "sleep", fake_sleep)
@@ -52,16 +59,16 @@ def virtual_clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
 
 
 # ---------------------------------------------------------------------------
-# _parse_policy_rate / _to_float
+# _parse_policy / _parse_rate_limit_state / _to_float
 # ---------------------------------------------------------------------------
 
 
 @pytest.mark.parametrize(
     ("policy", "expected"),
     [
-        ('"10-in-1sec"; q=10; w=1; pk=abc', 10.0),
-        ("q=20; w=2", 10.0),
-        ('"5"; q=5; w=1, "100"; q=100; w=60', 5.0),  # only first member used
+        ('"10-in-1sec"; q=10; w=1; pk=abc', (10.0, 1.0)),
+        ("q=20; w=2", (20.0, 2.0)),
+        ('"5"; q=5; w=1, "100"; q=100; w=60', (5.0, 1.0)),  # only first member
         (None, None),
         ("", None),
         ("q=10", None),  # missing w
@@ -75,8 +82,25 @@ def virtual_clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
         ("q=10; w=nan", None),  # non-finite window
     ],
 )
-def test_parse_policy_rate(policy: str | None, expected: float | None) -> None:
-    assert _parse_policy_rate(policy) == expected
+def test_parse_policy(policy: str | None, expected: tuple[float, float] | None) -> None:
+    assert _parse_policy(policy) == expected
+
+
+@pytest.mark.parametrize(
+    ("state", "expected"),
+    [
+        ('"default";r=3;t=1', (3.0, 1.0)),
+        ("limit=10, remaining=0, reset=2", (0.0, 2.0)),
+        ('"a";r=2;t=1, "b";r=9;t=60', (2.0, 1.0)),  # first value wins
+        ('"default";t=1', (None, 1.0)),
+        ('"default";r=-1;t=-1', (None, None)),
+        ("garbage", (None, None)),
+    ],
+)
+def test_parse_rate_limit_state(
+    state: str, expected: tuple[float | None, float | None]
+) -> None:
+    assert _parse_rate_limit_state(state) == expected
 
 
 def test_to_float() -> None:
@@ -87,103 +111,229 @@ def test_to_float() -> None:
 
 
 # ---------------------------------------------------------------------------
-# PublicApiRateLimiter pacing
+# PublicApiRateLimiter sliding window
 # ---------------------------------------------------------------------------
 
+# When a full window has passed since the request whose slot is reused.
+_NEXT_WINDOW = DEFAULT_WINDOW + rl._WINDOW_SLACK
+
 
 @pytest.mark.asyncio
-async def test_acquire_paces_at_fixed_interval(virtual_clock: list[float]) -> None:
-    limiter = PublicApiRateLimiter(rate=10.0)  # 0.1s spacing
-    for _ in range(5):
+async def test_default_limit_then_waits_out_window(
+    virtual_clock: list[float],
+) -> None:
+    limiter = PublicApiRateLimiter()
+    for _ in range(DEFAULT_LIMIT):
         await limiter.acquire()
-    # First acquire returns immediately; the next four are paced 0.1s apart.
-    assert virtual_clock[0] == pytest.approx(0.4)
+    assert virtual_clock[0] == 0.0
+    await limiter.acquire()
+    assert virtual_clock[0] == pytest.approx(_NEXT_WINDOW)
 
 
 @pytest.mark.asyncio
-async def test_concurrent_acquires_do_not_burst(
-    monkeypatch: pytest.MonkeyPatch,
+async def test_concurrent_acquires_fill_each_window(
+    virtual_clock: list[float],
 ) -> None:
-    limiter = PublicApiRateLimiter(rate=8.0)  # 0.125s spacing
-    clock = [0.0]
-    fake_loop = Mock()
-    fake_loop.time = lambda: clock[0]
-    inside = 0
-    max_inside = 0
+    limiter = PublicApiRateLimiter(limit=4, window=1.0)
+    done: list[float] = []
 
-    async def fake_sleep(delay: float) -> None:
-        # Yield to the loop *while still holding the limiter lock* so any other
-        # gathered acquire could run if the lock did not serialize them.
-        nonlocal inside, max_inside
-        inside += 1
-        max_inside = max(max_inside, inside)
-        await asyncio.sleep(0)
-        clock[0] += delay
-        inside -= 1
+    async def _acquire() -> None:
+        await limiter.acquire()
+        done.append(virtual_clock[0])
 
-    monkeypatch.setattr(rl, "get_running_loop", lambda: fake_loop)
-    monkeypatch.setattr(rl, "sleep", fake_sleep)
+    await asyncio.gather(*(_acquire() for _ in range(10)))
 
-    await asyncio.gather(*(limiter.acquire() for _ in range(20)))
+    assert done == pytest.approx(
+        [0.0] * 4 + [_NEXT_WINDOW] * 4 + [2 * _NEXT_WINDOW] * 2
+    )
 
-    # Lock serializes: no two acquires ever pace concurrently (no burst).
-    assert max_inside == 1
-    # 20 requests serialized at 0.125s → 19 gaps.
-    assert clock[0] == pytest.approx(19 * (1 / 8))
+
+@pytest.mark.asyncio
+async def test_idle_frees_whole_window(virtual_clock: list[float]) -> None:
+    limiter = PublicApiRateLimiter(limit=3, window=1.0)
+    for _ in range(3):
+        await limiter.acquire()
+    virtual_clock[0] = 100.0  # long idle gap frees the limit, no more
+    for _ in range(3):
+        await limiter.acquire()
+    assert virtual_clock[0] == pytest.approx(100.0)
+    await limiter.acquire()
+    assert virtual_clock[0] == pytest.approx(100.0 + _NEXT_WINDOW)
 
 
 @pytest.mark.asyncio
-async def test_idle_does_not_accumulate_burst_credit(
-    virtual_clock: list[float],
-) -> None:
-    limiter = PublicApiRateLimiter(rate=10.0)
+async def test_interactive_jumps_normal_queue(virtual_clock: list[float]) -> None:
+    limiter = PublicApiRateLimiter(limit=1, window=1.0)
+    await limiter.acquire()  # fill the window
+    order: list[str] = []
+
+    async def _acquire(name: str, priority: RequestPriority) -> None:
+        await limiter.acquire(priority)
+        order.append(name)
+
+    bulk = [
+        asyncio.create_task(_acquire(f"bulk{i}", RequestPriority.NORMAL))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0)  # bulk requests are queued first
+    interactive = asyncio.create_task(
+        _acquire("interactive", RequestPriority.INTERACTIVE)
+    )
+    await asyncio.gather(*bulk, interactive)
+
+    # bulk0 was already waiting out the window; everything queued behind it
+    # is overtaken by the interactive request.
+    assert order == ["bulk0", "interactive", "bulk1", "bulk2"]
+    assert virtual_clock[0] == pytest.approx(4 * _NEXT_WINDOW)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_hands_off(virtual_clock: list[float]) -> None:
+    limiter = PublicApiRateLimiter(limit=1, window=1.0)
     await limiter.acquire()
-    virtual_clock[0] = 100.0  # long idle gap
-    await limiter.acquire()  # no backlog credit: returns without sleeping
-    assert virtual_clock[0] == pytest.approx(100.0)
+    first = asyncio.create_task(limiter.acquire())
+    second = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    await second
+    assert limiter._waiters == []
+    assert virtual_clock[0] == pytest.approx(_NEXT_WINDOW)
 
 
 # ---------------------------------------------------------------------------
-# Seeding from RateLimit-Policy
+# Adapting to response headers
 # ---------------------------------------------------------------------------
 
 
 @pytest.mark.asyncio
-async def test_seed_changes_pacing(virtual_clock: list[float]) -> None:
+async def test_policy_sets_limit(virtual_clock: list[float]) -> None:
     limiter = PublicApiRateLimiter()
-    limiter.seed_from_policy('"20-in-1sec"; q=20; w=1')  # 20 * 0.8 = 16/s
-    await limiter.acquire()
+    limiter.update_from_headers({"RateLimit-Policy": '"20-in-1sec"; q=20; w=1'})
+    # 20 * 0.8 = 16 per window
+    for _ in range(16):
+        await limiter.acquire()
+    assert virtual_clock[0] == 0.0
     await limiter.acquire()
-    assert virtual_clock[0] == pytest.approx(1 / (20 * SAFETY_MARGIN))
+    assert virtual_clock[0] == pytest.approx(_NEXT_WINDOW)
 
 
 @pytest.mark.asyncio
-async def test_seed_is_one_shot(virtual_clock: list[float]) -> None:
+async def test_policy_keeps_adapting(virtual_clock: list[float]) -> None:
     limiter = PublicApiRateLimiter()
-    limiter.seed_from_policy("q=20; w=1")  # 16/s
-    limiter.seed_from_policy("q=2; w=1")  # ignored — already seeded
+    limiter.update_from_headers({"RateLimit-Policy": "q=20; w=1"})
+    limiter.update_from_headers({"RateLimit-Policy": "q=2; w=1"})  # not one-shot
+    # 2 * 0.8 = 1.6 per window rounds down to one request.
     await limiter.acquire()
     await limiter.acquire()
-    assert virtual_clock[0] == pytest.approx(1 / (20 * SAFETY_MARGIN))
+    assert virtual_clock[0] == pytest.approx(_NEXT_WINDOW)
 
 
 @pytest.mark.asyncio
-async def test_seed_slower_rate_clamps_schedule(virtual_clock: list[float]) -> None:
-    limiter = PublicApiRateLimiter(rate=10.0)  # 0.1s spacing
-    await limiter.acquire()  # arms _next_allowed at 0.1
-    limiter.seed_from_policy("q=2; w=1")  # 2 * 0.8 = 1.6/s → 0.625s spacing
+async def test_smaller_policy_applies_to_sent_requests(
+    virtual_clock: list[float],
+) -> None:
+    limiter = PublicApiRateLimiter(limit=10, window=1.0)
+    for _ in range(3):
+        await limiter.acquire()
+    limiter.update_from_headers({"RateLimit-Policy": "q=2; w=5"})
     await limiter.acquire()
-    # Next slot honors the new, slower interval rather than the old 0.1s.
-    assert virtual_clock[0] == pytest.approx(1 / (2 * SAFETY_MARGIN))
+    # The requests already sent count against the new, slower policy.
+    assert virtual_clock[0] == pytest.approx(5 + rl._WINDOW_SLACK)
 
 
 @pytest.mark.asyncio
-async def test_absent_policy_keeps_default(virtual_clock: list[float]) -> None:
+@pytest.mark.parametrize(
+    ("policy", "quota", "window"),
+    [
+        (None, 10, 1),
+        ('"default";q=10;w=1', 10, 1),
+        ("q=50; w=5", 50, 5),
+    ],
+)
+async def test_policy_window_budget(
+    virtual_clock: list[float], policy: str | None, quota: int, window: int
+) -> None:
+    limiter = PublicApiRateLimiter()
+    if policy is not None:
+        limiter.update_from_headers({"RateLimit-Policy": policy})
+    start = virtual_clock[0]
+    done: list[float] = []
+
+    async def _acquire() -> None:
+        await limiter.acquire()
+        done.append(virtual_clock[0] - start)
+
+    await asyncio.gather(*(_acquire() for _ in range(quota * 3)))
+
+    budget = quota * SAFETY_MARGIN
+    for first in done:
+        in_window = [t for t in done if first <= t <= first + window]
+        assert len(in_window) <= budget
+    # ...while using the whole budget of every window
+    assert max(done) == pytest.approx(3 * (window + rl._WINDOW_SLACK))
+
+
+@pytest.mark.asyncio
+async def test_burst_beats_fixed_interval_pacing(
+    virtual_clock: list[float],
+) -> None:
+    """An update_public-sized burst is done well before evenly paced requests."""
     limiter = PublicApiRateLimiter()
-    limiter.seed_from_policy(None)  # unparsable → stays at fallback rate
+    limiter.update_from_headers({"RateLimit-Policy": '"default";q=10;w=1'})
+    done: list[float] = []
+
+    async def _acquire() -> None:
+        await limiter.acquire()
+        done.append(virtual_clock[0])
+
+    await asyncio.gather(*(_acquire() for _ in range(15)))
+
+    paced = 14 / (10 * SAFETY_MARGIN)
+    assert max(done) == pytest.approx(_NEXT_WINDOW)
+    assert max(done) < paced
+
+
+@pytest.mark.asyncio
+async def test_absent_policy_keeps_default(virtual_clock: list[float]) -> None:
+    limiter = PublicApiRateLimiter(limit=1)
+    limiter.update_from_headers({})
+    limiter.update_from_headers({"RateLimit-Policy": "q=oops"})  # unparsable
+    await limiter.acquire()
+    await limiter.acquire()
+    assert virtual_clock[0] == pytest.approx(_NEXT_WINDOW)
+
+
+@pytest.mark.asyncio
+async def test_remaining_uses_up_window(virtual_clock: list[float]) -> None:
+    limiter = PublicApiRateLimiter(limit=5, window=1.0)
+    limiter.update_from_headers({"RateLimit": '"default";r=2;t=1'})
+    await limiter.acquire()
     await limiter.acquire()
+    assert virtual_clock[0] == 0.0
     await limiter.acquire()
-    assert virtual_clock[0] == pytest.approx(1 / DEFAULT_RATE)
+    assert virtual_clock[0] == pytest.approx(_NEXT_WINDOW)
+
+
+@pytest.mark.asyncio
+async def test_exhausted_window_pauses_until_reset(
+    virtual_clock: list[float],
+) -> None:
+    limiter = PublicApiRateLimiter(limit=5, window=1.0)
+    limiter.update_from_headers({"RateLimit": "limit=10, remaining=0, reset=2"})
+    for _ in range(5):
+        await limiter.acquire()
+    # The server's new window starts with the whole limit.
+    assert virtual_clock[0] == pytest.approx(2.0)
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_limiter(virtual_clock: list[float]) -> None:
+    limiter = PublicApiRateLimiter(limit=5, window=1.0)
+    limiter.update_from_headers({"Retry-After": "3"})
+    limiter.update_from_headers({"Retry-After": "1"})  # never shortens a pause
+    await limiter.acquire()
+    assert virtual_clock[0] == pytest.approx(3.0)
 
 
 # ---------------------------------------------------------------------------
@@ -192,17 +342,36 @@ async def test_absent_policy_keeps_default(virtual_clock: list[float]) -> None:
 
 
 @pytest.mark.asyncio
-async def test_public_request_is_paced_and_seeded() -> None:
+async def test_public_request_is_paced_and_adapts() -> None:
     client = _public_client()
     limiter = Mock()
     limiter.acquire = AsyncMock()
-    limiter.seed_from_policy = Mock()
+    limiter.update_from_headers = Mock()
     client._public_rate_limiter = limiter
-    response = _mock_response(headers={"RateLimit-Policy": "q=10; w=1"})
+    headers = {"RateLimit-Policy": "q=10; w=1"}
+    response = _mock_response(headers=headers)
     with patch.object(client, "_do_request", AsyncMock(return_value=response)):
         await client.request("get", "/v1/cameras", public_api=True)
-    limiter.acquire.assert_awaited_once()
-    limiter.seed_from_policy.assert_called_once_with("q=10; w=1")
+    limiter.acquire.assert_awaited_once_with(RequestPriority.NORMAL)
+    limiter.update_from_headers.assert_called_once_with(headers)
+
+
+@pytest.mark.asyncio
+async def test_public_request_passes_priority() -> None:
+    client = _public_client()
+    limiter = Mock()
+    limiter.acquire = AsyncMock()
+    limiter.update_from_headers = Mock()
+    client._public_rate_limiter = limiter
+    response = _mock_response()
+    with patch.object(client, "_do_request", AsyncMock(return_value=response)):
+        await client.request(
+            "post",
+            "/v1/relays/r1/outputs/1/activate",
+            public_api=True,
+            priority=RequestPriority.INTERACTIVE,
+        )
+    limiter.acquire.assert_awaited_once_with(RequestPriority.INTERACTIVE)
 
 
 @pytest.mark.asyncio
@@ -210,13 +379,13 @@ async def test_private_request_is_not_paced() -> None:
     client = _public_client()
     limiter = Mock()
     limiter.acquire = AsyncMock()
-    limiter.seed_from_policy = Mock()
+    limiter.update_from_headers = Mock()
     client._public_rate_limiter = limiter
     response = _mock_response()
     with patch.object(client, "_do_request", AsyncMock(return_value=response)):
         await client.request("get", "/api/cameras", public_api=False)
     limiter.acquire.assert_not_awaited()
-    limiter.seed_from_policy.assert_not_called()
+    limiter.update_from_headers.assert_not_called()
 
 
 def test_set_api_key_resets_limiter() -> None:
@@ -696,6 +696,7 @@ def test_print_ws_stat_summary():
     lines: list[str] = []
     print_ws_stat_summary(stats, output=lines.append)
     assert "camera: 1" in lines[0]
+    assert "stats only packet count: 0" in lines[0]
 
 
 def test_print_ws_stat_summary_default_output(capsys):